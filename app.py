@@ -1,8 +1,11 @@
 from flask import Flask, request, send_file, render_template_string
 import os
+import uuid
 from kdp_generator.cli import SUPPORTED_TRIM_SIZES
-from kdp_generator.crossword import generate_crossword, render_crossword_pdf
+from kdp_generator.crossword import GRID_SIZE, crossword_index, generate_crossword, render_crossword_pdf
+from kdp_generator.crossword_fill import BLOCK_PATTERNS, generate_american_crossword, word_shortage
 from kdp_generator.sudoku import make_puzzle, render_sudoku_pdf
+from kdp_generator.sudoku_bank import DEFAULT_BANK_PATH, PuzzleBank, draw_or_generate
 from kdp_generator.coloring import render_coloring_pdf
 from kdp_generator.notebook import render_notebook_pdf
 from kdp_generator.worksheets import (
@@ -14,6 +17,9 @@ from kdp_generator.worksheets import (
 
 app = Flask(__name__)
 
+# seconds a web request may spend filling a block pattern
+WEB_FILL_SECONDS = 20.0
+
 TEMPLATE = """
 <!doctype html>
 <html>
@@ -29,6 +35,7 @@ TEMPLATE = """
     input, select { padding: 0.4rem; margin: 0.25rem 0 0.75rem; width: 100%; max-width: 420px; }
     button { padding: 0.5rem 0.9rem; border: none; background: #0d6efd; color: white; border-radius: 6px; cursor: pointer; }
     button:hover { background: #0b5ed7; }
+    .error { color: #b02a37; font-weight: 600; }
   </style>
 </head>
 <body>
@@ -36,12 +43,20 @@ TEMPLATE = """
   <p>Generate printable PDFs for crosswords, sudoku, coloring pages, and notebooks.</p>
 
   <form method="post" action="/crossword">
-    <h3>Crossword 10x10</h3>
+    <h3>Crossword</h3>
+    {% if crossword_error %}<p class="error">{{ crossword_error }}</p>{% endif %}
     <label>Language</label>
     <select name="lang">
       <option value="pl">Polish</option>
       <option value="en">English</option>
     </select>
+    <label>Grid size</label>
+    <select name="size">
+      <option value="10">10x10 fill-in</option>
+      <option value="13">13x13 (needs a large compiled word list)</option>
+      <option value="15">15x15 (needs a large compiled word list)</option>
+      <option value="21">21x21 (needs a large compiled word list)</option>
+    </select>
     <label>Trim size</label>
     <select name="trim">
       {% for s in sizes %}<option value="{{s}}">{{s}}</option>{% endfor %}
@@ -55,9 +70,19 @@ TEMPLATE = """
     <select name="difficulty">
       <option value="easy">Easy</option>
       <option value="medium">Medium</option>
+      <option value="hard">Hard</option>
+      <option value="expert">Expert</option>
     </select>
     <label>Pages</label>
     <input name="pages" type="number" value="5" min="1" max="50" />
+    <label>Puzzles per page</label>
+    <select name="per_page">
+      <option value="1">1</option>
+      <option value="2">2</option>
+      <option value="4">4</option>
+      <option value="6">6</option>
+    </select>
+    <label><input name="answer_key" type="checkbox" value="1" style="width:auto" /> Answer key</label>
     <label>Trim size</label>
     <select name="trim">
       {% for s in sizes %}<option value="{{s}}">{{s}}</option>{% endfor %}
@@ -71,6 +96,11 @@ TEMPLATE = """
     <select name="kind">
       <option value="geometric">Geometric</option>
       <option value="mandala">Mandala</option>
+      <option value="rosette">Rosette</option>
+      <option value="kaleidoscope">Kaleidoscope</option>
+      <option value="truchet">Truchet tiles</option>
+      <option value="stars">Islamic stars</option>
+      <option value="hex">Hexagon tiles</option>
       <option value="kids">Kids (thick, simple)</option>
       <option value="infant">Infant (high-contrast)</option>
     </select>
@@ -134,7 +164,7 @@ TEMPLATE = """
       <option value="pl">Polish</option>
     </select>
     <label>Size</label>
-    <input name="size" type="number" value="12" min="8" max="20" />
+    <input name="size" type="number" value="12" min="8" max="40" />
     <label>Trim size</label>
     <select name="trim">
       {% for s in sizes %}<option value="{{s}}">{{s}}</option>{% endfor %}
@@ -145,7 +175,14 @@ TEMPLATE = """
   <form method="post" action="/maze">
     <h3>Maze</h3>
     <label>Size</label>
-    <input name="size" type="number" value="15" min="7" max="31" />
+    <input name="size" type="number" value="15" min="5" max="400" />
+    <label>Algorithm</label>
+    <select name="algorithm">
+      <option value="backtracker">Backtracker (long corridors)</option>
+      <option value="kruskal">Kruskal</option>
+      <option value="wilson">Wilson</option>
+      <option value="prim">Prim (easiest)</option>
+    </select>
     <label>Trim size</label>
     <select name="trim">
       {% for s in sizes %}<option value="{{s}}">{{s}}</option>{% endfor %}
@@ -166,10 +203,25 @@ def index():
 @app.post("/crossword")
 def make_crossword():
     lang = request.form.get("lang", "pl")
+    size = int(request.form.get("size", GRID_SIZE))
     trim = request.form.get("trim", "8.5x11")
     out = os.path.abspath("samples/crossword_web.pdf")
     os.makedirs(os.path.dirname(out), exist_ok=True)
-    grid, words = generate_crossword(language=lang)
+    if size == GRID_SIZE:
+        grid, words = generate_crossword(language=lang)
+    else:
+        # a list too short for every pattern of the size fails now, not after WEB_FILL_SECONDS
+        index = crossword_index(lang, size)
+        short = min((word_shortage(p, index) for p in BLOCK_PATTERNS[size]), key=lambda s: sum(s.values()))
+        if short:
+            missing = ", ".join(f"{n} more {length}-letter" for length, n in short.items())
+            error = f"{size}x{size} needs a larger word list than the bundled one: {missing} words"
+            return render_template_string(TEMPLATE, sizes=SUPPORTED_TRIM_SIZES, crossword_error=error), 400
+        try:
+            grid, words = generate_american_crossword(lang, size, time_budget=WEB_FILL_SECONDS)
+        except RuntimeError as exc:
+            error = f"{size}x{size} needs a larger word list than the bundled one: {exc}"
+            return render_template_string(TEMPLATE, sizes=SUPPORTED_TRIM_SIZES, crossword_error=error), 400
     render_crossword_pdf(grid, out, trim, words=words)
     return send_file(out, as_attachment=True)
 
@@ -181,8 +233,14 @@ def make_sudoku():
     trim = request.form.get("trim", "8.5x11")
     out = os.path.abspath("samples/sudoku_web.pdf")
     os.makedirs(os.path.dirname(out), exist_ok=True)
-    puzzles = [make_puzzle(difficulty=difficulty) for _ in range(pages)]
-    render_sudoku_pdf(puzzles, out, trim)
+    if os.path.exists(DEFAULT_BANK_PATH):
+        with PuzzleBank(DEFAULT_BANK_PATH) as bank:
+            puzzles = draw_or_generate(bank, f"web-{uuid.uuid4().hex}", pages, difficulty)
+    else:
+        puzzles = [make_puzzle(difficulty=difficulty) for _ in range(pages)]
+    per_page = int(request.form.get("per_page", 1))
+    answer_key = bool(request.form.get("answer_key"))
+    render_sudoku_pdf(puzzles, out, trim, per_page=per_page, answer_key=answer_key)
     return send_file(out, as_attachment=True)
 
 
@@ -237,9 +295,10 @@ def make_wordsearch():
     trim = request.form.get("trim", "8.5x11")
     out = os.path.abspath("samples/wordsearch_web.pdf")
     os.makedirs(os.path.dirname(out), exist_ok=True)
-    from kdp_generator.crossword import load_wordlist
-    words = load_wordlist(lang)[:20]
-    render_word_search_pdf(out, words=words, size=size, trim_size=trim)
+    from kdp_generator.word_search import get_blocklist
+    from kdp_generator.wordlist import get_wordlist
+    words = get_wordlist(lang).sample(20)
+    render_word_search_pdf(out, words=words, size=size, trim_size=trim, blocklist=get_blocklist(lang))
     return send_file(out, as_attachment=True)
 
 
@@ -249,7 +308,7 @@ def make_maze():
     trim = request.form.get("trim", "8.5x11")
     out = os.path.abspath("samples/maze_web.pdf")
     os.makedirs(os.path.dirname(out), exist_ok=True)
-    render_maze_pdf(out, size=size, trim_size=trim)
+    render_maze_pdf(out, size=size, trim_size=trim, algorithm=request.form.get("algorithm", "backtracker"))
     return send_file(out, as_attachment=True)
 
 
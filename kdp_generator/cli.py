@@ -1,9 +1,18 @@
 import argparse
 import os
+import random
 from typing import List
 
-from .crossword import generate_crossword, render_crossword_pdf
-from .sudoku import make_puzzle, render_sudoku_pdf
+from .crossword import GRID_SIZE, NODE_BUDGET, crossword_index, generate_crossword, render_crossword_book_pdf, render_crossword_pdf
+from .crossword_book import generate_book
+from .crossword_clues import DIFFICULTIES, get_clue_store, unclued_words
+from .crossword_fill import BLOCK_PATTERNS, generate_american_crossword
+from .sudoku import SYMMETRIC_MINIMAL_NODES, SYMMETRY_MAPS, UNREACHABLE_MINIMAL, render_sudoku_pdf
+from .sudoku_batch import generate_batch
+from .sudoku_bank import DEFAULT_BANK_PATH, PuzzleBank, draw_or_generate
+from .sudoku_transform import expand_seeds
+from .sudoku_vector import read_jsonl, verify_batch
+from .wordlist import COMPILED_SUFFIX, compile_wordlist, get_wordlist, source_path
 from .coloring import render_coloring_pdf
 from .notebook import render_notebook_pdf
 from .worksheets import (
@@ -12,6 +21,9 @@ from .worksheets import (
     render_word_search_pdf,
     render_maze_pdf,
 )
+from .maze import ALGORITHMS
+from .maze_book import MAX_ATTEMPTS as MAZE_ATTEMPTS, generate_maze_book, render_maze_book_pdf
+from .word_search import DIRECTIONS, generate_word_search_book, get_blocklist, load_theme, render_word_search_book_pdf
 from .paper import render_graph_paper_pdf, render_isometric_paper_pdf, render_music_staff_paper_pdf
 from .education import (
     render_connect_the_dots_pdf,
@@ -43,26 +55,107 @@ from .cover import render_kdp_cover_pdf
 SUPPORTED_TRIM_SIZES = ["6x9", "8.5x11", "8x10", "7x10"]
 
 
+def at_least(minimum: int):
+    """argparse type for integers no smaller than `minimum`."""
+    def parse(value: str) -> int:
+        number = int(value)
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+    parse.__name__ = "int"
+    return parse
+
+
+positive_int = at_least(1)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="KDP Low-Content Book Generator")
     sub = parser.add_subparsers(dest="command", required=True)
 
     # Crossword
-    p1 = sub.add_parser("crossword", help="Generate a 10x10 crossword")
+    p1 = sub.add_parser("crossword", help="Generate a crossword")
     p1.add_argument("--lang", choices=["pl", "en"], default="pl")
+    p1.add_argument(
+        "--size", type=int, choices=[GRID_SIZE, *BLOCK_PATTERNS], default=GRID_SIZE,
+        help="10 builds a sparse fill-in grid; larger sizes fill an American block pattern",
+    )
+    p1.add_argument("--seed", type=int, default=None)
+    p1.add_argument("--time-budget", dest="time_budget", type=float, default=60.0, help="Seconds of restarts allowed for a block-pattern fill")
+    p1.add_argument("--nodes", type=int, default=NODE_BUDGET, help="Candidate grids the 10x10 beam search scores before keeping the best")
     p1.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
+    p1.add_argument("--clues", action="store_true", help="Number the grid and print Across/Down clues instead of a word list")
+    p1.add_argument("--clue-difficulty", dest="clue_difficulty", choices=DIFFICULTIES, default=None)
+    p1.add_argument("--body-font", dest="body_font", type=str, default="", help="TTF for clues and letters, e.g. for Polish diacritics")
     p1.add_argument("--out", default="samples/crossword.pdf")
 
+    pc = sub.add_parser("crossword-book", help="Generate a book of crosswords with word lists and solutions")
+    pc.add_argument("--count", type=int, default=100)
+    pc.add_argument("--jobs", type=int, default=1, help="Worker processes used to build grids")
+    pc.add_argument("--lang", choices=["pl", "en"], default="en")
+    pc.add_argument("--size", type=int, choices=[GRID_SIZE, *BLOCK_PATTERNS], default=GRID_SIZE)
+    pc.add_argument("--seed", type=int, default=None, help="Base seed; the book depends on it and on --jobs")
+    pc.add_argument("--reuse", type=int, default=1, help="Grids each word may appear in")
+    pc.add_argument("--time-budget", dest="time_budget", type=float, default=60.0, help="Seconds allowed per grid")
+    pc.add_argument("--nodes", type=int, default=NODE_BUDGET, help="Candidate grids the 10x10 beam search scores per grid")
+    pc.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
+    pc.add_argument("--clues", action="store_true", help="Number the grid and print Across/Down clues instead of a word list")
+    pc.add_argument("--clue-difficulty", dest="clue_difficulty", choices=DIFFICULTIES, default=None)
+    pc.add_argument("--body-font", dest="body_font", type=str, default="", help="TTF for clues and letters, e.g. for Polish diacritics")
+    pc.add_argument("--out", default="samples/crossword_book.pdf")
+
     # Sudoku
     p2 = sub.add_parser("sudoku", help="Generate Sudoku pages")
-    p2.add_argument("--difficulty", choices=["easy", "medium"], default="easy")
+    p2.add_argument("--difficulty", choices=["easy", "medium", "hard", "expert"], default="easy")
     p2.add_argument("--pages", type=int, default=5)
+    p2.add_argument("--size", type=int, choices=[4, 6, 9, 12, 16], default=9, help="Grid size; 12 and 16 use letters above 9")
     p2.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
+    p2.add_argument("--per-page", dest="per_page", type=int, choices=[1, 2, 4, 6], default=1)
+    p2.add_argument("--answer-key", dest="answer_key", action="store_true", help="Append a section of solved grids")
+    p2.add_argument("--jobs", type=int, default=1, help="Worker processes used to generate puzzles")
+    p2.add_argument("--seed", type=int, default=None, help="Base seed; output is identical for any --jobs")
+    p2.add_argument("--seeds", type=int, default=0, help="Generate only this many puzzles and mint the rest as transformed variants")
+    p2.add_argument("--symmetry", choices=["none", *SYMMETRY_MAPS], default="none", help="Remove clues in symmetric groups")
+    p2.add_argument(
+        "--minimal", action="store_true",
+        help=(
+            "Keep only clues that are all required for a unique solution; 9x9 minimal puzzles grade medium or harder,"
+            f" so not with --difficulty easy; not with --symmetry rot90; symmetric ones stop after {SYMMETRIC_MINIMAL_NODES}"
+            " nodes unless a budget is given"
+        ),
+    )
+    p2.add_argument("--time-budget", dest="time_budget", type=float, default=None, help="Seconds of restarts allowed per puzzle")
+    p2.add_argument("--node-budget", dest="node_budget", type=int, default=None, help="Search nodes allowed per puzzle (reproducible with --seed)")
+    p2.add_argument("--stats", action="store_true", help="Print per-puzzle generation statistics")
+    p2.add_argument("--bank", type=str, default="", help="Draw unused puzzles from this puzzle bank")
+    p2.add_argument("--book", type=str, default="", help="Book name recorded in the puzzle bank")
     p2.add_argument("--out", default="samples/sudoku.pdf")
 
+    # Sudoku puzzle bank
+    pb = sub.add_parser("sudoku-bank", help="Manage the persistent Sudoku puzzle bank")
+    bank_sub = pb.add_subparsers(dest="bank_command", required=True)
+    pb1 = bank_sub.add_parser("fill", help="Pre-generate puzzles into the bank")
+    pb1.add_argument("--count", type=int, default=100)
+    pb1.add_argument("--difficulty", choices=["easy", "medium", "hard", "expert"], default="easy")
+    pb1.add_argument("--jobs", type=int, default=1)
+    pb1.add_argument("--symmetry", choices=["none", *SYMMETRY_MAPS], default="none")
+    pb1.add_argument("--bank", default=DEFAULT_BANK_PATH)
+    pb3 = bank_sub.add_parser("expand", help="Mint transformed variants of the generated puzzles")
+    pb3.add_argument("--count", type=int, default=1000)
+    pb3.add_argument("--difficulty", choices=["easy", "medium", "hard", "expert"], default="easy")
+    pb3.add_argument("--bank", default=DEFAULT_BANK_PATH)
+    pb2 = bank_sub.add_parser("stats", help="Show puzzle counts per difficulty")
+    pb2.add_argument("--bank", default=DEFAULT_BANK_PATH)
+
+    # Sudoku QA
+    pv = sub.add_parser("sudoku-verify", help="Check uniqueness and stored solutions of many puzzles at once")
+    source = pv.add_mutually_exclusive_group(required=True)
+    source.add_argument("--bank", type=str, help="Puzzle bank to check")
+    source.add_argument("--jsonl", type=str, help='File with one {"puzzle": ..., "solution": ...} object per line')
+
     # Coloring
     p3 = sub.add_parser("coloring", help="Generate coloring pages")
-    p3.add_argument("--kind", choices=["geometric", "mandala", "kids", "infant"], default="geometric")
+    p3.add_argument("--kind", choices=["geometric", "mandala", "rosette", "kaleidoscope", "truchet", "stars", "hex", "kids", "infant"], default="geometric")
     p3.add_argument("--pages", type=int, default=20)
     p3.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
     p3.add_argument("--out", default="samples/coloring.pdf")
@@ -113,14 +206,58 @@ def parse_args() -> argparse.Namespace:
     p7.add_argument("--size", type=int, default=12)
     p7.add_argument("--lang", choices=["pl", "en"], default="en")
     p7.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
+    p7.add_argument("--words", type=str, default="", help="Themed word list file (one word per line) instead of the language list")
+    p7.add_argument("--body-font", dest="body_font", type=str, default="", help="TTF for letters and word list, e.g. for Polish diacritics")
+    p7.add_argument("--answer-key", dest="answer_key", action="store_true", help="Add a solution page with the words highlighted")
+    p7.add_argument("--blocklist", type=str, default="", help="File of extra words that must not appear anywhere in the grid")
     p7.add_argument("--out", default="samples/wordsearch.pdf")
 
+    pk = sub.add_parser("wordsearch-book", help="Generate a book of word searches with word lists and solutions")
+    pk.add_argument("--count", type=int, default=100)
+    pk.add_argument("--size", type=int, default=20)
+    pk.add_argument("--lang", choices=["pl", "en"], default="en")
+    pk.add_argument("--words", type=str, default="", help="Themed word list file (one word per line) instead of the language list")
+    pk.add_argument("--per-puzzle", dest="per_puzzle", type=int, default=None, help="Words hidden per puzzle (default: about one per 20 cells)")
+    pk.add_argument("--difficulty", choices=list(DIRECTIONS), default="hard", help="easy: across/down, medium: + diagonals, hard: all 8 directions")
+    pk.add_argument("--blocklist", type=str, default="", help="File of extra words that must not appear anywhere in the grid")
+    pk.add_argument("--jobs", type=int, default=1, help="Worker processes used to build puzzles")
+    pk.add_argument("--seed", type=int, default=None)
+    pk.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
+    pk.add_argument("--body-font", dest="body_font", type=str, default="", help="TTF for letters and word lists, e.g. for Polish diacritics")
+    pk.add_argument("--out", default="samples/wordsearch_book.pdf")
+
+    # Word lists
+    pw = sub.add_parser("wordlist", help="Manage compiled word lists")
+    wl_sub = pw.add_subparsers(dest="wordlist_command", required=True)
+    pw1 = wl_sub.add_parser("compile", help="Compile a text word list (word or word<TAB>count per line)")
+    pw1.add_argument("--lang", default="en", help="Language code or list name; picks the source and target paths")
+    pw1.add_argument("--src", default="", help="Source text file (default: the language's bundled list)")
+    pw1.add_argument("--out", default="", help="Compiled file (default: next to the source, .kwl)")
+
     # Maze
     p8 = sub.add_parser("maze", help="Generate mazes")
-    p8.add_argument("--size", type=int, default=15)
+    p8.add_argument("--size", type=int, default=15, help="Cells per side, up to 400 for poster mazes (before: odd wall grid; old --size N is now (N - 1) / 2)")
+    p8.add_argument(
+        "--algorithm", choices=list(ALGORITHMS), default="backtracker",
+        help="backtracker: long winding corridors; kruskal/wilson: many short dead ends; prim: short branches, easiest",
+    )
+    p8.add_argument("--seed", type=int, default=None)
     p8.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
     p8.add_argument("--out", default="samples/maze.pdf")
 
+    pmb = sub.add_parser("maze-book", help="Generate a book of mazes of measured difficulty with solutions")
+    pmb.add_argument("--count", type=positive_int, default=50)
+    pmb.add_argument("--size", type=at_least(2), default=20, help="Cells per side")
+    pmb.add_argument("--algorithm", choices=list(ALGORITHMS), default="backtracker")
+    pmb.add_argument(
+        "--min-difficulty", dest="min_difficulty", type=float, default=0.0,
+        help="0-1; mazes are re-carved until one reaches it (solution length, dead ends, branching, turns)",
+    )
+    pmb.add_argument("--jobs", type=int, default=1, help="Worker processes used to build mazes")
+    pmb.add_argument("--seed", type=int, default=None)
+    pmb.add_argument("--trim", choices=SUPPORTED_TRIM_SIZES, default="8.5x11")
+    pmb.add_argument("--out", default="samples/maze_book.pdf")
+
     # Paper
     p9 = sub.add_parser("graph", help="Generate graph paper")
     p9.add_argument("--spacing", type=float, default=0.25)
@@ -243,7 +380,9 @@ def parse_args() -> argparse.Namespace:
 
 def main():
     args = parse_args()
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    target = getattr(args, "out", None) or getattr(args, "bank", None)
+    if target and os.path.dirname(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
 
     if args.command == "notebook":
         render_notebook_pdf(
@@ -280,13 +419,117 @@ def main():
         print(f"Saved bullet journal to {args.out}")
 
     if args.command == "crossword":
-        grid, words = generate_crossword(language=args.lang)
-        render_crossword_pdf(grid, args.out, trim_size=args.trim, words=words)
+        # with clues, words the clue file lacks are kept out of the grid
+        exclude = unclued_words(args.lang, crossword_index(args.lang, max(8, args.size))) if args.clues else None
+        if args.size == GRID_SIZE:
+            random.seed(args.seed)
+            grid, words = generate_crossword(
+                language=args.lang, exclude=exclude, node_budget=args.nodes, time_budget=args.time_budget
+            )
+        else:
+            try:
+                grid, words = generate_american_crossword(
+                    args.lang, args.size, seed=args.seed, time_budget=args.time_budget, exclude=exclude
+                )
+            except RuntimeError as exc:
+                raise SystemExit(str(exc))
+        clues = get_clue_store(args.lang).clue_map(words, args.clue_difficulty) if args.clues else None
+        render_crossword_pdf(
+            grid, args.out, trim_size=args.trim, words=words, clues=clues, body_font_path=(args.body_font or None)
+        )
         print(f"Saved crossword to {args.out}")
+    elif args.command == "crossword-book":
+        try:
+            book, stats = generate_book(
+                args.count, args.lang, args.size, jobs=args.jobs, base_seed=args.seed,
+                reuse=args.reuse, time_budget=args.time_budget, node_budget=args.nodes,
+                exclude=unclued_words(args.lang, crossword_index(args.lang, max(8, args.size))) if args.clues else None,
+            )
+        except RuntimeError as exc:
+            raise SystemExit(str(exc))
+        print(
+            f"Built {stats.built} grids, repaired {stats.repaired}; rebuilt {stats.reused_words} for reused words, {stats.too_similar} near duplicates,"
+            f" {stats.too_few_words} with too few words, {stats.failed} failed fills; {stats.fallbacks} best-effort grids"
+        )
+        clues = None
+        if args.clues:
+            store, rng = get_clue_store(args.lang), random.Random(args.seed)
+            clues = [store.clue_map(words, args.clue_difficulty, rng) for _, words in book]
+        render_crossword_book_pdf(
+            [grid for grid, _ in book], args.out, trim_size=args.trim, words=[words for _, words in book],
+            answer_key=True, clues=clues, body_font_path=(args.body_font or None),
+        )
+        print(f"Saved crossword book to {args.out}")
     elif args.command == "sudoku":
-        puzzles = [make_puzzle(difficulty=args.difficulty) for _ in range(args.pages)]
-        render_sudoku_pdf(puzzles, args.out, trim_size=args.trim)
+        if args.size != 9 and (args.bank or args.seeds):
+            raise SystemExit("--bank and --seeds support 9x9 puzzles only")
+        symmetry = None if args.symmetry == "none" else args.symmetry
+        if symmetry and args.seeds:
+            raise SystemExit("--seeds variants do not keep clue symmetry")
+        if args.minimal and args.difficulty == "easy" and args.size == 9:
+            raise SystemExit("--minimal 9x9 puzzles grade above easy; pass --difficulty medium or harder")
+        if args.minimal and symmetry in UNREACHABLE_MINIMAL:
+            raise SystemExit(f"--symmetry {symmetry} puzzles are almost never minimal; pick another symmetry with --minimal")
+        if args.bank and (args.minimal or args.time_budget or args.node_budget):
+            raise SystemExit("--minimal and budgets apply to generated puzzles, not --bank")
+        options = dict(symmetry=symmetry, minimal=args.minimal, time_budget=args.time_budget, node_budget=args.node_budget)
+        batch = []
+        if args.bank:
+            book = args.book or os.path.splitext(os.path.basename(args.out))[0]
+            with PuzzleBank(args.bank) as bank:
+                puzzles = draw_or_generate(
+                    bank, book, args.pages, args.difficulty, symmetry, jobs=args.jobs, seed=args.seed
+                )
+        elif args.seeds:
+            batch = generate_batch(min(args.seeds, args.pages), args.difficulty, jobs=args.jobs, base_seed=args.seed, **options)
+            puzzles = expand_seeds([p for p, _ in batch], args.pages, rng=random.Random(args.seed))
+        else:
+            batch = generate_batch(args.pages, args.difficulty, jobs=args.jobs, base_seed=args.seed, size=args.size, **options)
+            puzzles = [p for p, _ in batch]
+        if args.stats:
+            for i, (_, st) in enumerate(batch, 1):
+                print(
+                    f"#{i}: clues={st.clues} score={st.score} minimal={st.minimal} attempts={st.attempts}"
+                    f" solver_calls={st.solver_calls} nodes={st.nodes} time={st.seconds:.3f}s"
+                    + (" budget-exhausted" if st.budget_exhausted else "")
+                )
+        render_sudoku_pdf(puzzles, args.out, trim_size=args.trim, per_page=args.per_page, answer_key=args.answer_key)
         print(f"Saved sudoku to {args.out}")
+    elif args.command == "sudoku-bank":
+        with PuzzleBank(args.bank) as bank:
+            if args.bank_command == "fill":
+                symmetry = None if args.symmetry == "none" else args.symmetry
+                added = bank.fill(args.count, args.difficulty, jobs=args.jobs, symmetry=symmetry)
+                print(f"Added {added} {args.difficulty} puzzles to {args.bank}")
+            elif args.bank_command == "expand":
+                added = bank.expand(args.count, args.difficulty)
+                print(f"Added {added} {args.difficulty} variants to {args.bank}")
+            for difficulty, (total, unused) in bank.stats().items():
+                print(f"{difficulty}: {total} puzzles, {unused} unused")
+    elif args.command == "sudoku-verify":
+        if args.bank:
+            if not os.path.exists(args.bank):
+                raise SystemExit(f"No puzzle bank at {args.bank}")
+            with PuzzleBank(args.bank) as bank:
+                rows = bank.export()
+            labels = [f"id {pid}" for pid, _, _ in rows]
+            puzzles = [puzzle for _, puzzle, _ in rows]
+            solutions = [solution for _, _, solution in rows]
+        else:
+            labels, puzzles, solutions = read_jsonl(args.jsonl)
+        report = verify_batch(puzzles, solutions)
+        print(
+            f"Checked {len(puzzles)} puzzles: {report.unique} unique, {report.multiple} with several solutions,"
+            f" {report.unsolvable} unsolvable, {report.bad_solutions} bad stored solutions"
+        )
+        failures = report.failures()
+        for k in failures[:20]:
+            note = ["no solution", "unique", "several solutions"][report.counts[k]]
+            if report.solution_ok is not None and not report.solution_ok[k]:
+                note += ", stored solution wrong"
+            print(f"  {labels[k]}: {note}")
+        if failures:
+            raise SystemExit(1)
     elif args.command == "coloring":
         render_coloring_pdf(args.kind, args.pages, args.out, trim_size=args.trim)
         print(f"Saved coloring pages to {args.out}")
@@ -297,13 +540,48 @@ def main():
         render_simple_arithmetic_pdf(args.out, problems=args.problems, max_num=args.max, trim_size=args.trim)
         print(f"Saved arithmetic worksheets to {args.out}")
     elif args.command == "wordsearch":
-        from .crossword import load_wordlist
-        words = load_wordlist(args.lang)[:20]
-        render_word_search_pdf(args.out, words=words, size=args.size, trim_size=args.trim)
+        words = load_theme(args.words) if args.words else get_wordlist(args.lang).sample(20)
+        blocklist = get_blocklist(args.lang) + tuple(load_theme(args.blocklist) if args.blocklist else ())
+        render_word_search_pdf(
+            args.out, words=words, size=args.size, trim_size=args.trim, body_font_path=(args.body_font or None),
+            answer_key=args.answer_key, blocklist=blocklist,
+        )
         print(f"Saved word search to {args.out}")
+    elif args.command == "wordsearch-book":
+        puzzles = generate_word_search_book(
+            args.count, args.size, args.lang, theme=load_theme(args.words) if args.words else None,
+            words=args.per_puzzle, difficulty=args.difficulty, jobs=args.jobs, base_seed=args.seed,
+            blocklist=get_blocklist(args.lang) + tuple(load_theme(args.blocklist) if args.blocklist else ()),
+        )
+        render_word_search_book_pdf(puzzles, args.out, trim_size=args.trim, body_font_path=(args.body_font or None))
+        print(f"Saved word search book ({len(puzzles)} puzzles) to {args.out}")
+    elif args.command == "wordlist":
+        src = args.src or source_path(args.lang)
+        out = args.out or os.path.splitext(src)[0] + COMPILED_SUFFIX
+        count = compile_wordlist(src, out)
+        print(f"Compiled {count} words to {out}")
     elif args.command == "maze":
-        render_maze_pdf(args.out, size=args.size, trim_size=args.trim)
+        render_maze_pdf(args.out, size=args.size, trim_size=args.trim, algorithm=args.algorithm, seed=args.seed)
         print(f"Saved maze to {args.out}")
+    elif args.command == "maze-book":
+        if not 0.0 <= args.min_difficulty <= 1.0:
+            raise SystemExit("--min-difficulty must be between 0 and 1")
+        puzzles = generate_maze_book(
+            args.count, args.size, args.algorithm, min_difficulty=args.min_difficulty, jobs=args.jobs, base_seed=args.seed,
+        )
+        below = sum(p.difficulty < args.min_difficulty for p in puzzles)
+        print(
+            f"Difficulty {puzzles[0].difficulty:.2f}-{puzzles[-1].difficulty:.2f};"
+            f" {below} mazes below the target after {MAZE_ATTEMPTS} attempts each"
+        )
+        if below:
+            print(
+                f"Warning: --min-difficulty {args.min_difficulty:g} is above what {args.algorithm} reaches at"
+                f" --size {args.size} (hardest {puzzles[-1].difficulty:.2f}); lower it, use a smaller --size"
+                " or the backtracker algorithm"
+            )
+        render_maze_book_pdf(puzzles, args.out, trim_size=args.trim, answer_key=True)
+        print(f"Saved maze book ({len(puzzles)} mazes) to {args.out}")
     elif args.command == "graph":
         render_graph_paper_pdf(args.out, spacing_inch=args.spacing, trim_size=args.trim)
         print(f"Saved graph paper to {args.out}")
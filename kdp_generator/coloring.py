@@ -1,6 +1,12 @@
 import random
+from math import cos, pi, sin
 from typing import List
 
+import numpy as np
+
+from .pdf_utils import arc_ops, begin_form, circle_ops, polyline_ops
+from .tiling import draw_hex_tiling, draw_star_tiling, draw_truchet
+
 
 def draw_geometric(canvas, page_width: float, page_height: float, margin: float):
     canvas.setLineWidth(1.5)
@@ -24,8 +30,30 @@ def draw_geometric(canvas, page_width: float, page_height: float, margin: float)
                 canvas.ellipse(x + w * 0.2, y + h * 0.2, x + w * 0.8, y + h * 0.8, stroke=1, fill=0)
 
 
+def _polar(r: float, angle: float) -> List[float]:
+    return [r * cos(angle), r * sin(angle)]
+
+
+def place_radial(canvas, name: str, count: int, cx: float, cy: float, base_angle: float = 0.0, mirror: bool = False):
+    """Draw form `name` `count` times about (cx, cy), each copy turned a
+    further 1/count of a revolution from `base_angle`. With `mirror`
+    every copy is also drawn reflected in its own x axis (a kaleidoscope's
+    mirror symmetry). The page only holds a transform and a form
+    reference per copy."""
+    for p in range(count):
+        angle = base_angle + 2 * pi * p / count
+        c, s = cos(angle), sin(angle)
+        for matrix in ((c, s, -s, c), (c, s, s, -c))[: 1 + mirror]:
+            canvas.saveState()
+            canvas.transform(*matrix, cx, cy)
+            canvas.doForm(name)
+            canvas.restoreState()
+
+
 def draw_mandala(canvas, page_width: float, page_height: float, margin: float):
-    from math import cos, sin, pi
+    """Concentric rings of petal motifs. One petal's wedge of every ring
+    (circle arc, motif and star chord) is a Form XObject, placed once per
+    petal by place_radial."""
     cx = page_width / 2
     cy = page_height / 2
     radius = min(page_width, page_height) / 2 - margin
@@ -33,36 +61,78 @@ def draw_mandala(canvas, page_width: float, page_height: float, margin: float):
     rings = random.randint(5, 10)
     base_angle = random.random() * 2 * pi
 
+    step = 2 * pi / petals
+    spoke, side = _polar(1, 0.0), _polar(1, step / 2)
+    # even rings: a chord per petal; odd rings: a small diamond/leaf
+    chord = np.array([[spoke, side]])
+    leaf = np.array([[spoke, _polar(0.85, step / 4), side]])
+    # star polygon joining every petal to the next but one
+    star = np.array([[spoke, _polar(1, 2 * step)]])
+
+    name = begin_form(canvas, "Mandala", radius + 2)
     for r in range(1, rings + 1):
         pr = (r / rings) * radius
-        canvas.setLineWidth(1 + (r % 3 == 0))
-        # ring
-        canvas.circle(cx, cy, pr, stroke=1, fill=0)
-        # spokes and motifs
-        for p in range(petals):
-            angle = base_angle + (2 * pi * p) / petals
-            x1 = cx + pr * cos(angle)
-            y1 = cy + pr * sin(angle)
-            x2 = cx + pr * cos(angle + pi / petals)
-            y2 = cy + pr * sin(angle + pi / petals)
-            if r % 2 == 0:
-                canvas.line(x1, y1, x2, y2)
-            else:
-                # small diamond/leaf
-                x3 = cx + (pr * 0.85) * cos(angle + pi / (2 * petals))
-                y3 = cy + (pr * 0.85) * sin(angle + pi / (2 * petals))
-                canvas.line(x1, y1, x3, y3)
-                canvas.line(x3, y3, x2, y2)
-        # occasional star polygon
+        ops = [arc_ops(pr, 0.0, step), polyline_ops(pr * (chord if r % 2 == 0 else leaf))]
         if r % 3 == 0:
-            for p in range(petals):
-                a1 = base_angle + (2 * pi * p) / petals
-                a2 = base_angle + (2 * pi * ((p + 2) % petals)) / petals
-                x1 = cx + pr * cos(a1)
-                y1 = cy + pr * sin(a1)
-                x2 = cx + pr * cos(a2)
-                y2 = cy + pr * sin(a2)
-                canvas.line(x1, y1, x2, y2)
+            ops.append(polyline_ops(pr * star))
+        canvas.setLineWidth(1 + (r % 3 == 0))
+        canvas.addLiteral("n " + " ".join(ops) + " S")
+    canvas.endForm()
+    place_radial(canvas, name, petals, cx, cy, base_angle)
+
+
+def draw_rosette(canvas, page_width: float, page_height: float, margin: float):
+    """Rings of interlocking circles, every other ring turned half a petal,
+    around a centre circle and inside a rim: one petal's circles form the
+    instanced wedge."""
+    cx = page_width / 2
+    cy = page_height / 2
+    radius = min(page_width, page_height) / 2 - margin
+    petals = random.choice([6, 8, 10, 12, 16])
+    layers = random.randint(3, 5)
+    step = 2 * pi / petals
+
+    name = begin_form(canvas, "Rosette", radius + 2)
+    ops = [arc_ops(radius, 0.0, step)]
+    spacing = radius / (layers + 1)
+    for k in range(1, layers + 1):
+        d = spacing * k
+        ops.append(circle_ops(*_polar(d, step / 2 * (k % 2)), min(d * sin(step / 2) * 1.3, spacing * 0.8)))
+    canvas.setLineWidth(1.5)
+    canvas.addLiteral("n " + " ".join(ops) + " S")
+    canvas.endForm()
+    canvas.setLineWidth(1.5)
+    canvas.circle(cx, cy, spacing * 0.5, stroke=1, fill=0)
+    place_radial(canvas, name, petals, cx, cy, random.random() * 2 * pi)
+
+
+def draw_kaleidoscope(canvas, page_width: float, page_height: float, margin: float):
+    """Bands of half-diamonds on the mirror lines of a sector, mirrored and
+    turned into a full circle: one half-sector wedge placed 2 x `sectors`
+    times, so every half-diamond closes into a diamond."""
+    cx = page_width / 2
+    cy = page_height / 2
+    radius = min(page_width, page_height) / 2 - margin
+    sectors = random.choice([6, 8, 10, 12])
+    half = pi / sectors
+
+    bands = random.randint(3, 5)
+    width = radius * 0.85 / bands
+    edges = [radius * 0.1 + width * (j / 2 + random.uniform(-0.1, 0.1)) for j in range(bands * 2)]
+    shapes = []
+    for k in range(bands):
+        inner, outer = edges[2 * k], edges[2 * k + 1] + width / 2
+        mirror_line = half * (k % 2)
+        tip = random.uniform(0.5, 1.0) * half
+        shapes.append([_polar(inner, mirror_line), _polar((inner + outer) / 2, abs(mirror_line - tip)), _polar(outer, mirror_line)])
+    name = begin_form(canvas, "Kaleidoscope", radius + 2)
+    ops = [arc_ops(radius, 0.0, half), polyline_ops(np.array(shapes))]
+    ops.extend(arc_ops(edges[2 * k] - width * 0.05, 0.0, half) for k in range(1, bands))
+    canvas.setLineWidth(1.5)
+    canvas.setLineJoin(1)
+    canvas.addLiteral("n " + " ".join(ops) + " S")
+    canvas.endForm()
+    place_radial(canvas, name, sectors, cx, cy, random.random() * 2 * pi, mirror=True)
 
 
 def draw_kids_simple(canvas, page_width: float, page_height: float, margin: float):
@@ -173,6 +243,16 @@ def render_coloring_pdf(kind: str, pages: int, filename: str, trim_size: str = "
     for i in range(1, pages + 1):
         if kind == "mandala":
             draw_mandala(canvas, page_width, page_height, margin)
+        elif kind == "rosette":
+            draw_rosette(canvas, page_width, page_height, margin)
+        elif kind == "kaleidoscope":
+            draw_kaleidoscope(canvas, page_width, page_height, margin)
+        elif kind == "truchet":
+            draw_truchet(canvas, page_width, page_height, margin)
+        elif kind == "stars":
+            draw_star_tiling(canvas, page_width, page_height, margin)
+        elif kind == "hex":
+            draw_hex_tiling(canvas, page_width, page_height, margin)
         elif kind == "kids":
             draw_kids_simple(canvas, page_width, page_height, margin)
         elif kind == "infant":
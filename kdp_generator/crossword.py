@@ -1,32 +1,54 @@
 import random
-from typing import List, Tuple, Dict, Optional, Set
-import os
+import time
+from functools import lru_cache
+from typing import List, Tuple, Dict, Iterator, Optional, Sequence, Set
 
-from reportlab.lib.colors import black, white
-from .pdf_utils import create_canvas, size_to_points, draw_footer_page_number
+from reportlab.lib.colors import black
+from .pdf_utils import (
+    DEFAULT_MARGIN,
+    LABEL_HEIGHT,
+    LINE_SPACING,
+    Line,
+    create_canvas,
+    draw_footer_page_number,
+    draw_grid_label,
+    draw_page_title,
+    draw_text_columns,
+    grid_slots,
+    register_body_font,
+    size_to_points,
+    text_width,
+)
+from .crossword_score import score_grid, word_commonness
+from .word_index import PatternIndex
+from .wordlist import get_wordlist
 
 GRID_SIZE = 10
+# smallest side of a grid in the solutions section
+ANSWER_GRID_INCH = 1.9
+# beam search of generate_crossword: grids kept per step, placements tried
+# per grid, and grids scored before the best one is returned
+BEAM_WIDTH = 4
+BRANCHING = 6
+NODE_BUDGET = 1500
 
 
-def load_wordlist(language: str) -> List[str]:
-    base_dir = os.path.join(os.path.dirname(__file__), "wordlists")
-    filename = "english.txt" if language.lower().startswith("en") else "polish.txt"
-    path = os.path.join(base_dir, filename)
-    with open(path, "r", encoding="utf-8") as f:
-        words = [w.strip().upper() for w in f if w.strip() and w.strip().isalpha()]
-    # prefer 3-8 letters for better fit
-    words = [w for w in words if 3 <= len(w) <= 8]
-    random.shuffle(words)
-    return words
+@lru_cache(maxsize=None)
+def crossword_index(language: str, max_length: int = 8) -> PatternIndex:
+    """Pattern index over the 3 to `max_length` letter words of `language`,
+    shared by every crossword built in this process."""
+    groups = get_wordlist(language).groups
+    return PatternIndex({n: groups[n] for n in groups if 3 <= n <= max_length})
 
 
 def can_place(grid: List[List[str]], word: str, r: int, c: int, direction: str, require_overlap: bool) -> bool:
+    n = len(grid)
     dr, dc = (0, 1) if direction == 'A' else (1, 0)
-    if not (0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE):
+    if not (0 <= r < n and 0 <= c < n):
         return False
     r2 = r + dr * (len(word) - 1)
     c2 = c + dc * (len(word) - 1)
-    if not (0 <= r2 < GRID_SIZE and 0 <= c2 < GRID_SIZE):
+    if not (0 <= r2 < n and 0 <= c2 < n):
         return False
     overlap = False
     for i, ch in enumerate(word):
@@ -43,9 +65,9 @@ def can_place(grid: List[List[str]], word: str, r: int, c: int, direction: str,
     # Check before and after the word
     br, bc = r - dr, c - dc
     ar, ac = r2 + dr, c2 + dc
-    if 0 <= br < GRID_SIZE and 0 <= bc < GRID_SIZE and grid[br][bc].isalpha():
+    if 0 <= br < n and 0 <= bc < n and grid[br][bc].isalpha():
         return False
-    if 0 <= ar < GRID_SIZE and 0 <= ac < GRID_SIZE and grid[ar][ac].isalpha():
+    if 0 <= ar < n and 0 <= ac < n and grid[ar][ac].isalpha():
         return False
     # Check side-adjacency along the word
     for i in range(len(word)):
@@ -54,12 +76,12 @@ def can_place(grid: List[List[str]], word: str, r: int, c: int, direction: str,
         # perpendicular neighbors
         if direction == 'A':
             for nr in (rr - 1, rr + 1):
-                if 0 <= nr < GRID_SIZE and grid[nr][cc].isalpha():
+                if 0 <= nr < n and grid[nr][cc].isalpha():
                     if grid[rr][cc] == '.':
                         return False
         else:
             for nc in (cc - 1, cc + 1):
-                if 0 <= nc < GRID_SIZE and grid[rr][nc].isalpha():
+                if 0 <= nc < n and grid[rr][nc].isalpha():
                     if grid[rr][cc] == '.':
                         return False
     return True
@@ -73,93 +95,388 @@ def place_word(grid: List[List[str]], word: str, r: int, c: int, direction: str)
         grid[rr][cc] = ch
 
 
-def generate_crossword(language: str = "pl") -> Tuple[List[List[str]], List[str]]:
-    # Start with empty grid
-    grid = [['.' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-    words = load_wordlist(language)
-
-    used: List[str] = []
-    placed_any = False
-
-    # Place first word in the middle horizontally for better anchoring
-    for w in words[:]:
-        if len(w) <= GRID_SIZE:
-            r = GRID_SIZE // 2
-            c = max(0, (GRID_SIZE - len(w)) // 2)
-            if can_place(grid, w, r, c, 'A', require_overlap=False):
-                place_word(grid, w, r, c, 'A')
-                used.append(w)
-                words.remove(w)
-                placed_any = True
-                break
-
-    # Place remaining words trying to overlap
-    for w in words:
-        placed = False
-        # Try to place with overlap preference
-        positions: List[Tuple[int, int, str]] = []
-        # Heuristic: try across first then down, random order
-        dirs = ['A', 'D']
-        random.shuffle(dirs)
-        for direction in dirs:
-            for r in range(GRID_SIZE):
-                for c in range(GRID_SIZE):
-                    if can_place(grid, w, r, c, direction, require_overlap=True):
-                        positions.append((r, c, direction))
-        random.shuffle(positions)
-        for (r, c, direction) in positions:
-            place_word(grid, w, r, c, direction)
-            used.append(w)
-            placed = True
-            break
-        if not placed:
-            # as a fallback allow placement without overlap if grid is very sparse
-            if sum(ch.isalpha() for row in grid for ch in row) < 10:
-                tries = [(random.randrange(GRID_SIZE), random.randrange(GRID_SIZE), random.choice(['A', 'D'])) for _ in range(50)]
-                for r, c, direction in tries:
-                    if can_place(grid, w, r, c, direction, require_overlap=False):
-                        place_word(grid, w, r, c, direction)
-                        used.append(w)
-                        placed = True
+def _line_cells(r: int, c: int, direction: str, size: int = GRID_SIZE) -> List[Tuple[int, int]]:
+    if direction == 'A':
+        return [(r, j) for j in range(size)]
+    return [(i, c) for i in range(size)]
+
+
+def open_slots(grid: List[List[str]], require_overlap: bool, lengths: Sequence[int]) -> Iterator[Tuple[int, int, str, str]]:
+    """Every (row, col, direction, pattern) where a word of one of `lengths`
+    may go under the same rules as can_place. The pattern holds the letters
+    already in the grid and '?' for open cells; fully lettered runs and
+    runs through a placed word of the same direction are skipped."""
+    n = len(grid)
+    wanted = set(lengths)
+    longest = max(wanted, default=0)
+    for direction in ('A', 'D'):
+        for k in range(n):
+            cells = _line_cells(k, k, direction, n)
+            letters = [grid[r][c] if grid[r][c].isalpha() else '' for r, c in cells]
+            # open cells touching a letter from the side cannot take a word
+            blocked = []
+            for r, c in cells:
+                if letters[len(blocked)]:
+                    blocked.append(False)
+                    continue
+                if direction == 'A':
+                    side = [grid[nr][c] for nr in (r - 1, r + 1) if 0 <= nr < n]
+                else:
+                    side = [grid[r][nc] for nc in (c - 1, c + 1) if 0 <= nc < n]
+                blocked.append(any(ch.isalpha() for ch in side))
+            for start in range(n):
+                if start > 0 and letters[start - 1]:
+                    continue
+                pattern = []
+                overlap = 0
+                for end in range(start, min(n, start + longest)):
+                    # two letters in a row belong to a word in this direction,
+                    # which the new word would swallow
+                    if blocked[end] or (end > start and letters[end] and letters[end - 1]):
                         break
-        # stop if enough words
-        if len(used) >= 18:
-            break
+                    pattern.append(letters[end] or '?')
+                    overlap += bool(letters[end])
+                    if len(pattern) not in wanted or (require_overlap and not overlap) or overlap == len(pattern):
+                        continue
+                    if end + 1 < n and letters[end + 1]:
+                        continue
+                    r, c = cells[start]
+                    yield r, c, direction, ''.join(pattern)
 
-    # Convert non-letter cells to blocks '#'
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            if not grid[r][c].isalpha():
-                grid[r][c] = '#'
 
-    if not used:
+def _expansions(grid: List[List[str]], index: PatternIndex, available: Dict[int, int], rng, branching: int):
+    """Up to `branching` (row, col, direction, length, word id) placements
+    on distinct open slots, crossing a placed word where possible; a very
+    sparse grid may also take a word that crosses nothing."""
+    filled = sum(ch.isalpha() for row in grid for ch in row)
+    for require_overlap in (True, False) if filled < 10 else (True,):
+        slots = list(open_slots(grid, require_overlap, index.lengths))
+        rng.shuffle(slots)
+        found = []
+        for r, c, direction, pattern in slots:
+            mask = index.matches(pattern, available[len(pattern)])
+            if mask:
+                found.append((r, c, direction, len(pattern), index.pick(mask, len(pattern), rng)))
+                if len(found) == branching:
+                    break
+        if found:
+            return found
+    return []
+
+
+def generate_crossword(
+    language: str = "pl",
+    max_words: int = 18,
+    size: int = GRID_SIZE,
+    rng=random,
+    exclude: Optional[Dict[int, int]] = None,
+    beam_width: int = BEAM_WIDTH,
+    node_budget: int = NODE_BUDGET,
+    time_budget: Optional[float] = None,
+) -> Tuple[List[List[str]], List[str]]:
+    """Sparse fill-in grid of up to `max_words` crossing words. Dense
+    American-style grids are filled by crossword_fill instead. `exclude`
+    maps word lengths to bitsets of crossword_index word ids that must not
+    be used, e.g. the words of earlier puzzles in a book.
+
+    A beam search grows the `beam_width` best partial grids by one word at
+    a time (BRANCHING placements each, ranked by crossword_score) and is
+    restarted from a new first word until `node_budget` grids have been
+    scored or `time_budget` seconds have passed; the best grid seen is
+    returned. The node budget keeps a seeded `rng` reproducible. Raises
+    RuntimeError only when no word is available at all."""
+    exclude = exclude or {}
+    index = crossword_index(language, min(8, size))
+    lengths = index.lengths
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    # unused words per length, as bitsets over that length's word ids
+    unused: Dict[int, int] = {n: ~exclude.get(n, 0) for n in lengths}
+    starts = {n: index.matches('?' * n, unused[n]) for n in lengths}
+    starts = {n: mask for n, mask in starts.items() if mask}
+    if not starts:
         raise RuntimeError("Could not place words for crossword. Try again with another language or update wordlist.")
 
+    nodes = 0
+    best = None
+
+    def spent() -> bool:
+        return nodes >= node_budget or (deadline is not None and time.monotonic() > deadline)
+
+    while best is None or not spent():
+        # Place first word in the middle horizontally for better anchoring
+        grid = [['.' for _ in range(size)] for _ in range(size)]
+        n = rng.choices(list(starts), weights=[len(index.groups[n]) for n in starts])[0]
+        k = index.pick(starts[n], n, rng)
+        w = index.word(n, k)
+        place_word(grid, w, size // 2, (size - len(w)) // 2, 'A')
+        available = dict(unused)
+        available[n] &= ~(1 << k)
+        common = [word_commonness(index, n, k)]
+        beam = [(score_grid(grid, common).total, grid, [w], available, common)]
+        nodes += 1
+        if best is None or beam[0][0] > best[0]:
+            best = beam[0]
+
+        # Grow every grid in the beam by one word and keep the best children
+        while beam and not spent():
+            children = []
+            for _, grid, used, available, common in beam:
+                if len(used) >= max_words:
+                    continue
+                for r, c, direction, n, word_id in _expansions(grid, index, available, rng, BRANCHING):
+                    child = [row[:] for row in grid]
+                    word = index.word(n, word_id)
+                    place_word(child, word, r, c, direction)
+                    child_available = dict(available)
+                    child_available[n] &= ~(1 << word_id)
+                    child_common = common + [word_commonness(index, n, word_id)]
+                    children.append((score_grid(child, child_common).total, child, used + [word], child_available, child_common))
+                    nodes += 1
+            children.sort(key=lambda state: state[0], reverse=True)
+            beam, seen = [], set()
+            for state in children:
+                key = ''.join(map(''.join, state[1]))
+                if key not in seen:
+                    seen.add(key)
+                    beam.append(state)
+                    if len(beam) == beam_width:
+                        break
+            if beam and beam[0][0] > best[0]:
+                best = beam[0]
+
+    _, grid, used, _, _ = best
+    # Convert non-letter cells to blocks '#'
+    grid = [[ch if ch.isalpha() else '#' for ch in row] for row in grid]
     return grid, used
 
 
-def render_crossword_pdf(grid: List[List[str]], filename: str, trim_size: str = "8.5x11", words: Optional[List[str]] = None):
+def number_grid(grid: List[List[str]]) -> Tuple[Dict[Tuple[int, int], int], List[Tuple[int, str, str]]]:
+    """Standard crossword numbering: every cell that starts an across or a
+    down word of two or more letters gets the next number, reading left to
+    right and top to bottom. Returns cell -> number and the (number,
+    direction, word) entries, across before down."""
+    rows, cols = len(grid), len(grid[0])
+    numbers: Dict[Tuple[int, int], int] = {}
+    across: List[Tuple[int, str, str]] = []
+    down: List[Tuple[int, str, str]] = []
+    for r in range(rows):
+        for c in range(cols):
+            if grid[r][c] == '#':
+                continue
+            words = []
+            for direction, dr, dc, found in (('A', 0, 1, across), ('D', 1, 0, down)):
+                pr, pc = r - dr, c - dc
+                if pr >= 0 and pc >= 0 and grid[pr][pc] != '#':
+                    continue
+                rr, cc, word = r, c, ''
+                while rr < rows and cc < cols and grid[rr][cc] != '#':
+                    word += grid[rr][cc]
+                    rr, cc = rr + dr, cc + dc
+                if len(word) > 1:
+                    words.append((direction, word, found))
+            if words:
+                numbers[(r, c)] = len(numbers) + 1
+                for direction, word, found in words:
+                    found.append((numbers[(r, c)], direction, word))
+    return numbers, across + down
+
+
+def _draw_grid(
+    canvas,
+    grid: List[List[str]],
+    x0: float,
+    y0: float,
+    size: float,
+    letters: bool = False,
+    numbers: Optional[Dict[Tuple[int, int], int]] = None,
+    font: str = "Helvetica",
+):
+    """Draw `grid` (any number of rows and columns) centred in the square of
+    side `size` at (x0, y0): blocks filled black, open cells outlined, and
+    their letters when `letters` is set or small clue `numbers` in the
+    corner. Blocks and outlines go out as one path each."""
+    rows, cols = len(grid), len(grid[0])
+    cell = size / max(rows, cols)
+    x0 += (size - cell * cols) / 2
+    y0 += (size - cell * rows) / 2
+
+    blocks = canvas.beginPath()
+    cells = canvas.beginPath()
+    for r in range(rows):
+        for c in range(cols):
+            path = blocks if grid[r][c] == '#' else cells
+            path.rect(x0 + c * cell, y0 + (rows - 1 - r) * cell, cell, cell)
+    canvas.setFillColor(black)
+    # 1.5pt suits 10x10 cells; thinner for the small cells of big grids
+    canvas.setLineWidth(min(1.5, cell / 16))
+    canvas.drawPath(blocks, stroke=0, fill=1)
+    canvas.drawPath(cells, stroke=1, fill=0)
+
+    if letters:
+        font_size = cell * 0.6
+        text = canvas.beginText()
+        text.setFont(font, font_size)
+        for r in range(rows):
+            for c in range(cols):
+                ch = grid[r][c]
+                if ch == '#':
+                    continue
+                w = text_width(ch, font, font_size)
+                text.setTextOrigin(x0 + c * cell + (cell - w) / 2, y0 + (rows - 1 - r) * cell + cell / 2 - font_size * 0.35)
+                text.textOut(ch)
+        canvas.drawText(text)
+    if numbers:
+        font_size = cell * 0.28
+        text = canvas.beginText()
+        text.setFont("Helvetica", font_size)
+        for (r, c), number in numbers.items():
+            text.setTextOrigin(x0 + c * cell + cell * 0.08, y0 + (rows - r) * cell - font_size * 1.05)
+            text.textOut(str(number))
+        canvas.drawText(text)
+
+
+def _page_grid(page_width: float, page_height: float, margin: float) -> Tuple[float, float, float]:
+    """Lower-left corner and side of the largest square centred in the margins."""
+    size = min(page_width, page_height) - 2 * margin
+    return (page_width - size) / 2, (page_height - size) / 2, size
+
+
+WORD_LIST_FONT = 9
+WORD_LIST_COLUMN = 90
+# clue text sizes tried from the largest down until the clues fit
+CLUE_FONT_SIZES = (10, 9, 8, 7)
+CLUE_COLUMN = 160
+SOLUTION_CELL = 8
+
+
+def wrap_text(text: str, width: float, font: str, size: float) -> List[str]:
+    """Break `text` at spaces into lines no wider than `width` (a single
+    longer word keeps a line of its own)."""
+    space = text_width(" ", font, size)
+    lines: List[str] = []
+    line, line_w = "", 0.0
+    for word in text.split():
+        w = text_width(word, font, size)
+        if line and line_w + space + w > width:
+            lines.append(line)
+            line, line_w = word, w
+        else:
+            line, line_w = (f"{line} {word}", line_w + space + w) if line else (word, w)
+    if line:
+        lines.append(line)
+    return lines
+
+
+def word_list_lines(words: Sequence[str]) -> List[Line]:
+    """Fill-in word list: words grouped by length, each group under a bold
+    "N letters" heading."""
+    lines: List[Line] = []
+    for n in sorted({len(w) for w in words}):
+        lines.append((f"{n} letters", True, 0.0))
+        lines.extend((w, False, 0.0) for w in sorted(w for w in words if len(w) == n))
+    return lines
+
+
+def clue_lines(
+    entries: Sequence[Tuple[int, str, str]],
+    clues: Dict[str, str],
+    width: float,
+    size: float,
+    font: str = "Helvetica",
+) -> List[Line]:
+    """"Across" and "Down" sections of numbered clues wrapped to `width`,
+    continuation lines indented past the number. Words without a clue show
+    their letter count."""
+    indent = text_width("00. ", font, size)
+    lines: List[Line] = []
+    for direction, heading in (('A', "Across"), ('D', "Down")):
+        lines.append((heading, True, 0.0))
+        for number, _, word in (e for e in entries if e[1] == direction):
+            label = f"{number}. "
+            wrapped = wrap_text(clues.get(word) or f"({len(word)})", width - indent, font, size)
+            lines.append((label + wrapped[0], False, indent - text_width(label, font, size)))
+            lines.extend((more, False, indent) for more in wrapped[1:])
+    return lines
+
+
+def _puzzle_pages(
+    canvas,
+    grid: List[List[str]],
+    title: str,
+    lines_for,
+    sizes: Sequence[float],
+    cols: int,
+    page_width: float,
+    page_height: float,
+    margin: float,
+    page_num: int,
+    numbers: Optional[Dict[Tuple[int, int], int]] = None,
+    font: str = "Helvetica",
+) -> int:
+    """Page(s) of one puzzle. `lines_for(size, column width)` gives the
+    text flowed in `cols` columns under the grid, at the largest of `sizes`
+    that leaves the grid at least half the page width; otherwise the grid
+    takes the page and the text follows at sizes[0]. Returns the next page
+    number."""
+    inner_w = page_width - 2 * margin
+    col_w = inner_w / cols
+    top = page_height - margin - 10
+    draw_page_title(canvas, page_width, page_height, title)
+    for size in sizes:
+        lines = lines_for(size, col_w - 8)
+        list_h = -(-len(lines) // cols) * size * LINE_SPACING + 12 if lines else 0
+        grid_size = min(inner_w, top - margin - list_h)
+        if grid_size >= inner_w / 2:
+            _draw_grid(canvas, grid, (page_width - grid_size) / 2, top - grid_size, grid_size, numbers=numbers)
+            lines = lines[draw_text_columns(canvas, lines, margin, top - grid_size - 12, margin, cols, col_w, size, font):]
+            break
+    else:
+        size = sizes[0]
+        lines = lines_for(size, col_w - 8)
+        _draw_grid(canvas, grid, *_page_grid(page_width, page_height, margin), numbers=numbers)
+    draw_footer_page_number(canvas, page_width, margin, page_num)
+    canvas.showPage()
+    page_num += 1
+    while lines:
+        draw_page_title(canvas, page_width, page_height, f"{title} (cont.)")
+        lines = lines[draw_text_columns(canvas, lines, margin, top - 10, margin, cols, col_w, size, font):]
+        draw_footer_page_number(canvas, page_width, margin, page_num)
+        canvas.showPage()
+        page_num += 1
+    return page_num
+
+
+def _clue_columns(page_width: float, margin: float) -> int:
+    return max(2, int((page_width - 2 * margin) // CLUE_COLUMN))
+
+
+def render_crossword_pdf(
+    grid: List[List[str]],
+    filename: str,
+    trim_size: str = "8.5x11",
+    words: Optional[List[str]] = None,
+    clues: Optional[Dict[str, str]] = None,
+    body_font_path: Optional[str] = None,
+):
+    """A crossword and its word list on the next page. With `clues` (word
+    -> clue text) the grid is numbered instead and Across/Down clues are set
+    under it, at the largest size that fits. `body_font_path` (a TTF) sets
+    the clues, e.g. for Polish letters the base fonts lack."""
     canvas = create_canvas(filename, trim_size)
+    font = register_body_font(body_font_path) or "Helvetica"
     page_width, page_height = size_to_points(trim_size)
     margin = 0.75 * 72
 
-    grid_size = min(page_width, page_height) - 2 * margin
-    cell_size = grid_size / GRID_SIZE
-    origin_x = (page_width - grid_size) / 2
-    origin_y = (page_height - grid_size) / 2
+    if clues is not None:
+        numbers, entries = number_grid(grid)
+        _puzzle_pages(
+            canvas, grid, "Crossword", lambda size, width: clue_lines(entries, clues, width, size, font), CLUE_FONT_SIZES,
+            _clue_columns(page_width, margin), page_width, page_height, margin, 1, numbers=numbers, font=font,
+        )
+        canvas.save()
+        return
 
-    canvas.setLineWidth(1.5)
-
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            x = origin_x + c * cell_size
-            y = origin_y + (GRID_SIZE - 1 - r) * cell_size
-            if grid[r][c] == '#':
-                canvas.setFillColor(black)
-                canvas.rect(x, y, cell_size, cell_size, fill=1, stroke=0)
-            else:
-                canvas.setFillColor(white)
-                canvas.rect(x, y, cell_size, cell_size, fill=1, stroke=1)
+    _draw_grid(canvas, grid, *_page_grid(page_width, page_height, margin))
 
     draw_footer_page_number(canvas, page_width, margin, 1)
     canvas.showPage()
@@ -192,30 +509,61 @@ def render_crossword_pdf(grid: List[List[str]], filename: str, trim_size: str =
     canvas.save()
 
 
-def render_crossword_book_pdf(grids: List[List[List[str]]], filename: str, trim_size: str = "8.5x11"):
+def render_crossword_book_pdf(
+    grids: List[List[List[str]]],
+    filename: str,
+    trim_size: str = "8.5x11",
+    words: Optional[List[List[str]]] = None,
+    answer_key: bool = False,
+    clues: Optional[List[Dict[str, str]]] = None,
+    body_font_path: Optional[str] = None,
+):
+    """One titled puzzle per page. With `words` (one list per grid) the
+    page also carries the fill-in word list grouped by length; with `clues`
+    (one word -> clue dict per grid) the grid is numbered and carries
+    Across/Down clues instead, at the largest of CLUE_FONT_SIZES that fits.
+    The text goes under the grid when that leaves the grid at least half
+    the page width, otherwise on the following pages. `answer_key` appends
+    a solutions section of small filled grids, as many per page as keep
+    cells SOLUTION_CELL points wide. Grids may differ in size.
+    `body_font_path` (a TTF) sets the word lists, clues and solution letters."""
     canvas = create_canvas(filename, trim_size)
+    font = register_body_font(body_font_path) or "Helvetica"
     page_width, page_height = size_to_points(trim_size)
-    margin = 0.75 * 72
-
-    grid_draw = min(page_width, page_height) - 2 * margin
-    cell_size = grid_draw / GRID_SIZE
-    origin_x = (page_width - grid_draw) / 2
-    origin_y = (page_height - grid_draw) / 2
+    margin = DEFAULT_MARGIN
+    inner_w = page_width - 2 * margin
+    word_cols = max(2, int(inner_w // WORD_LIST_COLUMN))
 
     page_num = 1
-    for grid in grids:
-        canvas.setLineWidth(1.5)
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                x = origin_x + c * cell_size
-                y = origin_y + (GRID_SIZE - 1 - r) * cell_size
-                if grid[r][c] == '#':
-                    canvas.setFillColor(black)
-                    canvas.rect(x, y, cell_size, cell_size, fill=1, stroke=0)
-                else:
-                    canvas.setFillColor(white)
-                    canvas.rect(x, y, cell_size, cell_size, fill=1, stroke=1)
-        draw_footer_page_number(canvas, page_width, margin, page_num)
-        canvas.showPage()
-        page_num += 1
-    canvas.save()
\ No newline at end of file
+    for k, grid in enumerate(grids):
+        title = f"Crossword #{k + 1}"
+        if clues is not None:
+            numbers, entries = number_grid(grid)
+            page_num = _puzzle_pages(
+                canvas, grid, title,
+                lambda size, width, entries=entries, found=clues[k]: clue_lines(entries, found, width, size, font),
+                CLUE_FONT_SIZES, _clue_columns(page_width, margin), page_width, page_height, margin, page_num,
+                numbers=numbers, font=font,
+            )
+        else:
+            lines = word_list_lines(words[k]) if words else []
+            page_num = _puzzle_pages(
+                canvas, grid, title, lambda size, width, lines=lines: lines, (WORD_LIST_FONT,),
+                word_cols, page_width, page_height, margin, page_num, font=font,
+            )
+
+    if answer_key and grids:
+        n = max(max(len(g), len(g[0])) for g in grids)
+        key_inch = max(ANSWER_GRID_INCH, n * SOLUTION_CELL / 72)
+        key_cols = max(1, int(inner_w // (key_inch * 72)))
+        key_rows = max(1, int((page_height - 2 * margin - 30) // (key_inch * 72 + LABEL_HEIGHT)))
+        key_slots, key_size = grid_slots(page_width, page_height, margin, key_cols, key_rows, 0.9)
+        for start in range(0, len(grids), len(key_slots)):
+            draw_page_title(canvas, page_width, page_height, "Solutions")
+            for k, (x0, y0) in enumerate(key_slots[:len(grids) - start]):
+                draw_grid_label(canvas, f"#{start + k + 1}", x0, y0, key_size)
+                _draw_grid(canvas, grids[start + k], x0, y0, key_size, letters=True, font=font)
+            draw_footer_page_number(canvas, page_width, margin, page_num)
+            canvas.showPage()
+            page_num += 1
+    canvas.save()
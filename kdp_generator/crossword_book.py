@@ -0,0 +1,164 @@
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .crossword import GRID_SIZE, NODE_BUDGET, crossword_index, generate_crossword
+from .crossword_fill import generate_american_crossword, repair_fill
+from .crossword_score import score_words
+from .sudoku_batch import derive_seed
+
+Grid = List[List[str]]
+
+
+@dataclass
+class BookStats:
+    built: int = 0
+    repaired: int = 0
+    reused_words: int = 0
+    too_similar: int = 0
+    too_few_words: int = 0
+    failed: int = 0
+    fallbacks: int = 0
+
+
+def build_grid(
+    language: str,
+    size: int,
+    seed: int,
+    exclude: Dict[int, int],
+    time_budget: float = 60.0,
+    node_budget: int = NODE_BUDGET,
+) -> Tuple[Grid, List[str]]:
+    """One grid of a book, avoiding the words in `exclude` (bitsets of
+    crossword_index word ids per length). Runs in a worker process."""
+    if size == GRID_SIZE:
+        return generate_crossword(
+            language, size=size, rng=random.Random(seed), exclude=exclude, node_budget=node_budget, time_budget=time_budget
+        )
+    return generate_american_crossword(language, size, seed=seed, time_budget=time_budget, exclude=exclude)
+
+
+def _run_now(fn, *args) -> Future:
+    """Run `fn` here, wrapped like a pool result (jobs = 1)."""
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def generate_book(
+    count: int,
+    language: str = "en",
+    size: int = GRID_SIZE,
+    jobs: int = 1,
+    base_seed: Optional[int] = None,
+    reuse: int = 1,
+    max_similarity: float = 0.5,
+    min_words: int = 6,
+    max_attempts: int = 20,
+    time_budget: float = 60.0,
+    exclude: Optional[Dict[int, int]] = None,
+    node_budget: int = NODE_BUDGET,
+) -> Tuple[List[Tuple[Grid, List[str]]], BookStats]:
+    """Build `count` grids for one book over `jobs` processes.
+
+    Every word appears in at most `reuse` grids: a shared exclusion set of
+    the words that reached that count goes out with each task. Results are
+    accepted in submission order, so a grid that took a word another grid
+    claimed after the task left is repaired against the fresh set (block
+    pattern grids: only the clashing words and, if needed, their crossings
+    are refilled) or rebuilt, as are grids with fewer than `min_words`
+    words and grids whose word set overlaps an accepted one by more than
+    `max_similarity` (Jaccard).
+    About two tasks per worker are kept in flight; the book depends on
+    `base_seed` and `jobs`. A grid rejected `max_attempts` times is
+    replaced by the best scoring (crossword_score) of its rejected
+    candidates or, when every fill failed because the word list ran out,
+    by a grid built without the reuse limit; both count as `fallbacks`.
+    Words in `exclude` (e.g. those without a clue) are never used, and
+    RuntimeError is raised only when even the fallback cannot be built."""
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 63)
+    index = crossword_index(language, max(8, size))
+    uses: Dict[str, int] = {}
+    base_exclude = exclude or {}
+    exclude = dict(base_exclude)
+    word_sets: List[Set[str]] = []
+    book: List[Optional[Tuple[Grid, List[str]]]] = [None] * count
+    attempts = [0] * count
+    # best rejected grid per puzzle: (score, grid, words)
+    fallback: Dict[int, Tuple[float, Grid, List[str]]] = {}
+    stats = BookStats()
+
+    def rejection(words: List[str]) -> Optional[str]:
+        if len(words) < min_words:
+            return "too_few_words"
+        if any(uses.get(w, 0) >= reuse for w in words):
+            return "reused_words"
+        chosen = set(words)
+        if any(len(chosen & other) > max_similarity * len(chosen | other) for other in word_sets):
+            return "too_similar"
+        return None
+
+    def accept(k: int, grid: Grid, words: List[str]):
+        book[k] = (grid, words)
+        word_sets.append(set(words))
+        for w in words:
+            uses[w] = uses.get(w, 0) + 1
+            if uses[w] == reuse:
+                exclude[len(w)] = exclude.get(len(w), 0) | index.matches(w)
+        stats.built += 1
+
+    window = 2 * jobs if jobs > 1 else 1
+    waiting = deque(range(count))
+    in_flight: deque = deque()
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as pool:
+        submit = pool.submit if pool is not None else _run_now
+        while waiting or in_flight:
+            while waiting and len(in_flight) < window:
+                k = waiting.popleft()
+                seed = derive_seed(derive_seed(base_seed, k), attempts[k])
+                in_flight.append((k, submit(build_grid, language, size, seed, dict(exclude), time_budget, node_budget)))
+            k, future = in_flight.popleft()
+            try:
+                grid, words = future.result()
+                reason = rejection(words)
+            except RuntimeError:
+                reason = "failed"
+            if reason == "reused_words" and size != GRID_SIZE:
+                clashes = [w for w in words if uses.get(w, 0) >= reuse]
+                repaired = repair_fill(grid, clashes, index, derive_seed(base_seed, -k - 1), exclude=exclude)
+                if repaired is not None and rejection(repaired[1]) is None:
+                    grid, words = repaired
+                    reason = None
+                    stats.repaired += 1
+            if reason is None:
+                accept(k, grid, words)
+                continue
+            setattr(stats, reason, getattr(stats, reason) + 1)
+            if reason != "failed":
+                score = score_words(grid, words, index).total
+                if k not in fallback or score > fallback[k][0]:
+                    fallback[k] = (score, grid, words)
+            attempts[k] += 1
+            if attempts[k] < max_attempts:
+                waiting.appendleft(k)
+                continue
+            if k in fallback:
+                _, grid, words = fallback.pop(k)
+            else:
+                try:
+                    grid, words = build_grid(language, size, derive_seed(base_seed, k), base_exclude, time_budget, node_budget)
+                except RuntimeError:
+                    raise RuntimeError(
+                        f"Could not build crossword {k + 1} of {count} after {max_attempts} attempts;"
+                        " the word list may be too small for this many grids (try --reuse or a larger list)."
+                    )
+            accept(k, grid, words)
+            stats.fallbacks += 1
+    return book, stats
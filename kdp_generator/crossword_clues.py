@@ -0,0 +1,102 @@
+import mmap
+import os
+import random
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .word_index import PatternIndex, bitset
+from .wordlist import LANGUAGES, normalize_word
+
+CLUE_DIR = os.environ.get("KDP_CLUE_DIR", os.path.join(os.path.dirname(__file__), "clues"))
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class Clue(NamedTuple):
+    text: str
+    difficulty: str
+
+
+class ClueStore:
+    """Clues of a TSV file with `word<TAB>clue[<TAB>difficulty]` lines; a
+    word may have any number of lines. The file is memory-mapped and the
+    first lookup indexes it in one pass, keeping only the byte range of
+    each word's lines, so clue text is decoded just for the words asked
+    for and every later lookup is a dictionary hit."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = None
+        self._index: Optional[Dict[str, List[tuple]]] = None
+
+    def _lines(self) -> Dict[str, List[tuple]]:
+        if self._index is None:
+            index: Dict[str, List[tuple]] = {}
+            with open(self.path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+            start = 0
+            while start < len(data):
+                end = data.find(b"\n", start)
+                if end < 0:
+                    end = len(data)
+                tab = data.find(b"\t", start, end)
+                if tab > start:
+                    word = normalize_word(data[start:tab].decode("utf-8"))
+                    if word:
+                        index.setdefault(word, []).append((tab + 1, end))
+                start = end + 1
+            self._data = data
+            self._index = index
+        return self._index
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._lines()
+
+    def __len__(self) -> int:
+        return len(self._lines())
+
+    def clues(self, word: str, difficulty: Optional[str] = None) -> List[Clue]:
+        """Clues of `word`, only those tagged `difficulty` when given.
+        Untagged clues count as medium."""
+        out = []
+        for start, end in self._lines().get(word, ()):
+            text, _, tag = self._data[start:end].decode("utf-8").rstrip("\r").partition("\t")
+            clue = Clue(text.strip(), tag.strip().lower() or "medium")
+            if clue.text and (difficulty is None or clue.difficulty == difficulty):
+                out.append(clue)
+        return out
+
+    def pick(self, word: str, difficulty: Optional[str] = None, rng=random) -> Optional[str]:
+        """A random clue of `word`, preferring `difficulty`; None when the
+        word has no clue at all."""
+        options = self.clues(word, difficulty) or self.clues(word)
+        return rng.choice(options).text if options else None
+
+    def clue_map(self, words: Iterable[str], difficulty: Optional[str] = None, rng=random) -> Dict[str, str]:
+        """Word -> one picked clue, for the words that have one."""
+        picked = {w: self.pick(w, difficulty, rng) for w in words}
+        return {w: text for w, text in picked.items() if text}
+
+    def missing(self, groups: Dict[int, Sequence[str]]) -> Dict[int, int]:
+        """Bitsets of the word ids per length without a clue, in the form
+        the crossword generators take as `exclude`."""
+        lines = self._lines()
+        return {n: bitset([i for i, w in enumerate(group) if w not in lines]) for n, group in groups.items()}
+
+
+def clue_path(language: str) -> str:
+    lang = language.lower()
+    name = next((full for code, full in LANGUAGES.items() if lang.startswith(code)), lang)
+    return os.path.join(CLUE_DIR, f"{name}.tsv")
+
+
+@lru_cache(maxsize=None)
+def get_clue_store(language: str) -> ClueStore:
+    """The clue store of `language`, opened once per process."""
+    return ClueStore(clue_path(language))
+
+
+@lru_cache(maxsize=None)
+def unclued_words(language: str, index: PatternIndex) -> Dict[int, int]:
+    """Per-length bitsets of the `index` words that have no clue, cached
+    per process so a book pays for the scan once."""
+    return get_clue_store(language).missing(index.groups)
@@ -0,0 +1,512 @@
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .crossword import crossword_index
+from .word_index import PatternIndex, iter_bits
+
+Grid = List[List[str]]
+
+BLOCK = "#"
+MIN_WORD = 3
+# candidate words tried per slot before backtracking further up; restarts
+# cover what this cuts off
+BRANCHING = 12
+# ceiling of the node limit that grows by half with every restart
+MAX_RESTART_NODES = 1_000_000
+
+# American-style block patterns: every word at least 3 letters, every cell
+# checked across and down, white cells connected, blocks symmetric under a
+# half turn. Capitals in a pattern are pre-filled letters (theme entries).
+BLOCK_PATTERNS: Dict[int, List[Tuple[str, ...]]] = {
+    13: [
+        (
+            "...#.....#...",
+            "...#.....#...",
+            "...#.....#...",
+            "......#......",
+            "......#......",
+            ".....#....###",
+            "...##...##...",
+            "###....#.....",
+            "......#......",
+            "......#......",
+            "...#.....#...",
+            "...#.....#...",
+            "...#.....#...",
+        ),
+        (
+            "...#....#....",
+            "...#....#....",
+            "...#....#....",
+            "##...##......",
+            ".....#...#...",
+            ".....#....###",
+            "....#...#....",
+            "###....#.....",
+            "...#...#.....",
+            "......##...##",
+            "....#....#...",
+            "....#....#...",
+            "....#....#...",
+        ),
+    ],
+    15: [
+        (
+            "......#........",
+            "......#........",
+            "......#........",
+            "...#........###",
+            "###....#...#...",
+            ".....#...#.....",
+            "....#...#......",
+            "....#.....#....",
+            "......#...#....",
+            ".....#...#.....",
+            "...#...#....###",
+            "###........#...",
+            "........#......",
+            "........#......",
+            "........#......",
+        ),
+        (
+            "...#......#....",
+            "...#......#....",
+            "...#......#....",
+            ".....#...#.....",
+            "###...#.....###",
+            ".......##......",
+            "...#......#....",
+            ".....#...#.....",
+            "....#......#...",
+            "......##.......",
+            "###.....#...###",
+            ".....#...#.....",
+            "....#......#...",
+            "....#......#...",
+            "....#......#...",
+        ),
+    ],
+    21: [
+        (
+            "....#.........#......",
+            "....#.........#......",
+            "....#.........#......",
+            "###......#...#.......",
+            ".......#........#....",
+            ".......##......#.....",
+            "......#.......#...###",
+            "...#.........#.......",
+            "...#......###....#...",
+            "....##.....#.........",
+            "###...#.......#...###",
+            ".........#.....##....",
+            "...#....###......#...",
+            ".......#.........#...",
+            "###...#.......#......",
+            ".....#......##.......",
+            "....#........#.......",
+            ".......#...#......###",
+            "......#.........#....",
+            "......#.........#....",
+            "......#.........#....",
+        ),
+        (
+            "......#....#...#.....",
+            "......#........#.....",
+            "......#........#.....",
+            "....##......#........",
+            ".....#....#......#...",
+            "###.....#....#....###",
+            "...#.....#...#.......",
+            "......#........##....",
+            "......##......#......",
+            "....#...#........#...",
+            ".........###.........",
+            "...#........#...#....",
+            "......#......##......",
+            "....##........#......",
+            ".......#...#.....#...",
+            "###....#....#.....###",
+            "...#......#....#.....",
+            "........#......##....",
+            ".....#........#......",
+            ".....#........#......",
+            ".....#...#....#......",
+        ),
+    ],
+}
+
+
+@dataclass
+class Slot:
+    row: int
+    col: int
+    direction: str  # 'A' across, 'D' down
+    cells: List[Tuple[int, int]]
+    # (position in this slot, crossing slot, position in the crossing slot)
+    crossings: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @property
+    def length(self) -> int:
+        return len(self.cells)
+
+
+@dataclass
+class FillStats:
+    restarts: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+    slots: int = 0
+
+
+def pattern_slots(pattern: Sequence[str]) -> List[Slot]:
+    """Across then down runs of two or more open cells. A run of a single
+    cell is not a word; the cell is only checked the other way."""
+    rows, cols = len(pattern), len(pattern[0])
+    slots: List[Slot] = []
+    for direction, outer, inner in (('A', rows, cols), ('D', cols, rows)):
+        for k in range(outer):
+            run: List[Tuple[int, int]] = []
+            for j in range(inner + 1):
+                r, c = (k, j) if direction == 'A' else (j, k)
+                if j < inner and pattern[r][c] != BLOCK:
+                    run.append((r, c))
+                    continue
+                if len(run) > 1:
+                    slots.append(Slot(run[0][0], run[0][1], direction, run))
+                run = []
+    owner: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    for s, slot in enumerate(slots):
+        for pos, cell in enumerate(slot.cells):
+            if cell in owner:
+                t, other_pos = owner[cell]
+                slot.crossings.append((pos, t, other_pos))
+                slots[t].crossings.append((other_pos, s, pos))
+            else:
+                owner[cell] = (s, pos)
+    return slots
+
+
+def check_pattern(pattern: Sequence[str]) -> None:
+    """Raise ValueError unless `pattern` follows the American rules the
+    library keeps to: square, symmetric under a half turn, words of at least
+    MIN_WORD letters both ways and one connected area of open cells."""
+    n = len(pattern)
+    if any(len(row) != n for row in pattern):
+        raise ValueError("Block pattern must be square")
+    for r in range(n):
+        for c in range(n):
+            if (pattern[r][c] == BLOCK) != (pattern[n - 1 - r][n - 1 - c] == BLOCK):
+                raise ValueError(f"Block pattern is not symmetric at row {r + 1}, column {c + 1}")
+    covered: Dict[Tuple[int, int], int] = {}
+    for slot in pattern_slots(pattern):
+        if slot.length < MIN_WORD:
+            raise ValueError(f"{slot.length}-letter word at row {slot.row + 1}, column {slot.col + 1}")
+        for cell in slot.cells:
+            covered[cell] = covered.get(cell, 0) + 1
+    open_cells = [(r, c) for r in range(n) for c in range(n) if pattern[r][c] != BLOCK]
+    if any(covered.get(cell, 0) != 2 for cell in open_cells):
+        raise ValueError("Every open cell must belong to an across and a down word")
+    seen = {open_cells[0]} if open_cells else set()
+    stack = list(seen)
+    while stack:
+        r, c = stack.pop()
+        for cell in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if cell in covered and cell not in seen:
+                seen.add(cell)
+                stack.append(cell)
+    if len(seen) != len(open_cells):
+        raise ValueError("Open cells of the block pattern are not connected")
+
+
+def word_shortage(pattern: Sequence[str], index: PatternIndex) -> Dict[int, int]:
+    """Words `index` is short of per slot length of `pattern`. A grid uses
+    each word once, so a length needs at least as many words as it has
+    slots; a non-empty result means no fill exists and no search is
+    needed to find that out."""
+    need: Dict[int, int] = {}
+    for slot in pattern_slots(pattern):
+        need[slot.length] = need.get(slot.length, 0) + 1
+    short = {length: n - len(index.groups.get(length, ())) for length, n in need.items()}
+    return {length: n for length, n in sorted(short.items()) if n > 0}
+
+
+def pattern_variants(pattern: Sequence[str]) -> List[Tuple[str, ...]]:
+    """The distinct mirror images and quarter turns of `pattern`. A half
+    turn leaves the pattern as it is, so one library entry gives up to four
+    grids."""
+    variants = []
+    grid = tuple(pattern)
+    for _ in range(4):
+        grid = tuple("".join(row[c] for row in reversed(grid)) for c in range(len(grid[0])))
+        for candidate in (grid, tuple(row[::-1] for row in grid)):
+            if candidate not in variants:
+                variants.append(candidate)
+    return variants
+
+
+class _OutOfNodes(Exception):
+    pass
+
+
+class CrosswordFiller:
+    """Constraint-satisfaction fill of a block pattern. Each slot's domain
+    is a bitset of word ids from a PatternIndex, and each crossing cell
+    keeps the letters both of its words still allow. Arc consistency drops
+    a letter as soon as one side has no word left with it there, the most
+    constrained slot is filled first, and a word is used at most once per
+    grid."""
+
+    def __init__(
+        self,
+        pattern: Sequence[str],
+        index: PatternIndex,
+        rng=random,
+        deadline: Optional[float] = None,
+        exclude: Optional[Dict[int, int]] = None,
+    ):
+        self.pattern = tuple(pattern)
+        self.index = index
+        self.rng = rng
+        self.deadline = deadline
+        self.slots = pattern_slots(self.pattern)
+        self.nodes = 0
+        self.node_limit: Optional[int] = None
+        self.same_length: Dict[int, List[int]] = {}
+        for s, slot in enumerate(self.slots):
+            self.same_length.setdefault(slot.length, []).append(s)
+        # (position, letter masks there, crossing slot, its letter masks, cell id)
+        self.arcs: List[List[Tuple[int, Dict[str, int], int, Dict[str, int], int]]] = []
+        cell_ids: Dict[Tuple[int, int], int] = {}
+        for slot in self.slots:
+            arcs = []
+            for pos, t, other_pos in slot.crossings:
+                if slot.length not in index.groups or self.slots[t].length not in index.groups:
+                    continue
+                cell = cell_ids.setdefault(slot.cells[pos], len(cell_ids))
+                arcs.append((
+                    pos, index.letter_masks(slot.length, pos),
+                    t, index.letter_masks(self.slots[t].length, other_pos), cell,
+                ))
+            self.arcs.append(arcs)
+        # pre-filled letters and excluded words narrow the starting domains
+        exclude = exclude or {}
+        domains = [
+            index.matches("".join(self.pattern[r][c] for r, c in slot.cells), ~exclude.get(slot.length, 0))
+            for slot in self.slots
+        ]
+        letters = [()] * len(cell_ids)
+        for arcs in self.arcs:
+            for _, masks, _, other_masks, cell in arcs:
+                letters[cell] = tuple(ch for ch in masks if ch in other_masks)
+        ok = all(domains) and self._propagate(domains, letters, list(range(len(self.slots))))
+        self.initial: Optional[Tuple[List[int], List[tuple]]] = (domains, letters) if ok else None
+
+    def _propagate(self, domains: List[int], letters: List[tuple], queue: List[int]) -> bool:
+        """AC-3 over the crossings, starting from the slots in `queue`.
+        Narrows `domains` and the crossing `letters` in place; False once a
+        slot or a crossing cell has nothing left."""
+        pending = set(queue)
+        while queue:
+            x = queue.pop()
+            pending.discard(x)
+            dx = domains[x]
+            for _, masks, y, other_masks, cell in self.arcs[x]:
+                allowed = letters[cell]
+                removed = [ch for ch in allowed if not masks[ch] & dx]
+                if not removed:
+                    continue
+                kept = tuple(ch for ch in allowed if ch not in removed)
+                if not kept:
+                    return False
+                letters[cell] = kept
+                # whichever of the two letter sets is smaller
+                dy = domains[y]
+                if len(removed) < len(kept):
+                    drop = 0
+                    for ch in removed:
+                        drop |= other_masks[ch]
+                    narrowed = dy & ~drop
+                else:
+                    keep = 0
+                    for ch in kept:
+                        keep |= other_masks[ch]
+                    narrowed = dy & keep
+                if narrowed != dy:
+                    if not narrowed:
+                        return False
+                    domains[y] = narrowed
+                    if y not in pending:
+                        pending.add(y)
+                        queue.append(y)
+        return True
+
+    def _candidates(self, mask: int, length: int) -> List[int]:
+        """Up to BRANCHING word ids of `mask`, read from a random start."""
+        start = self.rng.randrange(len(self.index.groups[length]))
+        out = []
+        for part in (mask >> start << start, mask & ((1 << start) - 1)):
+            for word_id in iter_bits(part):
+                out.append(word_id)
+                if len(out) == BRANCHING:
+                    return out
+        return out
+
+    def _search(self, domains: List[int], letters: List[tuple], open_slots: List[int]) -> Optional[List[int]]:
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise _OutOfNodes
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise _OutOfNodes
+        if not open_slots:
+            return domains
+        # fewest words left first, then the slot crossing the most others
+        s = min(open_slots, key=lambda t: (domains[t].bit_count(), -len(self.arcs[t])))
+        rest = [t for t in open_slots if t != s]
+        length = self.slots[s].length
+        for word_id in self._candidates(domains[s], length):
+            bit = 1 << word_id
+            trial = list(domains)
+            trial_letters = list(letters)
+            trial[s] = bit
+            changed = [s]
+            for t in self.same_length[length]:
+                if t != s and trial[t] & bit:
+                    trial[t] &= ~bit
+                    changed.append(t)
+            if not all(trial[t] for t in changed) or not self._propagate(trial, trial_letters, changed):
+                continue
+            found = self._search(trial, trial_letters, rest)
+            if found is not None:
+                return found
+        return None
+
+    def fill(self, node_limit: Optional[int] = None) -> Optional[Grid]:
+        """One search of at most `node_limit` nodes (raises _OutOfNodes past
+        it or past the deadline). Returns the filled grid, or None when no
+        fill is found among the words tried."""
+        if self.initial is None:
+            return None
+        self.node_limit = None if node_limit is None else self.nodes + node_limit
+        domains, letters = self.initial
+        found = self._search(list(domains), list(letters), list(range(len(self.slots))))
+        if found is None:
+            return None
+        grid = [[BLOCK if ch == BLOCK else "" for ch in row] for row in self.pattern]
+        for slot, mask in zip(self.slots, found):
+            word = self.index.word(slot.length, mask.bit_length() - 1)
+            for (r, c), ch in zip(slot.cells, word):
+                grid[r][c] = ch
+        return grid
+
+    def words(self, grid: Grid) -> List[str]:
+        """Across then down words of a filled grid."""
+        return ["".join(grid[r][c] for r, c in slot.cells) for slot in self.slots]
+
+
+def fill_pattern_with_stats(
+    pattern: Sequence[str],
+    index: PatternIndex,
+    seed: Optional[int] = None,
+    time_budget: float = 60.0,
+    restart_nodes: int = 500,
+    exclude: Optional[Dict[int, int]] = None,
+) -> Tuple[Grid, List[str], FillStats]:
+    """fill_pattern, also returning how much search the fill took."""
+    rng = random.Random(seed) if seed is not None else random
+    start = time.monotonic()
+    deadline = start + time_budget
+    filler = CrosswordFiller(pattern, index, rng, deadline, exclude)
+    stats = FillStats(slots=len(filler.slots))
+    limit = restart_nodes
+    grid = None
+    # BRANCHING makes one search incomplete, so a failed search restarts too;
+    # only an empty starting domain proves there is no fill
+    while filler.initial is not None and time.monotonic() < deadline:
+        try:
+            grid = filler.fill(limit)
+        except _OutOfNodes:
+            grid = None
+        if grid is not None:
+            break
+        stats.restarts += 1
+        limit = min(limit * 3 // 2 + 1, MAX_RESTART_NODES)
+    stats.nodes = filler.nodes
+    stats.seconds = time.monotonic() - start
+    if grid is None:
+        reason = "has no fill" if filler.initial is None else f"could not be filled in {time_budget:g}s"
+        raise RuntimeError(
+            f"Block pattern {reason} with this word list ({len(index)} words);"
+            " use a larger list (see `cli wordlist compile`) or a longer time budget."
+        )
+    return grid, filler.words(grid), stats
+
+
+def fill_pattern(
+    pattern: Sequence[str],
+    index: PatternIndex,
+    seed: Optional[int] = None,
+    time_budget: float = 60.0,
+    restart_nodes: int = 500,
+    exclude: Optional[Dict[int, int]] = None,
+) -> Tuple[Grid, List[str]]:
+    """Fill every slot of `pattern` ('#' blocks, '.' open cells, capitals
+    fixed letters) with distinct words of `index`. A search that spends
+    `restart_nodes` nodes starts over from a new random word order with a
+    50% larger allowance (at most MAX_RESTART_NODES), until `time_budget`
+    seconds are gone; then RuntimeError is raised. `exclude` maps word lengths to bitsets of word
+    ids that must not be used. A `seed` makes the fill reproducible."""
+    return fill_pattern_with_stats(pattern, index, seed, time_budget, restart_nodes, exclude)[:2]
+
+
+def repair_fill(
+    grid: Grid,
+    banned: Sequence[str],
+    index: PatternIndex,
+    seed: Optional[int] = None,
+    time_budget: float = 5.0,
+    exclude: Optional[Dict[int, int]] = None,
+    levels: int = 3,
+) -> Optional[Tuple[Grid, List[str]]]:
+    """Replace the words of a filled grid that are in `banned` while keeping
+    as much of the fill as possible. The cells of those words are cleared
+    and refilled; while that fails, the words crossing the cleared ones are
+    cleared too, up to `levels` rings out. Returns None when no refill is
+    found within the budget."""
+    slots = pattern_slots(grid)
+    banned = set(banned)
+    cleared = {s for s, slot in enumerate(slots) if "".join(grid[r][c] for r, c in slot.cells) in banned}
+    if not cleared:
+        return grid, ["".join(grid[r][c] for r, c in slot.cells) for slot in slots]
+    for _ in range(levels):
+        pattern = [list(row) for row in grid]
+        for s in cleared:
+            for r, c in slots[s].cells:
+                pattern[r][c] = "."
+        try:
+            return fill_pattern(["".join(row) for row in pattern], index, seed, time_budget / levels, exclude=exclude)
+        except RuntimeError:
+            cleared |= {t for s in cleared for _, t, _ in slots[s].crossings}
+    return None
+
+
+def generate_american_crossword(
+    language: str = "en",
+    size: int = 15,
+    pattern: Optional[Sequence[str]] = None,
+    seed: Optional[int] = None,
+    time_budget: float = 60.0,
+    exclude: Optional[Dict[int, int]] = None,
+) -> Tuple[Grid, List[str]]:
+    """Dense crossword on a random library pattern of `size` (one of
+    BLOCK_PATTERNS, mirrored or turned at random) or on `pattern`. Returns
+    the grid with '#' blocks and its words, like generate_crossword."""
+    rng = random.Random(seed)
+    if pattern is None:
+        if size not in BLOCK_PATTERNS:
+            raise ValueError(f"No block patterns for size {size}. Supported: {sorted(BLOCK_PATTERNS)}")
+        pattern = rng.choice([v for p in BLOCK_PATTERNS[size] for v in pattern_variants(p)])
+    index = crossword_index(language, max(len(pattern), len(pattern[0])))
+    return fill_pattern(pattern, index, rng.randrange(2 ** 32), time_budget, exclude=exclude)
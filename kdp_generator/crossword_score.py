@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from .word_index import PatternIndex, lowest_bit
+
+Grid = List[List[str]]
+
+# Weight of each quality measure in GridScore.total; every measure is in [0, 1].
+WEIGHTS = {
+    "density": 3.0,
+    "interlock": 2.0,
+    "commonness": 1.0,
+    "checked": 2.0,
+}
+# crossings per word that count as fully interlocked
+FULL_INTERLOCK = 2.0
+
+
+@dataclass
+class GridScore:
+    words: int
+    density: float     # share of the cells holding a letter
+    interlock: float   # crossings per word
+    commonness: float  # mean word commonness, 1 = most frequent word
+    checked: float     # share of the letters that belong to two words
+
+    @property
+    def total(self) -> float:
+        return (
+            WEIGHTS["density"] * self.density
+            + WEIGHTS["interlock"] * min(1.0, self.interlock / FULL_INTERLOCK)
+            + WEIGHTS["commonness"] * self.commonness
+            + WEIGHTS["checked"] * self.checked
+        )
+
+
+def word_commonness(index: PatternIndex, length: int, word_id: int) -> float:
+    """1 for the most frequent word of the list down to 0 for the rarest.
+    Compiled groups carry global frequency ranks; plain groups are taken to
+    be in frequency order."""
+    group = index.groups[length]
+    ranks = getattr(group, "ranks", None)
+    if ranks is not None:
+        vocabulary = len(index)
+        return 1.0 - min(ranks[word_id], vocabulary) / max(1, vocabulary)
+    return 1.0 - word_id / max(1, len(group))
+
+
+def score_grid(grid: Grid, commonness: Sequence[float]) -> GridScore:
+    """Quality of a grid whose words have the given commonness values. Any
+    cell without a letter counts as empty, so partial grids score too."""
+    rows, cols = len(grid), len(grid[0])
+    letters = checked = 0
+    for r in range(rows):
+        row = grid[r]
+        for c in range(cols):
+            if not row[c].isalpha():
+                continue
+            letters += 1
+            across = (c > 0 and row[c - 1].isalpha()) or (c + 1 < cols and row[c + 1].isalpha())
+            down = (r > 0 and grid[r - 1][c].isalpha()) or (r + 1 < rows and grid[r + 1][c].isalpha())
+            checked += across and down
+    words = len(commonness)
+    return GridScore(
+        words=words,
+        density=letters / (rows * cols),
+        interlock=checked / words if words else 0.0,
+        commonness=sum(commonness) / words if words else 0.0,
+        checked=checked / letters if letters else 0.0,
+    )
+
+
+def score_words(grid: Grid, words: Sequence[str], index: PatternIndex) -> GridScore:
+    """score_grid for a finished grid, looking its words up in `index`
+    (words the index lacks count as rarest)."""
+    values = []
+    for w in words:
+        mask = index.matches(w)
+        values.append(word_commonness(index, len(w), lowest_bit(mask)) if mask else 0.0)
+    return score_grid(grid, values)
@@ -0,0 +1,321 @@
+import random
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from reportlab.lib.colors import Color
+
+from .pdf_utils import draw_footer_page_number, draw_page_title
+
+# (x1, y1, x2, y2) of a straight wall in cell units, y growing downward
+Segment = Tuple[int, int, int, int]
+
+# per-cell flags: passage to the east / south neighbour
+OPEN_E = 1
+OPEN_S = 2
+
+SOLUTION_COLOR = Color(0.6, 0.6, 0.6)
+
+
+class Maze:
+    """Perfect maze of `width` x `height` cells, row-major in a bytearray of
+    OPEN_E / OPEN_S flags (one byte per cell, so a 1000x1000 maze takes
+    1 MB). A passage west or north is the east or south flag of the
+    neighbour."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+
+    def connect(self, a: int, b: int):
+        """Open the wall between adjacent cells `a` and `b` (flat indices)."""
+        if a > b:
+            a, b = b, a
+        self.cells[a] |= OPEN_E if b == a + 1 else OPEN_S
+
+    def neighbours(self, i: int) -> List[int]:
+        """Cells reachable from cell `i` in one step."""
+        w = self.width
+        found = []
+        if self.cells[i] & OPEN_E:
+            found.append(i + 1)
+        if self.cells[i] & OPEN_S:
+            found.append(i + w)
+        if i % w and self.cells[i - 1] & OPEN_E:
+            found.append(i - 1)
+        if i >= w and self.cells[i - w] & OPEN_S:
+            found.append(i - w)
+        return found
+
+
+def _adjacent(i: int, width: int, height: int) -> List[int]:
+    r, c = divmod(i, width)
+    found = []
+    if c + 1 < width:
+        found.append(i + 1)
+    if r + 1 < height:
+        found.append(i + width)
+    if c:
+        found.append(i - 1)
+    if r:
+        found.append(i - width)
+    return found
+
+
+def backtracker(maze: Maze, rng=random):
+    """Depth-first search with an explicit stack: long winding corridors and
+    few, long dead ends."""
+    w, h = maze.width, maze.height
+    visited = bytearray(w * h)
+    start = rng.randrange(w * h)
+    visited[start] = 1
+    stack = array("l", [start])
+    while stack:
+        i = stack[-1]
+        options = [j for j in _adjacent(i, w, h) if not visited[j]]
+        if not options:
+            stack.pop()
+            continue
+        j = rng.choice(options)
+        maze.connect(i, j)
+        visited[j] = 1
+        stack.append(j)
+
+
+def kruskal(maze: Maze, rng=random):
+    """Random walls are removed whenever they join two separate regions
+    (union-find with path halving and union by size): many short dead
+    ends, an even, busy texture."""
+    w, h = maze.width, maze.height
+    n = w * h
+    # wall k < n is east of cell k, wall k >= n is south of cell k - n
+    walls = array("l", (k for k in range(n) if k % w + 1 < w))
+    walls.extend(range(n, 2 * n - w))
+    rng.shuffle(walls)
+    parent = array("l", range(n))
+    size = array("l", [1]) * n
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    joined = 1
+    for k in walls:
+        a = k if k < n else k - n
+        b = a + 1 if k < n else a + w
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+        maze.cells[a] |= OPEN_E if k < n else OPEN_S
+        joined += 1
+        if joined == n:
+            break
+
+
+def wilson(maze: Maze, rng=random):
+    """Loop-erased random walks joined to a growing tree: an unbiased sample
+    of all mazes, between the backtracker and Kruskal in texture. The walk
+    keeps only the last exit of every cell, so loops erase themselves."""
+    w, h = maze.width, maze.height
+    n = w * h
+    in_tree = bytearray(n)
+    in_tree[rng.randrange(n)] = 1
+    exit_to = array("l", [-1]) * n
+    order = list(range(n))
+    rng.shuffle(order)
+    for start in order:
+        if in_tree[start]:
+            continue
+        i = start
+        while not in_tree[i]:
+            exit_to[i] = j = rng.choice(_adjacent(i, w, h))
+            i = j
+        i = start
+        while not in_tree[i]:
+            in_tree[i] = 1
+            maze.connect(i, exit_to[i])
+            i = exit_to[i]
+
+
+def prim(maze: Maze, rng=random):
+    """Randomised Prim: a random frontier cell joins the maze through a
+    random maze neighbour. Short branches radiating from the start; the
+    easiest texture."""
+    w, h = maze.width, maze.height
+    state = bytearray(w * h)  # 0 unseen, 1 frontier, 2 in the maze
+    start = rng.randrange(w * h)
+    state[start] = 2
+    frontier = array("l")
+    for j in _adjacent(start, w, h):
+        state[j] = 1
+        frontier.append(j)
+    while frontier:
+        k = rng.randrange(len(frontier))
+        i = frontier[k]
+        frontier[k] = frontier[-1]
+        frontier.pop()
+        inside = [j for j in _adjacent(i, w, h) if state[j] == 2]
+        maze.connect(i, rng.choice(inside))
+        state[i] = 2
+        for j in _adjacent(i, w, h):
+            if not state[j]:
+                state[j] = 1
+                frontier.append(j)
+
+
+ALGORITHMS: Dict[str, Callable] = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "prim": prim,
+}
+
+
+def generate_maze(width: int, height: Optional[int] = None, algorithm: str = "backtracker", rng=random) -> Maze:
+    """A perfect maze (exactly one path between any two cells) of `width` x
+    `height` cells (square by default) carved by one of ALGORITHMS."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown maze algorithm '{algorithm}'; choose from {', '.join(ALGORITHMS)}.")
+    maze = Maze(width, height or width)
+    ALGORITHMS[algorithm](maze, rng)
+    return maze
+
+
+def _runs(walls: List[bool]) -> List[Tuple[int, int]]:
+    """(start, end) of every maximal stretch of True in `walls`."""
+    runs = []
+    start = None
+    for k, wall in enumerate(walls):
+        if wall and start is None:
+            start = k
+        elif not wall and start is not None:
+            runs.append((start, k))
+            start = None
+    if start is not None:
+        runs.append((start, len(walls)))
+    return runs
+
+
+def wall_runs(maze: Maze) -> List[Segment]:
+    """Every wall of `maze`, adjacent collinear wall sides merged into
+    maximal segments, including the frame. The frame is open west of the
+    top-left cell (the entrance) and east of the bottom-right one (the
+    exit)."""
+    w, h, cells = maze.width, maze.height, maze.cells
+    segments: List[Segment] = [(0, 0, w, 0), (0, h, w, h)]
+    for r in range(1, h):
+        above = cells[(r - 1) * w : r * w]
+        segments.extend((a, r, b, r) for a, b in _runs([not f & OPEN_S for f in above]))
+    segments.append((0, 1, 0, h))
+    segments.append((w, 0, w, h - 1))
+    for c in range(1, w):
+        west = cells[c - 1 :: w]
+        segments.extend((c, a, c, b) for a, b in _runs([not f & OPEN_E for f in west]))
+    return segments
+
+
+def draw_maze(canvas, maze: Maze, x0: float, y0: float, cell: float, line_width: float):
+    """Draw the walls of `maze` with its bottom-left corner at (x0, y0) as
+    one path object of straight segments. The path is drawn in cell units
+    under a transform, so its operators carry small integers."""
+    path = canvas.beginPath()
+    for x1, y1, x2, y2 in wall_runs(maze):
+        path.moveTo(x1, y1)
+        path.lineTo(x2, y2)
+    canvas.saveState()
+    canvas.translate(x0, y0 + maze.height * cell)
+    canvas.scale(cell, -cell)
+    canvas.setLineWidth(line_width / cell)
+    canvas.setLineCap(1)
+    canvas.drawPath(path, stroke=1, fill=0)
+    canvas.restoreState()
+
+
+def solve_maze(maze: Maze, start: int = 0, end: Optional[int] = None) -> List[int]:
+    """Cells of the path from `start` to `end` (default: the bottom-right
+    cell), both included, by breadth-first search; a perfect maze has
+    exactly one."""
+    if end is None:
+        end = maze.width * maze.height - 1
+    parent = array("l", [-1]) * (maze.width * maze.height)
+    parent[start] = start
+    queue = array("l", [start])
+    k = 0
+    while k < len(queue) and parent[end] < 0:
+        i = queue[k]
+        k += 1
+        for j in maze.neighbours(i):
+            if parent[j] < 0:
+                parent[j] = i
+                queue.append(j)
+    if parent[end] < 0:
+        raise ValueError("The maze has no path between the given cells.")
+    path = [end]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def wall_width(cell: float) -> float:
+    """Wall thickness for cells `cell` points wide: thinner walls for the
+    small cells of poster-size mazes and answer keys."""
+    return min(max(2, cell / 10), cell / 4)
+
+
+def draw_solution(canvas, maze: Maze, path: List[int], x0: float, y0: float, cell: float):
+    """The entrance-to-exit `path` through the cell centres as one
+    polyline, with a vertex only where it turns, in cell units like
+    draw_maze."""
+    w = maze.width
+    points = [(0.0, 0.5)]
+    points.extend((i % w + 0.5, i // w + 0.5) for i in path)
+    points.append((float(w), maze.height - 0.5))
+    line = canvas.beginPath()
+    line.moveTo(*points[0])
+    for k in range(1, len(points) - 1):
+        (ax, ay), (bx, by), (cx, cy) = points[k - 1], points[k], points[k + 1]
+        if (bx - ax) * (cy - by) != (by - ay) * (cx - bx):
+            line.lineTo(bx, by)
+    line.lineTo(*points[-1])
+    canvas.saveState()
+    canvas.translate(x0, y0 + maze.height * cell)
+    canvas.scale(cell, -cell)
+    canvas.setStrokeColor(SOLUTION_COLOR)
+    canvas.setLineWidth(0.4)
+    canvas.setLineCap(1)
+    canvas.setLineJoin(1)
+    canvas.drawPath(line, stroke=1, fill=0)
+    canvas.restoreState()
+
+
+def draw_maze_page(
+    canvas,
+    maze: Maze,
+    title: str,
+    page_width: float,
+    page_height: float,
+    margin: float,
+    page_num: int,
+):
+    """One titled page with `maze` as large as fits below the title,
+    labelled at its entrance and exit."""
+    draw_page_title(canvas, page_width, page_height, title)
+    content_top_y = page_height - margin - 40
+    cell = min((page_width - 2 * margin) / maze.width, (content_top_y - margin) / maze.height)
+    maze_w, maze_h = cell * maze.width, cell * maze.height
+    x0 = (page_width - maze_w) / 2
+    y0 = margin + (content_top_y - margin - maze_h) / 2
+    draw_maze(canvas, maze, x0, y0, cell, wall_width(cell))
+
+    canvas.setFont("Helvetica-Bold", 12)
+    canvas.drawCentredString(x0 - 30, y0 + maze_h - 0.5 * cell, "Start")
+    canvas.drawCentredString(x0 + maze_w + 35, y0 + 0.5 * cell, "Koniec")
+    draw_footer_page_number(canvas, page_width, margin, page_num)
+    canvas.showPage()
@@ -0,0 +1,150 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from .maze import Maze, draw_maze, draw_maze_page, draw_solution, generate_maze, solve_maze, wall_width
+from .maze_score import MazeScore, score_maze
+from .pdf_utils import (
+    DEFAULT_MARGIN,
+    create_canvas,
+    draw_footer_page_number,
+    draw_grid_label,
+    draw_page_title,
+    grid_slots,
+    size_to_points,
+)
+from .sudoku_batch import derive_seed
+
+# mazes carved per book entry while looking for one at the target difficulty
+MAX_ATTEMPTS = 40
+# answer key grids per page (cols, rows), roomiest last
+SOLUTION_LAYOUTS = ((3, 3), (2, 3), (2, 2), (1, 2), (1, 1))
+SOLUTION_CELL = 5
+
+
+@dataclass
+class MazePuzzle:
+    maze: Maze
+    path: List[int]
+    score: MazeScore
+
+    @property
+    def difficulty(self) -> float:
+        return self.score.difficulty
+
+
+def make_maze_puzzle(
+    index: int,
+    base_seed: int,
+    size: int = 20,
+    algorithm: str = "backtracker",
+    min_difficulty: float = 0.0,
+) -> MazePuzzle:
+    """Maze `index` of a book; runs in a worker process. Mazes are carved
+    until one reaches `min_difficulty`, keeping the hardest of
+    MAX_ATTEMPTS when none does."""
+    rng = random.Random(derive_seed(base_seed, index))
+    best = None
+    for _ in range(MAX_ATTEMPTS):
+        maze = generate_maze(size, algorithm=algorithm, rng=rng)
+        path = solve_maze(maze)
+        puzzle = MazePuzzle(maze, path, score_maze(maze, path))
+        if best is None or puzzle.difficulty > best.difficulty:
+            best = puzzle
+        if best.difficulty >= min_difficulty:
+            break
+    return best
+
+
+def generate_maze_book(
+    count: int,
+    size: int = 20,
+    algorithm: str = "backtracker",
+    min_difficulty: float = 0.0,
+    jobs: int = 1,
+    base_seed: Optional[int] = None,
+) -> List[MazePuzzle]:
+    """`count` mazes over `jobs` processes, each the first of its own
+    attempts to reach `min_difficulty` (see MazeScore.difficulty), ordered
+    from easiest to hardest. The book depends only on `base_seed`, never
+    on `jobs`, and mazes whose worker fails are rebuilt in this process."""
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 63)
+    args = (size, algorithm, min_difficulty)
+    if jobs <= 1 or count <= 1:
+        results = [make_maze_puzzle(i, base_seed, *args) for i in range(count)]
+    else:
+        results: List[Optional[MazePuzzle]] = [None] * count
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(make_maze_puzzle, i, base_seed, *args) for i in range(count)]
+            for i, future in enumerate(futures):
+                try:
+                    results[i] = future.result()
+                except Exception:
+                    results[i] = None
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = make_maze_puzzle(i, base_seed, *args)
+    return sorted(results, key=lambda p: p.difficulty)
+
+
+def solution_layout(page_width: float, page_height: float, margin: float, n: int):
+    """Answer key slots for `n`-cell-wide mazes: the SOLUTION_LAYOUTS entry
+    with the most mazes whose cells stay SOLUTION_CELL points wide, else
+    the roomiest."""
+    for cols, rows in SOLUTION_LAYOUTS:
+        slots, size = grid_slots(page_width, page_height, margin, cols, rows, 0.92)
+        if size / n >= SOLUTION_CELL:
+            break
+    return slots, size
+
+
+def draw_maze_solutions(
+    canvas,
+    puzzles: Sequence[MazePuzzle],
+    page_width: float,
+    page_height: float,
+    margin: float,
+    page_num: int,
+    first_number: int = 1,
+) -> int:
+    """Solution pages: each maze with its path drawn in, labelled "#k" from
+    `first_number`. Returns the next page number."""
+    n = max(max(p.maze.width, p.maze.height) for p in puzzles)
+    slots, size = solution_layout(page_width, page_height, margin, n)
+    cell = size / n
+    title = "Solutions" if len(puzzles) > 1 else "Solution"
+    for start in range(0, len(puzzles), len(slots)):
+        draw_page_title(canvas, page_width, page_height, title)
+        for k, (x0, y0) in enumerate(slots[:len(puzzles) - start]):
+            puzzle = puzzles[start + k]
+            draw_grid_label(canvas, f"#{first_number + start + k}", x0, y0, size)
+            draw_solution(canvas, puzzle.maze, puzzle.path, x0, y0, cell)
+            draw_maze(canvas, puzzle.maze, x0, y0, cell, wall_width(cell))
+        draw_footer_page_number(canvas, page_width, margin, page_num)
+        canvas.showPage()
+        page_num += 1
+    return page_num
+
+
+def render_maze_book_pdf(
+    puzzles: List[MazePuzzle],
+    filename: str,
+    trim_size: str = "8.5x11",
+    answer_key: bool = True,
+):
+    """One titled maze per page, then an answer key of small mazes with
+    their solutions drawn in, up to 9 per page (see solution_layout)."""
+    canvas = create_canvas(filename, trim_size)
+    page_width, page_height = size_to_points(trim_size)
+    margin = DEFAULT_MARGIN
+
+    page_num = 1
+    for k, puzzle in enumerate(puzzles):
+        draw_maze_page(canvas, puzzle.maze, f"Maze #{k + 1}", page_width, page_height, margin, page_num)
+        page_num += 1
+
+    if answer_key and puzzles:
+        draw_maze_solutions(canvas, puzzles, page_width, page_height, margin, page_num)
+    canvas.save()
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .maze import Maze, solve_maze
+
+# Weight of each measure in MazeScore.difficulty; every measure is in [0, 1].
+WEIGHTS = {
+    "length": 3.0,
+    "dead_ends": 1.0,
+    "branching": 1.0,
+    "turns": 1.0,
+}
+# share of the cells on the solution that counts as the longest path
+FULL_LENGTH = 0.4
+# dead ends per cell and side passages per solution cell counted as hardest
+FULL_DEAD_ENDS = 0.35
+FULL_BRANCHING = 1.0
+
+
+@dataclass
+class MazeScore:
+    cells: int
+    solution: int    # cells on the path from entrance to exit
+    dead_ends: int   # cells with a single opening
+    branching: float  # side passages per solution cell
+    turns: int       # changes of direction along the solution
+
+    @property
+    def difficulty(self) -> float:
+        """Weighted mean of the normalised measures, 0 (trivial) to 1."""
+        measures = {
+            "length": min(1.0, self.solution / self.cells / FULL_LENGTH),
+            "dead_ends": min(1.0, self.dead_ends / self.cells / FULL_DEAD_ENDS),
+            "branching": min(1.0, self.branching / FULL_BRANCHING),
+            "turns": self.turns / max(1, self.solution - 2),
+        }
+        return sum(WEIGHTS[k] * v for k, v in measures.items()) / sum(WEIGHTS.values())
+
+
+def turn_count(path: List[int]) -> int:
+    return sum(path[k] - path[k - 1] != path[k + 1] - path[k] for k in range(1, len(path) - 1))
+
+
+def score_maze(maze: Maze, path: Optional[List[int]] = None) -> MazeScore:
+    """Measures of `maze` and its entrance-to-exit `path` (solved when not
+    given)."""
+    if path is None:
+        path = solve_maze(maze)
+    n = maze.width * maze.height
+    degree = [len(maze.neighbours(i)) for i in range(n)]
+    # every solution cell but the ends uses two openings for the path itself
+    sides = sum(degree[i] - 2 for i in path[1:-1]) + degree[path[0]] - 1 + degree[path[-1]] - 1
+    return MazeScore(
+        cells=n,
+        solution=len(path),
+        dead_ends=degree.count(1),
+        branching=sides / len(path),
+        turns=turn_count(path),
+    )
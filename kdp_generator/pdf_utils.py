@@ -4,7 +4,11 @@ from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.colors import black, white, HexColor, Color
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from typing import Tuple, Optional
+from functools import lru_cache
+from math import cos, sin, tan
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
 
 KDP_SIZES_INCHES = {
     "6x9": (6.0, 9.0),
@@ -15,6 +19,15 @@ KDP_SIZES_INCHES = {
 
 DEFAULT_MARGIN = 0.75 * 72
 DEFAULT_BLEED_INCH = 0.125
+# room above each grid of a multi-grid page for its "#n" label
+LABEL_HEIGHT = 14
+LINE_SPACING = 1.22
+
+# Bezier handle length of a quarter circle per unit radius
+KAPPA = 0.5522847498
+
+# (text, is heading, indent) of one line set by draw_text_columns
+Line = Tuple[str, bool, float]
 
 
 def size_to_points(trim_size: str) -> Tuple[float, float]:
@@ -80,6 +93,115 @@ def draw_page_title(canvas: Canvas, page_width: float, page_height: float, title
     canvas.drawString((page_width - tw) / 2, page_height - DEFAULT_MARGIN + 8, title)
 
 
+def grid_slots(page_width: float, page_height: float, margin: float, cols: int, rows: int, fill: float):
+    """Lower-left corners and size of `cols` x `rows` grids on one page."""
+    top = page_height - margin - 20
+    bottom = margin + 10
+    slot_w = (page_width - 2 * margin) / cols
+    slot_h = (top - bottom) / rows
+    size = min(slot_w, slot_h - LABEL_HEIGHT) * fill
+    slots = []
+    for j in range(rows):
+        for i in range(cols):
+            x = margin + i * slot_w + (slot_w - size) / 2
+            y = top - (j + 1) * slot_h + (slot_h - LABEL_HEIGHT - size) / 2
+            slots.append((x, y))
+    return slots, size
+
+
+def draw_grid_label(canvas: Canvas, text: str, x0: float, y0: float, size: float):
+    canvas.setFont("Helvetica", 10)
+    canvas.drawCentredString(x0 + size / 2, y0 + size + 4, text)
+
+
+@lru_cache(maxsize=None)
+def _char_widths(font: str, size: float) -> Dict[str, float]:
+    """Advance widths of `font` at `size`, filled in as characters turn up.
+    The standard fonts have no kerning, so a line's width is their sum and
+    each character is measured once per font size."""
+    return {}
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    widths = _char_widths(font, size)
+    total = 0.0
+    for ch in text:
+        w = widths.get(ch)
+        if w is None:
+            w = widths[ch] = pdfmetrics.stringWidth(ch, font, size)
+        total += w
+    return total
+
+
+def draw_text_columns(
+    canvas: Canvas,
+    lines: List[Line],
+    x0: float,
+    top: float,
+    bottom: float,
+    cols: int,
+    col_w: float,
+    size: float = 9,
+    font: str = "Helvetica",
+) -> int:
+    """Flow `lines` down `cols` columns between `top` and `bottom`; returns
+    how many lines fit. Headings are bold when `font` is Helvetica."""
+    bold = "Helvetica-Bold" if font == "Helvetica" else font
+    line_h = size * LINE_SPACING
+    per_col = max(1, int((top - bottom) // line_h))
+    shown = min(len(lines), per_col * cols)
+    for k, (text, heading, indent) in enumerate(lines[:shown]):
+        canvas.setFont(bold if heading else font, size)
+        canvas.drawString(x0 + (k // per_col) * col_w + indent, top - (k % per_col + 1) * line_h, text)
+    return shown
+
+
+def polyline_ops(points) -> str:
+    """PDF path operators for an (n, k, 2) array of n polylines of k
+    points: one moveto and k - 1 linetos each, formatted in one call.
+    Emit them with canvas.addLiteral, e.g. "n <ops> S"."""
+    points = np.asarray(points, dtype=float)
+    n, k, _ = points.shape
+    polyline = "%.2f %.2f m" + " %.2f %.2f l" * (k - 1)
+    return " ".join([polyline] * n) % tuple(points.ravel().tolist())
+
+
+def circle_ops(cx: float, cy: float, r: float) -> str:
+    """PDF path operators for a circle as four quarter-arc Beziers, the
+    same curve canvas.circle draws."""
+    k = KAPPA * r
+    return (
+        "%.2f %.2f m %.2f %.2f %.2f %.2f %.2f %.2f c %.2f %.2f %.2f %.2f %.2f %.2f c"
+        " %.2f %.2f %.2f %.2f %.2f %.2f c %.2f %.2f %.2f %.2f %.2f %.2f c h"
+    ) % (
+        cx + r, cy,
+        cx + r, cy + k, cx + k, cy + r, cx, cy + r,
+        cx - k, cy + r, cx - r, cy + k, cx - r, cy,
+        cx - r, cy - k, cx - k, cy - r, cx, cy - r,
+        cx + k, cy - r, cx + r, cy - k, cx + r, cy,
+    )
+
+
+def arc_ops(r: float, start: float, end: float, cx: float = 0.0, cy: float = 0.0) -> str:
+    """PDF path operators for an arc of radius `r` about (cx, cy) from
+    angle `start` to `end` (at most a quarter turn) as one Bezier."""
+    h = 4 / 3 * tan((end - start) / 4) * r
+    x0, y0 = cx + r * cos(start), cy + r * sin(start)
+    x1, y1 = cx + r * cos(end), cy + r * sin(end)
+    return "%.2f %.2f m %.2f %.2f %.2f %.2f %.2f %.2f c" % (
+        x0, y0, x0 - h * sin(start), y0 + h * cos(start), x1 + h * sin(end), y1 - h * cos(end), x1, y1,
+    )
+
+
+def begin_form(canvas: Canvas, kind: str, extent: float) -> str:
+    """Start a Form XObject named after `kind` and the current page, drawn
+    about the origin within `extent` of it; returns its name for doForm.
+    Close it with canvas.endForm()."""
+    name = f"{kind}{canvas.getPageNumber()}"
+    canvas.beginForm(name, -extent, -extent, extent, extent)
+    return name
+
+
 def draw_footer_page_number(canvas: Canvas, page_width: float, margin: float, page_number: int, font_name: str = "Helvetica", font_size: int = 10):
     canvas.setFont(font_name, font_size)
     canvas.setFillColor(black)
@@ -1,130 +1,458 @@
 import random
-from typing import List, Tuple
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
-from .pdf_utils import create_canvas, size_to_points, draw_footer_page_number, DEFAULT_MARGIN, draw_page_title
+from .pdf_utils import (
+    DEFAULT_MARGIN,
+    LABEL_HEIGHT,
+    create_canvas,
+    draw_footer_page_number,
+    draw_grid_label,
+    draw_page_title,
+    grid_slots,
+    size_to_points,
+)
+from .sudoku_solver import BitmaskSolver, box_shape, count_solutions as _count_solutions, random_complete_grid, solve_grid
+from .sudoku_dlx import DancingLinks
+from .sudoku_grader import DIFFICULTY_BANDS, grade_puzzle
 
 Grid = List[List[int]]
 
 
+# Share of cells kept as clues for sizes the technique grader does not cover.
+# Expert digs as far as UNGRADED_NODE_BUDGET allows.
+CLUE_FRACTIONS = {
+    "easy": (0.55, 0.6),
+    "medium": (0.45, 0.5),
+    "hard": (0.4, 0.44),
+    "expert": (0.0, 0.0),
+}
+# Search nodes a puzzle of those sizes may spend when no budget is given;
+# unbudgeted 16x16 digs below about 100 clues took 2-31 s.
+UNGRADED_NODE_BUDGET = 20_000
+
+# Search nodes a symmetric minimal puzzle may spend when no budget is given:
+# only 1-4% of symmetric digs end minimal, so 500 attempts took about 9 s.
+SYMMETRIC_MINIMAL_NODES = 200_000
+# rot90 orbits of four cells almost never leave a minimal puzzle (about one
+# dig in a thousand), so `minimal` rejects it.
+UNREACHABLE_MINIMAL = ("rot90",)
+
+
 def is_valid(grid: Grid, r: int, c: int, val: int) -> bool:
-    for i in range(9):
+    n = len(grid)
+    box_rows, box_cols = box_shape(n)
+    for i in range(n):
         if grid[r][i] == val or grid[i][c] == val:
             return False
-    br, bc = 3 * (r // 3), 3 * (c // 3)
-    for i in range(br, br + 3):
-        for j in range(bc, bc + 3):
+    br, bc = box_rows * (r // box_rows), box_cols * (c // box_cols)
+    for i in range(br, br + box_rows):
+        for j in range(bc, bc + box_cols):
             if grid[i][j] == val:
                 return False
     return True
 
 
 def find_empty(grid: Grid) -> Tuple[int, int]:
-    for r in range(9):
-        for c in range(9):
+    n = len(grid)
+    for r in range(n):
+        for c in range(n):
             if grid[r][c] == 0:
                 return r, c
     return -1, -1
 
 
 def solve(grid: Grid, count_solutions: bool = False, limit: int = 2) -> int:
-    r, c = find_empty(grid)
-    if r == -1:
-        return 1
-    nums = list(range(1, 10))
-    random.shuffle(nums)
-    total = 0
-    for v in nums:
-        if is_valid(grid, r, c, v):
-            grid[r][c] = v
-            total += solve(grid, count_solutions, limit)
-            if total >= limit:
-                grid[r][c] = 0
-                return total
-            grid[r][c] = 0
-    return total
-
-
-def fill_complete_grid() -> Grid:
-    grid = [[0] * 9 for _ in range(9)]
-
-    def backtrack() -> bool:
-        r, c = find_empty(grid)
-        if r == -1:
-            return True
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        for v in nums:
-            if is_valid(grid, r, c, v):
-                grid[r][c] = v
-                if backtrack():
-                    return True
-                grid[r][c] = 0
-        return False
-
-    backtrack()
-    return grid
-
-
-def make_puzzle(difficulty: str = "easy") -> Grid:
-    full = fill_complete_grid()
-    puzzle = [row[:] for row in full]
+    """Return the number of solutions of `grid`, counting at most `limit`.
+    The grid itself is left untouched."""
+    return _count_solutions(grid, limit)
+
+
+def fill_complete_grid(rng=random, size: int = 9) -> Grid:
+    return random_complete_grid(rng, size)
+
+
+SYMMETRY_MAPS = {
+    "rot90": lambda r, c, n: (c, n - 1 - r),
+    "rot180": lambda r, c, n: (n - 1 - r, n - 1 - c),
+    "horizontal": lambda r, c, n: (n - 1 - r, c),
+    "vertical": lambda r, c, n: (r, n - 1 - c),
+    "diagonal": lambda r, c, n: (c, r),
+}
+
+
+@dataclass
+class GenerationStats:
+    attempts: int = 0
+    solver_calls: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+    clues: int = 0
+    score: Optional[int] = None
+    minimal: bool = False
+    budget_exhausted: bool = False
+
+
+def symmetry_orbits(size: int, symmetry: Optional[str] = None) -> List[List[Tuple[int, int]]]:
+    """Cells grouped into the orbits of `symmetry`; clues are removed and kept
+    one orbit at a time. Without a symmetry every cell is its own orbit."""
+    if symmetry in (None, "none"):
+        return [[(r, c)] for r in range(size) for c in range(size)]
+    if symmetry not in SYMMETRY_MAPS:
+        raise ValueError(f"Unsupported symmetry '{symmetry}'. Supported: {list(SYMMETRY_MAPS)}")
+    fn = SYMMETRY_MAPS[symmetry]
+    seen = set()
+    orbits = []
+    for r in range(size):
+        for c in range(size):
+            if (r, c) in seen:
+                continue
+            orbit = []
+            cell = (r, c)
+            while cell not in orbit:
+                orbit.append(cell)
+                cell = fn(cell[0], cell[1], size)
+            seen.update(orbit)
+            orbits.append(orbit)
+    return orbits
 
-    if difficulty == "easy":
-        target_clues = random.randint(36, 40)
-    else:
-        target_clues = random.randint(30, 34)
 
-    positions = [(r, c) for r in range(9) for c in range(9)]
-    random.shuffle(positions)
+def _over_budget(stats: GenerationStats, deadline: Optional[float], node_budget: Optional[int]) -> bool:
+    if deadline is not None and time.monotonic() > deadline:
+        return True
+    return node_budget is not None and stats.nodes >= node_budget
 
-    clues = 81
-    for r, c in positions:
+
+def _required_clues(links: DancingLinks, puzzle: Grid, stats: GenerationStats) -> bool:
+    """True when no single clue of `puzzle` can be dropped."""
+    n = len(puzzle)
+    nodes = links.nodes
+    minimal = True
+    for r in range(n):
+        for c in range(n):
+            if not puzzle[r][c]:
+                continue
+            digit = links.remove_clue(r, c)
+            stats.solver_calls += 1
+            removable = not links.has_other_solution(r, c, digit)
+            links.add_clue(r, c, digit)
+            if removable:
+                minimal = False
+                break
+        if not minimal:
+            break
+    stats.nodes += links.nodes - nodes
+    return minimal
+
+
+def is_minimal(puzzle: Grid) -> bool:
+    """True when every clue is needed for the solution to stay unique."""
+    return _required_clues(DancingLinks(puzzle), puzzle, GenerationStats())
+
+
+def _dig_puzzle(
+    target_clues: int,
+    rng=random,
+    size: int = 9,
+    symmetry: Optional[str] = None,
+    stats: Optional[GenerationStats] = None,
+    deadline: Optional[float] = None,
+    node_budget: Optional[int] = None,
+    check_minimal: bool = False,
+) -> Tuple[Grid, bool]:
+    """Dig one puzzle down towards `target_clues`, one symmetry orbit at a
+    time. Returns the puzzle and whether it is known to be minimal. Running
+    out of budget stops the dig early; the puzzle is still unique."""
+    if stats is None:
+        stats = GenerationStats()
+    filler = BitmaskSolver([[0] * size for _ in range(size)])
+    filler.count(1, rng=rng)
+    stats.solver_calls += 1
+    stats.nodes += filler.nodes
+    full = filler.solution_grid()
+    puzzle = [row[:] for row in full]
+
+    orbits = symmetry_orbits(size, symmetry)
+    rng.shuffle(orbits)
+
+    # Cover clues in reverse removal order so each removal pops the top of
+    # the exact-cover stack instead of rebuilding it.
+    links = DancingLinks(full, order=[cell for orbit in orbits for cell in orbit][::-1])
+    clues = size * size
+    complete = True
+    for orbit in orbits:
         if clues <= target_clues:
+            complete = False
             break
-        backup = puzzle[r][c]
-        puzzle[r][c] = 0
-        grid_copy = [row[:] for row in puzzle]
-        num_solutions = solve(grid_copy, count_solutions=True, limit=2)
-        if num_solutions != 1:
-            puzzle[r][c] = backup
+        if clues - len(orbit) < target_clues:
+            continue
+        if _over_budget(stats, deadline, node_budget):
+            stats.budget_exhausted = True
+            complete = False
+            break
+        digits = [links.remove_clue(r, c) for r, c in orbit]
+        nodes = links.nodes
+        unique = True
+        # any other solution must differ from `full` in a removed cell
+        for (r, c), digit in zip(orbit, digits):
+            stats.solver_calls += 1
+            if links.has_other_solution(r, c, digit):
+                unique = False
+                break
+        stats.nodes += links.nodes - nodes
+        if unique:
+            for r, c in orbit:
+                puzzle[r][c] = 0
+            clues -= len(orbit)
         else:
-            clues -= 1
-    return puzzle
+            for (r, c), digit in reversed(list(zip(orbit, digits))):
+                links.add_clue(r, c, digit)
+
+    # A full single-cell pass is minimal by construction: a clue that was
+    # needed stays needed once other clues are gone. Orbit removal is not.
+    minimal = complete and len(orbits) == size * size
+    if complete and not minimal and check_minimal:
+        minimal = _required_clues(links, puzzle, stats)
+    return puzzle, minimal
 
 
-def render_sudoku_pdf(puzzles: List[Grid], filename: str, trim_size: str = "8.5x11"):
+def make_puzzle_with_stats(
+    difficulty: str = "easy",
+    target_clues: Optional[int] = None,
+    max_attempts: int = 500,
+    seed: Optional[int] = None,
+    size: int = 9,
+    symmetry: Optional[str] = None,
+    minimal: bool = False,
+    time_budget: Optional[float] = None,
+    node_budget: Optional[int] = None,
+) -> Tuple[Grid, GenerationStats]:
+    """make_puzzle, also returning how much search the puzzle took."""
+    rng = random.Random(seed) if seed is not None else random
+    if difficulty not in DIFFICULTY_BANDS:
+        raise ValueError(f"Unsupported difficulty '{difficulty}'. Supported: {list(DIFFICULTY_BANDS)}")
+    if minimal and difficulty == "easy" and size == 9:
+        raise ValueError("Minimal 9x9 puzzles grade above the easy band; use medium or harder with `minimal`.")
+    if minimal and symmetry in UNREACHABLE_MINIMAL:
+        raise ValueError(f"{symmetry} symmetric puzzles are almost never minimal; use another symmetry with `minimal`.")
+    box_shape(size)
+    symmetry_orbits(1, symmetry)
+    if time_budget is None and node_budget is None:
+        if minimal and symmetry not in (None, "none"):
+            node_budget = SYMMETRIC_MINIMAL_NODES
+        elif size != 9 and not minimal:
+            node_budget = UNGRADED_NODE_BUDGET
+    start = time.monotonic()
+    deadline = start + time_budget if time_budget is not None else None
+    low, high = DIFFICULTY_BANDS[difficulty]
+    stats = GenerationStats()
+    best: Optional[Grid] = None
+    best_key: Tuple[int, int, int] = (0, 0, 0)
+    while stats.attempts < max_attempts:
+        stats.attempts += 1
+        if minimal:
+            clues = 0
+        elif target_clues is not None:
+            clues = target_clues
+        elif size != 9:
+            low_frac, high_frac = CLUE_FRACTIONS[difficulty]
+            clues = rng.randint(int(low_frac * size * size), int(high_frac * size * size))
+        elif difficulty == "easy":
+            clues = rng.randint(36, 40)
+        else:
+            clues = 0
+        puzzle, is_min = _dig_puzzle(clues, rng, size, symmetry, stats, deadline, node_budget, minimal)
+        left = sum(1 for row in puzzle for v in row if v)
+        score = grade_puzzle(puzzle).score if size == 9 else None
+        # Sizes without a grader take the first puzzle that meets the clue
+        # target; 9x9 also has to grade inside the difficulty band.
+        key = (
+            int(minimal and not is_min),
+            max(left - target_clues, 0) if target_clues is not None and not minimal else 0,
+            max(low - score, score - high, 0) if score is not None else 0,
+        )
+        if best is None or key < best_key:
+            best, best_key = puzzle, key
+            stats.clues, stats.score, stats.minimal = left, score, is_min
+        if best_key == (0, 0, 0):
+            break
+        if _over_budget(stats, deadline, node_budget):
+            stats.budget_exhausted = True
+            break
+    stats.seconds = time.monotonic() - start
+    return best, stats
+
+
+def make_puzzle(
+    difficulty: str = "easy",
+    target_clues: Optional[int] = None,
+    max_attempts: int = 500,
+    seed: Optional[int] = None,
+    size: int = 9,
+    symmetry: Optional[str] = None,
+    minimal: bool = False,
+    time_budget: Optional[float] = None,
+    node_budget: Optional[int] = None,
+) -> Grid:
+    """Dig puzzles until one grades inside the score band of `difficulty`.
+    Easy puzzles keep 36-40 clues; harder tiers are dug as far as uniqueness
+    allows. After `max_attempts` the closest puzzle found is returned.
+    Other grid sizes (4, 6, 12, 16, ...) have no technique grader and keep
+    the share of clues given by CLUE_FRACTIONS instead, within
+    UNGRADED_NODE_BUDGET search nodes unless a budget is given.
+
+    `symmetry` (a SYMMETRY_MAPS name) removes clues in symmetric groups.
+    `minimal` digs until every remaining clue is required; such 9x9
+    puzzles always grade above easy, so easy with `minimal` is rejected
+    with ValueError, and so is a symmetry in UNREACHABLE_MINIMAL. Restarts
+    stop once `time_budget` seconds or `node_budget` search nodes are spent,
+    returning the best puzzle so far; the node budget keeps seeded runs
+    reproducible. Symmetric minimal puzzles default to
+    SYMMETRIC_MINIMAL_NODES.
+    A `seed` makes the result reproducible; otherwise the global `random`
+    state is used."""
+    return make_puzzle_with_stats(
+        difficulty, target_clues, max_attempts, seed, size, symmetry, minimal, time_budget, node_budget
+    )[0]
+
+
+def _pattern_matches(puzzle: Grid, fn) -> bool:
+    n = len(puzzle)
+    for r in range(n):
+        for c in range(n):
+            rr, cc = fn(r, c, n)
+            if bool(puzzle[r][c]) != bool(puzzle[rr][cc]):
+                return False
+    return True
+
+
+def clue_symmetry(puzzle: Grid) -> str:
+    """Name of the first symmetry in SYMMETRY_MAPS that maps the clue pattern
+    onto itself, or "none"."""
+    for name, fn in SYMMETRY_MAPS.items():
+        if _pattern_matches(puzzle, fn):
+            return name
+    return "none"
+
+
+# puzzles per page -> (columns, rows)
+PAGE_LAYOUTS = {1: (1, 1), 2: (1, 2), 4: (2, 2), 6: (2, 3)}
+ANSWER_GRID_INCH = 1.9
+
+
+def symbol(value: int) -> str:
+    """Printed symbol of a cell value: 1-9, then A, B, ... for larger grids."""
+    return str(value) if value < 10 else chr(ord("A") + value - 10)
+
+
+def _grid_form(canvas, forms: set, prefix: str, n: int, size: float) -> str:
+    """Name of the Form XObject holding the empty n x n grid at this size,
+    recording it on first use."""
+    name = f"{prefix}{n}"
+    if name in forms:
+        return name
+    forms.add(name)
+    box_rows, box_cols = box_shape(n)
+    cell = size / n
+    thick = max(1.0, size / 250)
+    thin = max(0.4, thick / 2)
+    canvas.beginForm(name, lowerx=0, lowery=0, upperx=size, uppery=size)
+    for width, wanted_thick in ((thin, False), (thick, True)):
+        canvas.setLineWidth(width)
+        path = canvas.beginPath()
+        for i in range(n + 1):
+            # i counts lines from the bottom edge, boxes are counted from the top
+            if ((n - i) % box_rows == 0) == wanted_thick:
+                path.moveTo(0, i * cell)
+                path.lineTo(size, i * cell)
+            if (i % box_cols == 0) == wanted_thick:
+                path.moveTo(i * cell, 0)
+                path.lineTo(i * cell, size)
+        canvas.drawPath(path, stroke=1, fill=0)
+    canvas.endForm()
+    return name
+
+
+def _draw_grid(canvas, form: str, grid: Grid, x0: float, y0: float, size: float, givens: Optional[Grid] = None):
+    canvas.saveState()
+    canvas.translate(x0, y0)
+    canvas.doForm(form)
+    canvas.restoreState()
+
+    n = len(grid)
+    cell = size / n
+    font_size = cell * 0.5
+    text = canvas.beginText()
+    font = None
+    for r in range(n):
+        for c in range(n):
+            v = grid[r][c]
+            if not v:
+                continue
+            wanted = "Helvetica-Bold" if givens is not None and givens[r][c] else "Helvetica"
+            if wanted != font:
+                font = wanted
+                text.setFont(font, font_size)
+            label = symbol(v)
+            w = canvas.stringWidth(label, font, font_size)
+            text.setTextOrigin(x0 + c * cell + (cell - w) / 2, y0 + (n - 1 - r) * cell + cell / 2 - font_size * 0.35)
+            text.textOut(label)
+    canvas.drawText(text)
+
+
+def render_sudoku_pdf(
+    puzzles: List[Grid],
+    filename: str,
+    trim_size: str = "8.5x11",
+    per_page: int = 1,
+    answer_key: bool = False,
+    solutions: Optional[List[Grid]] = None,
+):
+    """Render puzzles `per_page` to a page (1, 2, 4 or 6), optionally followed
+    by an answer-key section of small solved grids. Puzzles may be any size
+    in BOX_SHAPES. The empty grid is drawn once per size as a Form XObject and
+    referenced for every puzzle."""
+    if per_page not in PAGE_LAYOUTS:
+        raise ValueError(f"Unsupported per_page {per_page}. Supported: {sorted(PAGE_LAYOUTS)}")
     canvas = create_canvas(filename, trim_size)
     page_width, page_height = size_to_points(trim_size)
     margin = DEFAULT_MARGIN
 
-    grid_size = min(page_width, page_height) - 2 * margin
-    cell_size = grid_size / 9
-    origin_x = (page_width - grid_size) / 2
-    origin_y = (page_height - grid_size) / 2
+    cols, rows = PAGE_LAYOUTS[per_page]
+    if per_page == 1:
+        grid_size = min(page_width, page_height) - 2 * margin
+        slots = [((page_width - grid_size) / 2, (page_height - grid_size) / 2)]
+    else:
+        slots, grid_size = grid_slots(page_width, page_height, margin, cols, rows, 0.9)
+    forms: set = set()
 
     page_num = 1
-    for puzzle in puzzles:
+    for start in range(0, len(puzzles), per_page):
         draw_page_title(canvas, page_width, page_height, "Sudoku")
-        for r in range(10):
-            lw = 2 if r % 3 == 0 else 1
-            canvas.setLineWidth(lw)
-            y = origin_y + r * cell_size
-            canvas.line(origin_x, y, origin_x + grid_size, y)
-        for c in range(10):
-            lw = 2 if c % 3 == 0 else 1
-            canvas.setLineWidth(lw)
-            x = origin_x + c * cell_size
-            canvas.line(x, origin_y, x, origin_y + grid_size)
-        canvas.setFont("Helvetica", 14)
-        for r in range(9):
-            for c in range(9):
-                v = puzzle[r][c]
-                if v != 0:
-                    text = str(v)
-                    x = origin_x + c * cell_size + cell_size / 2
-                    y = origin_y + (8 - r) * cell_size + cell_size * 0.3
-                    canvas.drawCentredString(x, y, text)
+        for k, (x0, y0) in enumerate(slots[:len(puzzles) - start]):
+            draw_grid_label(canvas, f"#{start + k + 1}", x0, y0, grid_size)
+            puzzle = puzzles[start + k]
+            form = _grid_form(canvas, forms, "SudokuGrid", len(puzzle), grid_size)
+            _draw_grid(canvas, form, puzzle, x0, y0, grid_size)
         draw_footer_page_number(canvas, page_width, margin, page_num)
         canvas.showPage()
         page_num += 1
-    canvas.save()
\ No newline at end of file
+
+    if answer_key and puzzles:
+        if solutions is None:
+            solutions = [solve_grid(p) for p in puzzles]
+        key_cols = max(2, int((page_width - 2 * margin) // (ANSWER_GRID_INCH * 72)))
+        key_rows = max(2, int((page_height - 2 * margin - 30) // (ANSWER_GRID_INCH * 72 + LABEL_HEIGHT)))
+        key_slots, key_size = grid_slots(page_width, page_height, margin, key_cols, key_rows, 0.9)
+        for start in range(0, len(puzzles), len(key_slots)):
+            draw_page_title(canvas, page_width, page_height, "Solutions")
+            for k, (x0, y0) in enumerate(key_slots[:len(puzzles) - start]):
+                idx = start + k
+                draw_grid_label(canvas, f"#{idx + 1}", x0, y0, key_size)
+                form = _grid_form(canvas, forms, "SudokuKeyGrid", len(puzzles[idx]), key_size)
+                _draw_grid(canvas, form, solutions[idx], x0, y0, key_size, givens=puzzles[idx])
+            draw_footer_page_number(canvas, page_width, margin, page_num)
+            canvas.showPage()
+            page_num += 1
+    canvas.save()
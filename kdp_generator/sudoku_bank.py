@@ -0,0 +1,245 @@
+import os
+import random
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from .sudoku import Grid, clue_symmetry
+from .sudoku_batch import derive_seed, generate_batch, generate_puzzles
+from .sudoku_grader import grade_puzzle
+from .sudoku_solver import solve_grid
+from .sudoku_transform import apply_transform, canonical_form, iter_variants
+
+DEFAULT_BANK_PATH = os.environ.get("KDP_SUDOKU_BANK", "samples/sudoku_bank.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    puzzle TEXT NOT NULL UNIQUE,
+    canonical_form TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    clues INTEGER NOT NULL,
+    symmetry TEXT NOT NULL,
+    seed_id INTEGER REFERENCES puzzles (id),
+    used INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS puzzles_unused
+    ON puzzles (difficulty, symmetry, score, clues) WHERE used = 0;
+-- a variant shares its seed's canonical form; generated puzzles never do
+CREATE UNIQUE INDEX IF NOT EXISTS puzzles_canonical
+    ON puzzles (canonical_form) WHERE seed_id IS NULL;
+CREATE TABLE IF NOT EXISTS book_puzzles (
+    book TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    puzzle_id INTEGER NOT NULL REFERENCES puzzles (id),
+    PRIMARY KEY (book, position)
+);
+"""
+
+
+def encode_grid(grid: Grid) -> str:
+    return "".join(str(v) for row in grid for v in row)
+
+
+def decode_grid(text: str) -> Grid:
+    n = int(len(text) ** 0.5)
+    return [[int(ch) for ch in text[r * n:(r + 1) * n]] for r in range(n)]
+
+
+class PuzzleBank:
+    """SQLite-backed store of graded puzzles. Unused puzzles sit in a partial
+    index keyed by difficulty, symmetry, score and clue count, so drawing the
+    next unused puzzle is an index seek regardless of bank size. Every draw is
+    recorded against a book name and never handed out again. Generated
+    puzzles are unique up to relabelling, row/column moves and transposition
+    (see canonical_form); only `expand` stores equivalent variants."""
+
+    def __init__(self, path: str = DEFAULT_BANK_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self._add_canonical_forms()
+        self.conn.executescript(SCHEMA)
+
+    def _add_canonical_forms(self):
+        """Give a bank made before the canonical_form column one. A generated
+        puzzle equivalent to an earlier one becomes that puzzle's variant."""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(puzzles)")]
+        if not columns or "canonical_form" in columns:
+            return
+        rows = self.conn.execute("SELECT id, puzzle, seed_id FROM puzzles ORDER BY id").fetchall()
+        forms: Dict[int, str] = {}
+        seeds: Dict[str, int] = {}
+        updates = []
+        for pid, puzzle, seed_id in rows:
+            if seed_id is None:
+                forms[pid] = canonical_form(decode_grid(puzzle))
+                seed_id = seeds.get(forms[pid])
+                if seed_id is None:
+                    seeds[forms[pid]] = pid
+            else:
+                forms[pid] = forms[seed_id]
+            updates.append((forms[pid], seed_id, pid))
+        with self.conn:
+            self.conn.execute("ALTER TABLE puzzles ADD COLUMN canonical_form TEXT NOT NULL DEFAULT ''")
+            self.conn.executemany("UPDATE puzzles SET canonical_form = ?, seed_id = ? WHERE id = ?", updates)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "PuzzleBank":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(
+        self,
+        puzzle: Grid,
+        difficulty: str,
+        score: Optional[int] = None,
+        solution: Optional[Grid] = None,
+        seed_id: Optional[int] = None,
+        commit: bool = True,
+        canonical: Optional[str] = None,
+    ) -> bool:
+        """Store a puzzle; returns False when it, or for a generated puzzle
+        any equivalent one, is already in the bank. `seed_id` marks a
+        transformed variant of another stored puzzle, and `canonical` is its
+        canonical form when already known."""
+        if canonical is None:
+            canonical = canonical_form(puzzle)
+        if score is None:
+            score = grade_puzzle(puzzle).score
+        if solution is None:
+            solution = solve_grid(puzzle)
+        clues = sum(1 for row in puzzle for v in row if v)
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO puzzles (puzzle, canonical_form, solution, difficulty, score, clues, symmetry, seed_id)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                encode_grid(puzzle), canonical, encode_grid(solution), difficulty, score, clues,
+                clue_symmetry(puzzle), seed_id,
+            ),
+        )
+        if commit:
+            self.conn.commit()
+        return cur.rowcount == 1
+
+    def fill(self, count: int, difficulty: str = "easy", jobs: int = 1, symmetry: Optional[str] = None) -> int:
+        added = 0
+        while added < count:
+            for puzzle in generate_puzzles(count - added, difficulty, jobs=jobs, symmetry=symmetry):
+                if self.add(puzzle, difficulty, commit=False):
+                    added += 1
+            self.conn.commit()
+        return added
+
+    def expand(self, count: int, difficulty: str = "easy", rng=random) -> int:
+        """Mint up to `count` transformed variants of the generated (non-variant)
+        puzzles of `difficulty`. Variants share their seed's solution shape and
+        score, so nothing is re-solved or re-graded."""
+        added = 0
+        if count <= 0:
+            return added
+        rows = self.conn.execute(
+            "SELECT id, puzzle, solution, score, canonical_form FROM puzzles"
+            " WHERE difficulty = ? AND seed_id IS NULL ORDER BY id",
+            (difficulty,),
+        ).fetchall()
+        seeds = [decode_grid(puzzle) for _, puzzle, _, _, _ in rows]
+        for idx, transform, variant in iter_variants(seeds, rng):
+            seed_id, _, solution, score, canonical = rows[idx]
+            solved = apply_transform(decode_grid(solution), transform)
+            if self.add(variant, difficulty, score, solved, seed_id=seed_id, commit=False, canonical=canonical):
+                added += 1
+                if added >= count:
+                    break
+        self.conn.commit()
+        return added
+
+    def book_puzzles(self, book: str) -> List[Grid]:
+        rows = self.conn.execute(
+            "SELECT p.puzzle FROM book_puzzles b JOIN puzzles p ON p.id = b.puzzle_id WHERE b.book = ? ORDER BY b.position",
+            (book,),
+        ).fetchall()
+        return [decode_grid(text) for (text,) in rows]
+
+    def draw(
+        self,
+        book: str,
+        count: int,
+        difficulty: str = "easy",
+        symmetry: Optional[str] = None,
+        score_range: Optional[Tuple[int, int]] = None,
+    ) -> List[Grid]:
+        """Take up to `count` unused puzzles for `book`, mark them used and
+        append them to the book's record."""
+        sql = "SELECT id, puzzle FROM puzzles WHERE used = 0 AND difficulty = ?"
+        params: list = [difficulty]
+        if symmetry is not None:
+            sql += " AND symmetry = ?"
+            params.append(symmetry)
+        if score_range is not None:
+            sql += " AND score BETWEEN ? AND ?"
+            params.extend(score_range)
+        sql += " LIMIT ?"
+        params.append(count)
+        with self.conn:
+            rows = self.conn.execute(sql, params).fetchall()
+            (start,) = self.conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM book_puzzles WHERE book = ?", (book,)
+            ).fetchone()
+            self.conn.executemany("UPDATE puzzles SET used = 1 WHERE id = ?", [(pid,) for pid, _ in rows])
+            self.conn.executemany(
+                "INSERT INTO book_puzzles (book, position, puzzle_id) VALUES (?, ?, ?)",
+                [(book, start + i, pid) for i, (pid, _) in enumerate(rows)],
+            )
+        return [decode_grid(text) for _, text in rows]
+
+    def export(self) -> List[Tuple[int, str, str]]:
+        """(id, puzzle, solution) of every stored puzzle, as 81-digit strings."""
+        return self.conn.execute("SELECT id, puzzle, solution FROM puzzles ORDER BY id").fetchall()
+
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """{difficulty: (total, unused)}"""
+        rows = self.conn.execute(
+            "SELECT difficulty, COUNT(*), SUM(used = 0) FROM puzzles GROUP BY difficulty ORDER BY difficulty"
+        ).fetchall()
+        return {d: (total, unused) for d, total, unused in rows}
+
+
+def draw_or_generate(
+    bank: Optional[PuzzleBank],
+    book: str,
+    count: int,
+    difficulty: str = "easy",
+    symmetry: Optional[str] = None,
+    jobs: int = 1,
+    seed: Optional[int] = None,
+) -> List[Grid]:
+    """The `count` puzzles of `book`: those already recorded for it, then
+    unused ones drawn from `bank`, then a generate_batch over `jobs`
+    processes for the shortfall, stored and recorded so that rerunning a
+    book returns the same puzzles. Without a bank everything is generated."""
+    puzzles = bank.book_puzzles(book)[:count] if bank is not None else []
+    if bank is not None and len(puzzles) < count:
+        puzzles.extend(bank.draw(book, count - len(puzzles), difficulty, symmetry))
+    base_seed = seed if seed is not None else random.randrange(2 ** 63)
+    rounds = 0
+    while len(puzzles) < count:
+        # puzzles the bank already holds are dropped, so later rounds reseed
+        round_seed = base_seed if rounds == 0 else derive_seed(base_seed, -rounds)
+        rounds += 1
+        batch = generate_batch(count - len(puzzles), difficulty, jobs=jobs, base_seed=round_seed, symmetry=symmetry)
+        if bank is None:
+            puzzles.extend(puzzle for puzzle, _ in batch)
+            continue
+        for puzzle, stats in batch:
+            bank.add(puzzle, difficulty, stats.score, commit=False)
+        bank.conn.commit()
+        puzzles.extend(bank.draw(book, count - len(puzzles), difficulty, symmetry))
+    return puzzles
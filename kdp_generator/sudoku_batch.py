@@ -0,0 +1,67 @@
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .sudoku import GenerationStats, Grid, make_puzzle_with_stats
+
+
+def derive_seed(base_seed: int, index: int) -> int:
+    """Seed of puzzle `index` in a batch; independent of worker count and of
+    the order in which puzzles finish."""
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def regenerate_with_stats(index: int, difficulty: str, base_seed: int, size: int = 9, **options) -> Tuple[Grid, GenerationStats]:
+    return make_puzzle_with_stats(difficulty, seed=derive_seed(base_seed, index), size=size, **options)
+
+
+def regenerate_puzzle(index: int, difficulty: str, base_seed: int, size: int = 9, **options) -> Grid:
+    """Rebuild a single puzzle of a batch, e.g. after a worker failure."""
+    return regenerate_with_stats(index, difficulty, base_seed, size, **options)[0]
+
+
+def generate_batch(
+    count: int,
+    difficulty: str = "easy",
+    jobs: int = 1,
+    base_seed: Optional[int] = None,
+    size: int = 9,
+    **options,
+) -> List[Tuple[Grid, GenerationStats]]:
+    """Generate `count` puzzles with their generation stats, spreading them
+    over `jobs` processes. `options` (symmetry, minimal, time_budget,
+    node_budget) go to make_puzzle for every puzzle, so each one restarts
+    within its own budget. The output depends only on `base_seed` (and the
+    time budget, if any), never on `jobs`; puzzles whose worker fails are
+    regenerated alone in this process."""
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 63)
+    if jobs <= 1 or count <= 1:
+        return [regenerate_with_stats(i, difficulty, base_seed, size, **options) for i in range(count)]
+
+    results: List[Optional[Tuple[Grid, GenerationStats]]] = [None] * count
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(regenerate_with_stats, i, difficulty, base_seed, size, **options) for i in range(count)]
+        for i, future in enumerate(futures):
+            try:
+                results[i] = future.result()
+            except Exception:
+                results[i] = None
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = regenerate_with_stats(i, difficulty, base_seed, size, **options)
+    return results
+
+
+def generate_puzzles(
+    count: int,
+    difficulty: str = "easy",
+    jobs: int = 1,
+    base_seed: Optional[int] = None,
+    size: int = 9,
+    **options,
+) -> List[Grid]:
+    """generate_batch without the stats."""
+    return [puzzle for puzzle, _ in generate_batch(count, difficulty, jobs, base_seed, size, **options)]
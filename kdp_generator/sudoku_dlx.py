@@ -0,0 +1,231 @@
+from typing import List, Optional, Sequence, Tuple
+
+from .sudoku_solver import box_shape
+
+Grid = List[List[int]]
+
+
+class DancingLinks:
+    """Algorithm X over the sudoku exact-cover matrix, using Knuth's Dancing
+    Links. The matrix is built once; clues are covered on a stack and can be
+    removed or restored without rebuilding anything, which keeps the
+    per-removal uniqueness check in puzzle digging cheap."""
+
+    def __init__(
+        self,
+        grid: Optional[Grid] = None,
+        order: Optional[Sequence[Tuple[int, int]]] = None,
+        size: int = 9,
+        shape: Optional[Tuple[int, int]] = None,
+    ):
+        if grid is not None:
+            size = len(grid)
+        self.size = size
+        self.box_rows, self.box_cols = shape or box_shape(size)
+        n_columns = 4 * size * size
+        n_nodes = 1 + n_columns + 4 * size ** 3
+        self.L = list(range(n_nodes))
+        self.R = list(range(n_nodes))
+        self.U = list(range(n_nodes))
+        self.D = list(range(n_nodes))
+        self.C = list(range(n_nodes))
+        self.S = [0] * (n_columns + 1)
+        self.row_of = [0] * n_nodes
+        self.first_node = [0] * (size ** 3)
+        self.active = bytearray(b"\x01" * (n_columns + 1))
+        self.clues: List[Tuple[int, int, int]] = []  # (cell, digit, row node) in cover order
+        self.solution: Optional[Grid] = None
+        self.nodes = 0
+        self._partial: List[int] = []
+
+        L, R, U, D, C = self.L, self.R, self.U, self.D, self.C
+        for h in range(n_columns + 1):
+            L[h] = h - 1
+            R[h] = h + 1
+        L[0] = n_columns
+        R[n_columns] = 0
+
+        node = n_columns + 1
+        for r in range(size):
+            for c in range(size):
+                for d in range(size):
+                    row_id = (r * size + c) * size + d
+                    self.first_node[row_id] = node
+                    cols = self._constraint_columns(r, c, d)
+                    for k, col in enumerate(cols):
+                        x = node + k
+                        C[x] = col
+                        self.row_of[x] = row_id
+                        U[x] = U[col]
+                        D[x] = col
+                        D[U[col]] = x
+                        U[col] = x
+                        self.S[col] += 1
+                        L[x] = node + (k - 1) % 4
+                        R[x] = node + (k + 1) % 4
+                    node += 4
+
+        if grid is not None:
+            cells = order if order is not None else [(r, c) for r in range(size) for c in range(size)]
+            for r, c in cells:
+                if grid[r][c]:
+                    self.add_clue(r, c, grid[r][c])
+
+    def _constraint_columns(self, r: int, c: int, d: int) -> Tuple[int, int, int, int]:
+        # 1-based header indices: cell, row/digit, column/digit, box/digit
+        size = self.size
+        b = self.box_rows * (r // self.box_rows) + c // self.box_cols
+        n = size * size
+        return (
+            1 + r * size + c,
+            1 + n + r * size + d,
+            1 + 2 * n + c * size + d,
+            1 + 3 * n + b * size + d,
+        )
+
+    def _cover(self, col: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[col]] = L[col]
+        R[L[col]] = R[col]
+        self.active[col] = 0
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, col: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[col]] = col
+        R[L[col]] = col
+        self.active[col] = 1
+
+    def _select(self, node: int):
+        self._cover(self.C[node])
+        j = self.R[node]
+        while j != node:
+            self._cover(self.C[j])
+            j = self.R[j]
+
+    def _deselect(self, node: int):
+        j = self.L[node]
+        while j != node:
+            self._uncover(self.C[j])
+            j = self.L[j]
+        self._uncover(self.C[node])
+
+    def add_clue(self, r: int, c: int, digit: int):
+        row_id = (r * self.size + c) * self.size + digit - 1
+        node = self.first_node[row_id]
+        if not all(self.active[col] for col in self._constraint_columns(r, c, digit - 1)):
+            raise ValueError(f"Clue {digit} at ({r}, {c}) conflicts with the grid")
+        self._select(node)
+        self.clues.append((r * self.size + c, digit, node))
+
+    def remove_clue(self, r: int, c: int) -> int:
+        """Remove the clue at (r, c) and return its digit. Clues covered after
+        it are lifted and re-covered, so removing the most recently added clue
+        costs a single uncover."""
+        cell = r * self.size + c
+        lifted = []
+        while self.clues:
+            top_cell, digit, node = self.clues.pop()
+            self._deselect(node)
+            if top_cell == cell:
+                for entry in reversed(lifted):
+                    self._select(entry[2])
+                    self.clues.append(entry)
+                return digit
+            lifted.append((top_cell, digit, node))
+        for entry in reversed(lifted):
+            self._select(entry[2])
+            self.clues.append(entry)
+        raise KeyError(f"No clue at ({r}, {c})")
+
+    def _search(self, limit: int) -> int:
+        self.nodes += 1
+        R, D, S = self.R, self.D, self.S
+        col = R[0]
+        if col == 0:
+            if self.solution is None:
+                self._record_solution()
+            return 1
+        best, size = col, S[col]
+        while col and size > 1:
+            if S[col] < size:
+                best, size = col, S[col]
+            col = R[col]
+        if size == 0:
+            return 0
+        self._cover(best)
+        total = 0
+        node = D[best]
+        while node != best:
+            self._partial.append(node)
+            j = R[node]
+            while j != node:
+                self._cover(self.C[j])
+                j = R[j]
+            total += self._search(limit - total)
+            j = self.L[node]
+            while j != node:
+                self._uncover(self.C[j])
+                j = self.L[j]
+            self._partial.pop()
+            if total >= limit:
+                break
+            node = D[node]
+        self._uncover(best)
+        return total
+
+    def _record_solution(self):
+        size = self.size
+        grid = [[0] * size for _ in range(size)]
+        for cell, digit, _ in self.clues:
+            grid[cell // size][cell % size] = digit
+        for node in self._partial:
+            row_id = self.row_of[node]
+            cell, d = divmod(row_id, size)
+            grid[cell // size][cell % size] = d + 1
+        self.solution = grid
+
+    def count(self, limit: int = 2) -> int:
+        """Count solutions of the current clue set, stopping at `limit`."""
+        self.solution = None
+        return self._search(limit)
+
+    def has_unique_solution(self) -> bool:
+        return self.count(2) == 1
+
+    def has_other_solution(self, r: int, c: int, digit: int) -> bool:
+        """True when the current clues admit a solution without `digit` at
+        (r, c). Right after removing that clue from a uniquely solvable grid
+        this is the uniqueness test, and it never re-derives the known
+        solution. The cell must not be a clue."""
+        U, D, C, S, R = self.U, self.D, self.C, self.S, self.R
+        first = self.first_node[(r * self.size + c) * self.size + digit - 1]
+        row = [first, R[first], R[R[first]], R[R[R[first]]]]
+        for x in row:
+            D[U[x]] = D[x]
+            U[D[x]] = U[x]
+            S[C[x]] -= 1
+        self.solution = None
+        found = self._search(1) > 0
+        for x in reversed(row):
+            S[C[x]] += 1
+            D[U[x]] = x
+            U[D[x]] = x
+        return found
@@ -0,0 +1,338 @@
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, List
+
+Grid = List[List[int]]
+
+SIZE = 9
+ALL_DIGITS = (1 << SIZE) - 1
+
+ROWS = [[r * SIZE + c for c in range(SIZE)] for r in range(SIZE)]
+COLS = [[r * SIZE + c for r in range(SIZE)] for c in range(SIZE)]
+BOXES = [
+    [(br + i) * SIZE + bc + j for i in range(3) for j in range(3)]
+    for br in (0, 3, 6)
+    for bc in (0, 3, 6)
+]
+UNITS = ROWS + COLS + BOXES
+BOX_OF = [3 * (i // SIZE // 3) + (i % SIZE) // 3 for i in range(SIZE * SIZE)]
+PEERS = [
+    sorted(set(ROWS[i // SIZE] + COLS[i % SIZE] + BOXES[BOX_OF[i]]) - {i})
+    for i in range(SIZE * SIZE)
+]
+PEER_SETS = [set(p) for p in PEERS]
+POPCOUNT = [bin(m).count("1") for m in range(1 << SIZE)]
+BITS = [[1 << d for d in range(SIZE) if m >> d & 1] for m in range(1 << SIZE)]
+
+# Technique weights; a higher weight is a harder technique.
+TECHNIQUES = [
+    ("hidden_single", 10),
+    ("naked_single", 15),
+    ("locked_candidates", 30),
+    ("naked_pair", 40),
+    ("hidden_pair", 45),
+    ("naked_triple", 55),
+    ("hidden_triple", 60),
+    ("x_wing", 90),
+    ("xy_wing", 100),
+    ("swordfish", 110),
+    ("coloring", 130),
+]
+WEIGHTS = dict(TECHNIQUES)
+UNSOLVED_SCORE = 1000
+MAX_STEP_BONUS = 19
+
+# Inclusive score bands. The step bonus is capped below the gap between
+# technique tiers, so the hardest technique decides the band.
+DIFFICULTY_BANDS = {
+    "easy": (0, 29),
+    "medium": (30, 89),
+    "hard": (90, 129),
+    "expert": (130, UNSOLVED_SCORE - 1),
+}
+
+
+@dataclass
+class Grade:
+    score: int
+    solved: bool
+    hardest: str
+    steps: Dict[str, int] = field(default_factory=dict)
+
+
+def _init_candidates(grid: Grid):
+    values = [v for row in grid for v in row]
+    cands = [0 if v else ALL_DIGITS for v in values]
+    for i, v in enumerate(values):
+        if v:
+            bit = ~(1 << (v - 1))
+            for p in PEERS[i]:
+                cands[p] &= bit
+    return values, cands
+
+
+def _assign(values: List[int], cands: List[int], i: int, bit: int):
+    values[i] = bit.bit_length()
+    cands[i] = 0
+    mask = ~bit
+    for p in PEERS[i]:
+        cands[p] &= mask
+
+
+def _naked_single(values, cands) -> int:
+    found = 0
+    for i in range(SIZE * SIZE):
+        m = cands[i]
+        if m and not m & (m - 1):
+            _assign(values, cands, i, m)
+            found += 1
+    return found
+
+
+def _hidden_single(values, cands) -> int:
+    found = 0
+    for unit in UNITS:
+        once = twice = 0
+        for i in unit:
+            m = cands[i]
+            twice |= once & m
+            once |= m
+        hidden = once & ~twice
+        while hidden:
+            bit = hidden & -hidden
+            hidden ^= bit
+            for i in unit:
+                if cands[i] & bit:
+                    _assign(values, cands, i, bit)
+                    found += 1
+                    break
+    return found
+
+
+def _eliminate(cands, cells, mask) -> bool:
+    changed = False
+    for i in cells:
+        if cands[i] & mask:
+            cands[i] &= ~mask
+            changed = True
+    return changed
+
+
+def _locked_candidates(values, cands) -> int:
+    for b, box in enumerate(BOXES):
+        for bit in BITS[ALL_DIGITS]:
+            cells = [i for i in box if cands[i] & bit]
+            if len(cells) < 2:
+                continue
+            rows = {i // SIZE for i in cells}
+            if len(rows) == 1:
+                others = [i for i in ROWS[rows.pop()] if BOX_OF[i] != b]
+                if _eliminate(cands, others, bit):
+                    return 1
+            cols = {i % SIZE for i in cells}
+            if len(cols) == 1:
+                others = [i for i in COLS[cols.pop()] if BOX_OF[i] != b]
+                if _eliminate(cands, others, bit):
+                    return 1
+    for line in ROWS + COLS:
+        for bit in BITS[ALL_DIGITS]:
+            cells = [i for i in line if cands[i] & bit]
+            if len(cells) < 2:
+                continue
+            boxes = {BOX_OF[i] for i in cells}
+            if len(boxes) == 1:
+                line_set = set(line)
+                others = [i for i in BOXES[boxes.pop()] if i not in line_set]
+                if _eliminate(cands, others, bit):
+                    return 1
+    return 0
+
+
+def _naked_subset(cands, k: int) -> int:
+    for unit in UNITS:
+        small = [i for i in unit if 2 <= POPCOUNT[cands[i]] <= k]
+        if len(small) < k:
+            continue
+        for combo in combinations(small, k):
+            union = 0
+            for i in combo:
+                union |= cands[i]
+            if POPCOUNT[union] != k:
+                continue
+            others = [i for i in unit if cands[i] and i not in combo]
+            if _eliminate(cands, others, union):
+                return 1
+    return 0
+
+
+def _hidden_subset(cands, k: int) -> int:
+    for unit in UNITS:
+        # positions of each digit inside the unit, as a 9-bit mask
+        places = {}
+        for bit in BITS[ALL_DIGITS]:
+            pos = 0
+            for idx, i in enumerate(unit):
+                if cands[i] & bit:
+                    pos |= 1 << idx
+            if 2 <= POPCOUNT[pos] <= k:
+                places[bit] = pos
+        if len(places) < k:
+            continue
+        for combo in combinations(places, k):
+            pos = 0
+            digits = 0
+            for bit in combo:
+                pos |= places[bit]
+                digits |= bit
+            if POPCOUNT[pos] != k:
+                continue
+            changed = False
+            for idx in BITS[pos]:
+                i = unit[idx.bit_length() - 1]
+                if cands[i] & ~digits:
+                    cands[i] &= digits
+                    changed = True
+            if changed:
+                return 1
+    return 0
+
+
+def _fish(cands, k: int) -> int:
+    for bit in BITS[ALL_DIGITS]:
+        for base, cover in ((ROWS, COLS), (COLS, ROWS)):
+            lines = []
+            for li, line in enumerate(base):
+                pos = 0
+                for idx, i in enumerate(line):
+                    if cands[i] & bit:
+                        pos |= 1 << idx
+                if 2 <= POPCOUNT[pos] <= k:
+                    lines.append((li, pos))
+            if len(lines) < k:
+                continue
+            for combo in combinations(lines, k):
+                pos = 0
+                for _, p in combo:
+                    pos |= p
+                if POPCOUNT[pos] != k:
+                    continue
+                base_lines = {li for li, _ in combo}
+                others = [
+                    cover[idx.bit_length() - 1][li]
+                    for idx in BITS[pos]
+                    for li in range(SIZE)
+                    if li not in base_lines
+                ]
+                if _eliminate(cands, others, bit):
+                    return 1
+    return 0
+
+
+def _xy_wing(values, cands) -> int:
+    bivalue = [i for i in range(SIZE * SIZE) if POPCOUNT[cands[i]] == 2]
+    for pivot in bivalue:
+        pm = cands[pivot]
+        wings = [i for i in bivalue if i in PEER_SETS[pivot] and POPCOUNT[cands[i] & pm] == 1]
+        for a, b in combinations(wings, 2):
+            ma, mb = cands[a], cands[b]
+            if ma == mb or (ma | mb) & pm != pm:
+                continue
+            z = ma & mb & ~pm
+            if not z or POPCOUNT[z] != 1:
+                continue
+            others = PEER_SETS[a] & PEER_SETS[b]
+            others.discard(pivot)
+            if _eliminate(cands, others, z):
+                return 1
+    return 0
+
+
+def _coloring(values, cands) -> int:
+    # Simple colouring: chains of conjugate pairs for a single digit.
+    for bit in BITS[ALL_DIGITS]:
+        links: Dict[int, List[int]] = {}
+        for unit in UNITS:
+            cells = [i for i in unit if cands[i] & bit]
+            if len(cells) == 2:
+                a, b = cells
+                links.setdefault(a, []).append(b)
+                links.setdefault(b, []).append(a)
+        color: Dict[int, int] = {}
+        for start in links:
+            if start in color:
+                continue
+            color[start] = 0
+            component = [start]
+            stack = [start]
+            while stack:
+                cell = stack.pop()
+                for nxt in links[cell]:
+                    if nxt not in color:
+                        color[nxt] = 1 - color[cell]
+                        component.append(nxt)
+                        stack.append(nxt)
+            groups = ([i for i in component if color[i] == 0], [i for i in component if color[i] == 1])
+            # colour wrap: two cells of one colour see each other
+            for group in groups:
+                if any(b in PEER_SETS[a] for a, b in combinations(group, 2)):
+                    if _eliminate(cands, group, bit):
+                        return 1
+            # colour trap: an uncoloured candidate sees both colours
+            comp_set = set(component)
+            for i in range(SIZE * SIZE):
+                if not cands[i] & bit or i in comp_set:
+                    continue
+                peers = PEER_SETS[i]
+                if any(j in peers for j in groups[0]) and any(j in peers for j in groups[1]):
+                    cands[i] &= ~bit
+                    return 1
+    return 0
+
+
+_STEPS = [
+    ("hidden_single", _hidden_single),
+    ("naked_single", _naked_single),
+    ("locked_candidates", _locked_candidates),
+    ("naked_pair", lambda v, c: _naked_subset(c, 2)),
+    ("hidden_pair", lambda v, c: _hidden_subset(c, 2)),
+    ("naked_triple", lambda v, c: _naked_subset(c, 3)),
+    ("hidden_triple", lambda v, c: _hidden_subset(c, 3)),
+    ("x_wing", lambda v, c: _fish(c, 2)),
+    ("xy_wing", _xy_wing),
+    ("swordfish", lambda v, c: _fish(c, 3)),
+    ("coloring", _coloring),
+]
+
+
+def grade_puzzle(grid: Grid) -> Grade:
+    """Solve `grid` the way a person would, always using the easiest technique
+    that makes progress. The score is the weight of the hardest technique
+    needed plus one point per non-single step (capped at MAX_STEP_BONUS);
+    puzzles these techniques cannot finish score UNSOLVED_SCORE."""
+    values, cands = _init_candidates(grid)
+    steps: Dict[str, int] = {}
+    hardest = ""
+    advanced = 0
+    while True:
+        if all(values):
+            break
+        for name, step in _STEPS:
+            found = step(values, cands)
+            if found:
+                steps[name] = steps.get(name, 0) + found
+                if not hardest or WEIGHTS[name] > WEIGHTS[hardest]:
+                    hardest = name
+                if WEIGHTS[name] >= WEIGHTS["locked_candidates"]:
+                    advanced += found
+                break
+        else:
+            return Grade(UNSOLVED_SCORE, False, hardest, steps)
+    score = (WEIGHTS[hardest] if hardest else 0) + min(advanced, MAX_STEP_BONUS)
+    return Grade(score, True, hardest, steps)
+
+
+def difficulty_of(score: int) -> str:
+    for name, (low, high) in DIFFICULTY_BANDS.items():
+        if low <= score <= high:
+            return name
+    return "unsolved"
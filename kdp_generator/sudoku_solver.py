@@ -0,0 +1,210 @@
+import random
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+Grid = List[List[int]]
+
+# grid size -> (box rows, box columns)
+BOX_SHAPES = {4: (2, 2), 6: (2, 3), 8: (2, 4), 9: (3, 3), 10: (2, 5), 12: (3, 4), 16: (4, 4)}
+
+
+def box_shape(size: int) -> Tuple[int, int]:
+    if size not in BOX_SHAPES:
+        raise ValueError(f"Unsupported sudoku size {size}. Supported: {sorted(BOX_SHAPES)}")
+    return BOX_SHAPES[size]
+
+
+class Geometry:
+    """Cell/unit lookup tables for one box shape."""
+
+    def __init__(self, box_rows: int, box_cols: int):
+        n = box_rows * box_cols
+        self.box_rows = box_rows
+        self.box_cols = box_cols
+        self.size = n
+        self.cells = n * n
+        self.all_digits = (1 << n) - 1
+        self.row_of = [i // n for i in range(n * n)]
+        self.col_of = [i % n for i in range(n * n)]
+        self.box_of = [
+            box_rows * (r // box_rows) + c // box_cols
+            for r, c in zip(self.row_of, self.col_of)
+        ]
+        self.units = []
+        for k in range(n):
+            self.units.append([i for i in range(n * n) if self.row_of[i] == k])
+            self.units.append([i for i in range(n * n) if self.col_of[i] == k])
+            self.units.append([i for i in range(n * n) if self.box_of[i] == k])
+
+
+@lru_cache(maxsize=None)
+def geometry(box_rows: int = 3, box_cols: int = 3) -> Geometry:
+    return Geometry(box_rows, box_cols)
+
+
+def geometry_for(grid: Grid, shape: Optional[Tuple[int, int]] = None) -> Geometry:
+    return geometry(*(shape or box_shape(len(grid))))
+
+
+def _popcount(m: int) -> int:
+    return bin(m).count("1")
+
+
+class BitmaskSolver:
+    """Backtracking solver that keeps the used digits of every row, column and
+    box as bitmasks, propagates naked/hidden singles and branches on the cell
+    with the fewest candidates. Works for any box shape in BOX_SHAPES; the
+    box shape is taken from the grid size unless given."""
+
+    def __init__(self, grid: Grid, shape: Optional[Tuple[int, int]] = None):
+        geo = self.geo = geometry_for(grid, shape)
+        n = geo.size
+        self.cells = [v for row in grid for v in row]
+        self.rows = [0] * n
+        self.cols = [0] * n
+        self.boxes = [0] * n
+        self.consistent = True
+        self.solution: Optional[List[int]] = None
+        self.nodes = 0
+        for i, v in enumerate(self.cells):
+            if not v:
+                continue
+            bit = 1 << (v - 1)
+            r, c, b = geo.row_of[i], geo.col_of[i], geo.box_of[i]
+            if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+                self.consistent = False
+            self.rows[r] |= bit
+            self.cols[c] |= bit
+            self.boxes[b] |= bit
+
+    def candidates(self, i: int) -> int:
+        geo = self.geo
+        return geo.all_digits & ~(self.rows[geo.row_of[i]] | self.cols[geo.col_of[i]] | self.boxes[geo.box_of[i]])
+
+    def _place(self, i: int, bit: int):
+        geo = self.geo
+        self.cells[i] = bit.bit_length()
+        self.rows[geo.row_of[i]] |= bit
+        self.cols[geo.col_of[i]] |= bit
+        self.boxes[geo.box_of[i]] |= bit
+
+    def _unplace(self, i: int):
+        geo = self.geo
+        bit = ~(1 << (self.cells[i] - 1))
+        self.cells[i] = 0
+        self.rows[geo.row_of[i]] &= bit
+        self.cols[geo.col_of[i]] &= bit
+        self.boxes[geo.box_of[i]] &= bit
+
+    def _propagate(self, trail: List[int]) -> bool:
+        geo = self.geo
+        all_digits = geo.all_digits
+        row_of, col_of, box_of = geo.row_of, geo.col_of, geo.box_of
+        cells = self.cells
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        changed = True
+        while changed:
+            changed = False
+            for unit in geo.units:
+                once = twice = filled = 0
+                for i in unit:
+                    v = cells[i]
+                    if v:
+                        filled |= 1 << (v - 1)
+                        continue
+                    m = all_digits & ~(rows[row_of[i]] | cols[col_of[i]] | boxes[box_of[i]])
+                    if not m:
+                        return False
+                    if not m & (m - 1):
+                        # naked single
+                        self._place(i, m)
+                        trail.append(i)
+                        filled |= m
+                        changed = True
+                        continue
+                    twice |= once & m
+                    once |= m
+                if (once | filled) != all_digits:
+                    return False
+                hidden = once & ~twice & ~filled
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in unit:
+                        if not cells[i] and self.candidates(i) & bit:
+                            self._place(i, bit)
+                            trail.append(i)
+                            changed = True
+                            break
+                    else:
+                        return False
+        return True
+
+    def _search(self, limit: int, rng) -> int:
+        self.nodes += 1
+        trail: List[int] = []
+        total = 0
+        if self._propagate(trail):
+            best = -1
+            best_mask = 0
+            best_count = self.geo.size + 1
+            for i, v in enumerate(self.cells):
+                if v:
+                    continue
+                m = self.candidates(i)
+                n = _popcount(m)
+                if n < best_count:
+                    best, best_mask, best_count = i, m, n
+                    if n <= 2:
+                        break
+            if best == -1:
+                if self.solution is None:
+                    self.solution = self.cells[:]
+                total = 1
+            else:
+                bits = []
+                while best_mask:
+                    bit = best_mask & -best_mask
+                    best_mask ^= bit
+                    bits.append(bit)
+                if rng is not None:
+                    rng.shuffle(bits)
+                for bit in bits:
+                    self._place(best, bit)
+                    total += self._search(limit - total, rng)
+                    self._unplace(best)
+                    if total >= limit:
+                        break
+        for i in reversed(trail):
+            self._unplace(i)
+        return total
+
+    def count(self, limit: int = 2, rng: Optional[random.Random] = None) -> int:
+        """Count solutions, stopping once `limit` is reached. Passing `rng`
+        randomizes the branching order, which is how complete grids are drawn."""
+        if not self.consistent:
+            return 0
+        return self._search(limit, rng)
+
+    def solution_grid(self) -> Optional[Grid]:
+        if self.solution is None:
+            return None
+        n = self.geo.size
+        return [self.solution[r * n:(r + 1) * n] for r in range(n)]
+
+
+def count_solutions(grid: Grid, limit: int = 2, shape: Optional[Tuple[int, int]] = None) -> int:
+    return BitmaskSolver(grid, shape).count(limit)
+
+
+def solve_grid(grid: Grid, shape: Optional[Tuple[int, int]] = None) -> Optional[Grid]:
+    solver = BitmaskSolver(grid, shape)
+    if not solver.count(1):
+        return None
+    return solver.solution_grid()
+
+
+def random_complete_grid(rng=random, size: int = 9, shape: Optional[Tuple[int, int]] = None) -> Grid:
+    solver = BitmaskSolver([[0] * size for _ in range(size)], shape)
+    solver.count(1, rng=rng)
+    return solver.solution_grid()
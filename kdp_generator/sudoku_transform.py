@@ -0,0 +1,158 @@
+import random
+from itertools import permutations, product
+from typing import Iterator, List, Sequence, Tuple
+
+Grid = List[List[int]]
+# (digit map indexed by old digit, row order, column order, transpose first)
+Transform = Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...], bool]
+
+SIZE = 9
+
+
+def _line_orders() -> List[Tuple[int, ...]]:
+    # every band/stack order combined with every order inside the bands
+    orders = []
+    for bands in permutations(range(3)):
+        for inner in product(permutations(range(3)), repeat=3):
+            orders.append(tuple(3 * b + i for b, perm in zip(bands, inner) for i in perm))
+    return orders
+
+
+LINE_ORDERS = _line_orders()
+
+
+def _random_line_order(rng) -> Tuple[int, ...]:
+    bands = [0, 1, 2]
+    rng.shuffle(bands)
+    order = []
+    for b in bands:
+        inner = [0, 1, 2]
+        rng.shuffle(inner)
+        order.extend(3 * b + i for i in inner)
+    return tuple(order)
+
+
+def random_transform(rng=random) -> Transform:
+    digits = list(range(1, SIZE + 1))
+    rng.shuffle(digits)
+    return (
+        (0, *digits),
+        _random_line_order(rng),
+        _random_line_order(rng),
+        rng.random() < 0.5,
+    )
+
+
+def transpose(grid: Grid) -> Grid:
+    return [list(col) for col in zip(*grid)]
+
+
+def apply_transform(grid: Grid, transform: Transform) -> Grid:
+    digit_map, rows, cols, flip = transform
+    src = transpose(grid) if flip else grid
+    return [[digit_map[src[r][c]] for c in cols] for r in rows]
+
+
+def _relabel(values: Sequence[int], order: Sequence[int], labels: List[int], next_label: int):
+    out = []
+    for c in order:
+        v = values[c]
+        if v:
+            if not labels[v]:
+                labels[v] = next_label
+                next_label += 1
+            out.append(labels[v])
+        else:
+            out.append(0)
+    return tuple(out), next_label
+
+
+def canonical_form(grid: Grid) -> str:
+    """Minimal 81-character string over all validity-preserving transforms
+    (relabelling, row/column moves within bands and stacks, band/stack moves,
+    transposition). Two puzzles are equivalent exactly when their canonical
+    forms match.
+
+    Rows are fixed greedily from the top; only the row/column orders that
+    tie for the smallest prefix are carried to the next row, so the full
+    3.4M-transform space is never enumerated. Puzzles with a unique solution
+    keep the tie sets small; near-empty grids do not."""
+    # state: (grid, rows used so far, column order, labels, next label)
+    states = []
+    best_row = None
+    for src in (grid, transpose(grid)):
+        for r in range(SIZE):
+            for cols in LINE_ORDERS:
+                labels = [0] * (SIZE + 1)
+                row, next_label = _relabel(src[r], cols, labels, 1)
+                if best_row is None or row < best_row:
+                    best_row = row
+                    states = []
+                if row == best_row:
+                    states.append((src, (r,), cols, labels, next_label))
+    prefix = list(best_row)
+
+    for k in range(1, SIZE):
+        next_states = []
+        best_row = None
+        for src, used, cols, labels, next_label in states:
+            if k % 3:
+                band = used[-1] // 3
+                options = [r for r in range(3 * band, 3 * band + 3) if r not in used]
+            else:
+                used_bands = {r // 3 for r in used}
+                options = [r for r in range(SIZE) if r // 3 not in used_bands]
+            for r in options:
+                new_labels = labels[:]
+                row, new_next = _relabel(src[r], cols, new_labels, next_label)
+                if best_row is None or row < best_row:
+                    best_row = row
+                    next_states = []
+                if row == best_row:
+                    next_states.append((src, used + (r,), cols, new_labels, new_next))
+        states = next_states
+        prefix.extend(best_row)
+    return "".join(str(v) for v in prefix)
+
+
+def iter_variants(seeds: Sequence[Grid], rng=random, max_misses: int = 1000) -> Iterator[Tuple[int, Transform, Grid]]:
+    """Yield (seed index, transform, variant) with every variant distinct.
+
+    Seeds with the same canonical form are used only once. Variants of
+    inequivalent seeds can never coincide, so duplicates are caught by
+    comparing the variant grids themselves and no variant is canonicalised."""
+    keys = set()
+    unique = []
+    for idx, seed in enumerate(seeds):
+        key = canonical_form(seed)
+        if key not in keys:
+            keys.add(key)
+            unique.append(idx)
+    if not unique:
+        return
+    seen = set()
+    misses = 0
+    i = 0
+    while misses < max_misses:
+        idx = unique[i % len(unique)]
+        i += 1
+        transform = random_transform(rng)
+        variant = apply_transform(seeds[idx], transform)
+        key = tuple(v for row in variant for v in row)
+        if key in seen:
+            misses += 1
+            continue
+        seen.add(key)
+        misses = 0
+        yield idx, transform, variant
+
+
+def expand_seeds(seeds: Sequence[Grid], count: int, rng=random) -> List[Grid]:
+    """Mint `count` distinct puzzles from verified seed puzzles. Every variant
+    keeps its seed's unique solution and difficulty."""
+    out = []
+    for _, _, variant in iter_variants(seeds, rng):
+        out.append(variant)
+        if len(out) >= count:
+            break
+    return out
@@ -0,0 +1,264 @@
+import json
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .sudoku_solver import BitmaskSolver
+
+SIZE = 9
+ALL_DIGITS = (1 << SIZE) - 1
+
+_cells = np.arange(SIZE * SIZE)
+_rows, _cols = _cells // SIZE, _cells % SIZE
+_boxes = 3 * (_rows // 3) + _cols // 3
+# (27, 9) cell indices of every row, column and box
+UNITS = np.array(
+    [np.flatnonzero(_rows == k) for k in range(SIZE)]
+    + [np.flatnonzero(_cols == k) for k in range(SIZE)]
+    + [np.flatnonzero(_boxes == k) for k in range(SIZE)]
+)
+# (81, 3) units of every cell
+CELL_UNITS = np.stack([_rows, SIZE + _cols, 2 * SIZE + _boxes], axis=1)
+DIGIT_BITS = (1 << np.arange(SIZE)).astype(np.int64)
+POPCOUNT = np.array([bin(m).count("1") for m in range(1 << SIZE)], dtype=np.uint8)
+# digit (1-9) of a single-bit mask; 0 elsewhere
+BIT_DIGIT = np.zeros(1 << SIZE, dtype=np.uint8)
+BIT_DIGIT[DIGIT_BITS] = np.arange(1, SIZE + 1)
+
+CHUNK = 4096
+
+Grids = Union[np.ndarray, Sequence]
+
+
+def as_array(grids: Grids) -> np.ndarray:
+    """(N, 9, 9) uint8 array from an array, a list of grids or a list of
+    81-character strings ('0' or '.' for empty cells)."""
+    if isinstance(grids, np.ndarray):
+        return grids.reshape(-1, SIZE, SIZE).astype(np.uint8, copy=False)
+    if len(grids) and isinstance(grids[0], str):
+        text = "".join(grids).replace(".", "0").encode("ascii")
+        return (np.frombuffer(text, dtype=np.uint8) - ord("0")).reshape(-1, SIZE, SIZE)
+    return np.asarray(grids, dtype=np.uint8).reshape(-1, SIZE, SIZE)
+
+
+def _bits(values: np.ndarray) -> np.ndarray:
+    """Digit bitmask of every cell; 0 for empty (or out of range) cells."""
+    return np.where((values >= 1) & (values <= SIZE), DIGIT_BITS[np.clip(values.astype(np.int64) - 1, 0, SIZE - 1)], 0)
+
+
+def validate_grids(grids: Grids) -> np.ndarray:
+    """(N,) bool: which grids are complete, valid solutions."""
+    flat = as_array(grids).reshape(-1, SIZE * SIZE)
+    bits = _bits(flat)
+    # nine single-bit masks OR to 511 only when they are all different
+    units = np.bitwise_or.reduce(bits[:, UNITS], axis=2)
+    return (units == ALL_DIGITS).all(axis=1) & (bits != 0).all(axis=1)
+
+
+def _consistent(flat: np.ndarray) -> np.ndarray:
+    """(N,) bool: no digit repeats in any unit (empty cells allowed)."""
+    bits = _bits(flat)[:, UNITS]
+    filled = (bits != 0).sum(axis=2)
+    return (POPCOUNT[np.bitwise_or.reduce(bits, axis=2)] == filled).all(axis=1)
+
+
+def _candidates(grids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Candidate mask of every empty cell (0 for filled cells) and the digit
+    mask already placed in every unit."""
+    used = np.bitwise_or.reduce(_bits(grids)[:, UNITS], axis=2)  # (m, 27)
+    taken = used[:, CELL_UNITS[:, 0]] | used[:, CELL_UNITS[:, 1]] | used[:, CELL_UNITS[:, 2]]
+    return np.where(grids == 0, ALL_DIGITS & ~taken, 0), used
+
+
+def propagate(puzzles: Grids) -> Tuple[np.ndarray, np.ndarray]:
+    """Apply naked and hidden singles to the whole batch at once until no
+    puzzle changes. Returns the filled-in grids and a status per puzzle:
+    0 contradiction (no solution), 1 solved, 2 still open."""
+    flat = as_array(puzzles).reshape(-1, SIZE * SIZE).copy()
+    status = np.where(_consistent(flat), 2, 0).astype(np.uint8)
+    idx = np.arange(len(flat))
+    while True:
+        active = status == 2
+        if not active.any():
+            break
+        grids = flat[active]
+        cands, used = _candidates(grids)
+        empty = grids == 0
+        dead = (empty & (cands == 0)).any(axis=1)
+
+        # digits seen once / more than once among the candidates of each unit
+        unit_cands = cands[:, UNITS]  # (m, 27, 9)
+        once = np.zeros_like(used)
+        twice = np.zeros_like(used)
+        for k in range(SIZE):
+            twice |= once & unit_cands[:, :, k]
+            once |= unit_cands[:, :, k]
+        # a digit missing from a unit must still have somewhere to go
+        dead |= ((once | used) != ALL_DIGITS).any(axis=1)
+        hidden = once & ~twice
+        cell_hidden = cands & (hidden[:, CELL_UNITS[:, 0]] | hidden[:, CELL_UNITS[:, 1]] | hidden[:, CELL_UNITS[:, 2]])
+        # one cell cannot be the only place for two digits
+        dead |= (POPCOUNT[cell_hidden] > 1).any(axis=1)
+
+        forced = np.where(POPCOUNT[cands] == 1, cands, cell_hidden)
+        new = BIT_DIGIT[forced]
+
+        progressed = (new != 0).any(axis=1) & ~dead
+        grids = np.where(new != 0, new, grids)
+        rows = idx[active]
+        flat[rows[progressed]] = grids[progressed]
+        done = ~(grids == 0).any(axis=1)
+        status[rows[dead]] = 0
+        stalled = ~dead & ~progressed
+        status[rows[stalled & done]] = 1
+        status[rows[stalled & ~done]] = 3  # open, parked below
+        # two deductions may have claimed one cell or one digit; re-check
+        clash = progressed & ~_consistent(grids)
+        status[rows[clash]] = 0
+    status[status == 3] = 2
+    status[(status == 1) & ~validate_grids(flat)] = 0
+    return flat.reshape(-1, SIZE, SIZE), status
+
+
+def _split(grids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Branch every open grid on its empty cell with the fewest candidates:
+    one child per candidate digit. Returns the children and the index of
+    the grid each came from."""
+    cands, _ = _candidates(grids)
+    counts = np.where(grids == 0, POPCOUNT[cands], SIZE + 1)
+    cell = counts.argmin(axis=1)
+    mask = cands[np.arange(len(grids)), cell]
+    parent, digit = np.nonzero((mask[:, None] & DIGIT_BITS) != 0)
+    children = grids[parent]
+    children[np.arange(len(parent)), cell[parent]] = digit + 1
+    return children, parent
+
+
+def _solve_chunk(array: np.ndarray, max_splits: int, max_branches: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(array)
+    solutions = np.zeros((n, SIZE * SIZE), dtype=np.uint8)
+    counts = np.zeros(n, dtype=np.uint8)
+    frontier = array.reshape(n, SIZE * SIZE)
+    owner = np.arange(n)
+    scalar = []
+    for split in range(max_splits + 1):
+        grids, status = propagate(frontier)
+        grids = grids.reshape(-1, SIZE * SIZE)
+        solved = np.flatnonzero(status == 1)
+        # branches partition the solution space, so their counts add up
+        np.add.at(counts, owner[solved], 1)
+        solutions[owner[solved]] = grids[solved]
+        np.minimum(counts, 2, out=counts)
+        open_ = np.flatnonzero((status == 2) & (counts[owner] < 2))
+        if not len(open_) or split == max_splits:
+            scalar.append((grids[open_], owner[open_]))
+            break
+        # puzzles with many open branches (typically many solutions) stop
+        # branching here instead of flooding the batch
+        crowded = np.bincount(owner[open_], minlength=n)[owner[open_]] > max_branches
+        scalar.append((grids[open_[crowded]], owner[open_[crowded]]))
+        frontier, parent = _split(grids[open_[~crowded]])
+        owner = owner[open_[~crowded]][parent]
+    for grids, owners in scalar:
+        for grid, k in zip(grids, owners):
+            if counts[k] >= 2:
+                continue
+            solver = BitmaskSolver(grid.reshape(SIZE, SIZE).tolist())
+            found = solver.count(2 - int(counts[k]))
+            if found:
+                counts[k] += found
+                solutions[k] = solver.solution
+    return solutions, counts
+
+
+def solve_batch(
+    puzzles: Grids,
+    chunk: int = CHUNK,
+    max_splits: int = 12,
+    max_branches: int = 64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve a batch of 9x9 puzzles. Returns (solutions, counts): counts are
+    0, 1 or 2 (two or more) and solutions hold a solution, zeros where there
+    is none. Singles are applied to the whole batch; puzzles they leave open
+    branch on their most constrained cell, up to `max_splits` times and
+    `max_branches` open branches per puzzle, and only the branches still
+    open after that go to the scalar bitmask solver."""
+    array = as_array(puzzles)
+    solutions = np.zeros((len(array), SIZE * SIZE), dtype=np.uint8)
+    counts = np.zeros(len(array), dtype=np.uint8)
+    for start in range(0, len(array), chunk):
+        part = slice(start, start + chunk)
+        solutions[part], counts[part] = _solve_chunk(array[part], max_splits, max_branches)
+    solutions[counts == 0] = 0
+    return solutions.reshape(-1, SIZE, SIZE), counts
+
+
+@dataclass
+class BatchReport:
+    counts: np.ndarray  # 0, 1 or 2+ solutions per puzzle
+    solution_ok: Optional[np.ndarray]  # stored solution is the unique solution
+
+    @property
+    def unique(self) -> int:
+        return int((self.counts == 1).sum())
+
+    @property
+    def multiple(self) -> int:
+        return int((self.counts == 2).sum())
+
+    @property
+    def unsolvable(self) -> int:
+        return int((self.counts == 0).sum())
+
+    @property
+    def bad_solutions(self) -> int:
+        return 0 if self.solution_ok is None else int((~self.solution_ok).sum())
+
+    def failures(self) -> List[int]:
+        bad = self.counts != 1
+        if self.solution_ok is not None:
+            bad |= ~self.solution_ok
+        return np.flatnonzero(bad).tolist()
+
+
+def verify_batch(puzzles: Grids, solutions: Optional[Grids] = None, chunk: int = CHUNK) -> BatchReport:
+    """Check that every puzzle has exactly one solution and, when stored
+    solutions are given, that each is a valid grid that agrees with its
+    puzzle's givens and with the solver."""
+    array = as_array(puzzles)
+    solved, counts = solve_batch(array, chunk)
+    solution_ok = None
+    if solutions is not None:
+        stored = as_array(solutions)
+        solution_ok = (
+            validate_grids(stored)
+            & ((array == 0) | (array == stored)).all(axis=(1, 2))
+            & ((counts != 1) | (solved == stored).all(axis=(1, 2)))
+        )
+    return BatchReport(counts, solution_ok)
+
+
+def read_jsonl(path: str) -> Tuple[List[str], List, Optional[List]]:
+    """Labels, puzzles and solutions from a JSONL file with one object per
+    line: {"puzzle": ..., "solution": ...}, each an 81-character string or a
+    9x9 list; "id" is used as the label when present. Solutions are only
+    returned when every line has one."""
+    labels, puzzles, solutions = [], [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            labels.append(str(item.get("id", f"line {line_no}")))
+            puzzles.append(_flat_text(item["puzzle"]))
+            solutions.append(_flat_text(item["solution"]) if item.get("solution") else None)
+    if any(solution is None for solution in solutions):
+        return labels, puzzles, None
+    return labels, puzzles, solutions
+
+
+def _flat_text(grid) -> str:
+    if isinstance(grid, str):
+        return grid
+    return "".join(str(v) for row in grid for v in row)
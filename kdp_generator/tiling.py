@@ -0,0 +1,142 @@
+import random
+from math import ceil, cos, pi, sin, sqrt
+from typing import List
+
+import numpy as np
+from reportlab.pdfbase.pdfdoc import xObjectName
+
+from .pdf_utils import arc_ops, begin_form, circle_ops, polyline_ops
+
+# tile sides in points; the smallest cover a letter page with 2000-4000 tiles
+TRUCHET_SIZES = (12, 18, 24, 36)
+STAR_SIZES = (36, 48, 60, 72)
+HEX_SIDES = (7, 10, 14, 20)
+# half-width of a banded Truchet path, as a share of half the tile
+TRUCHET_BAND = 0.3
+
+
+def place_tiles(canvas, name: str, offsets):
+    """Draw form `name` translated to every (x, y) row of `offsets`. The
+    first copy goes through canvas.doForm, which lists the form among the
+    page's resources; the others are `q cm Do Q` groups formatted in one
+    call, so thousands of tiles cost one string operation."""
+    offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+    if not len(offsets):
+        return
+    canvas.saveState()
+    canvas.translate(*offsets[0])
+    canvas.doForm(name)
+    canvas.restoreState()
+    if len(offsets) > 1:
+        place = "q 1 0 0 1 %.2f %.2f cm /" + xObjectName(name) + " Do Q"
+        canvas.addLiteral("\n".join([place] * (len(offsets) - 1)) % tuple(offsets[1:].ravel().tolist()))
+
+
+def _stroke_tile(canvas, kind: str, extent: float, ops: List[str], line_width: float) -> str:
+    name = begin_form(canvas, kind, extent)
+    canvas.setLineWidth(line_width)
+    canvas.setLineJoin(1)
+    canvas.addLiteral("n " + " ".join(ops) + " S")
+    canvas.endForm()
+    return name
+
+
+def _square_centres(x0: float, y0: float, width: float, height: float, side: float) -> np.ndarray:
+    cols, rows = ceil(width / side), ceil(height / side)
+    xs, ys = np.meshgrid(x0 + side * (np.arange(cols) + 0.5), y0 + side * (np.arange(rows) + 0.5))
+    return np.stack([xs.ravel(), ys.ravel()], axis=-1)
+
+
+def _tiled_area(canvas, page_width: float, page_height: float, margin: float):
+    """Clip to the page inside `margin` (the caller restores the state)
+    and return it as (x0, y0, width, height)."""
+    x0, y0 = margin, margin
+    width, height = page_width - 2 * margin, page_height - 2 * margin
+    canvas.saveState()
+    clip = canvas.beginPath()
+    clip.rect(x0, y0, width, height)
+    canvas.clipPath(clip, stroke=0, fill=0)
+    return x0, y0, width, height
+
+
+def _frame(canvas, x0: float, y0: float, width: float, height: float):
+    canvas.restoreState()
+    canvas.setLineWidth(1.5)
+    canvas.rect(x0, y0, width, height, stroke=1, fill=0)
+
+
+def draw_truchet(canvas, page_width: float, page_height: float, margin: float):
+    """Smith's Truchet tiles: quarter arcs joining the edge midpoints round
+    opposite corners, in one of two orientations per cell, sometimes as
+    bands. Two tile forms however many cells."""
+    side = random.choice(TRUCHET_SIZES)
+    h = side / 2
+    radii = (h,) if random.random() < 0.5 else (h * (1 - TRUCHET_BAND), h * (1 + TRUCHET_BAND))
+    rng = np.random.default_rng(random.getrandbits(32))
+
+    x0, y0, width, height = _tiled_area(canvas, page_width, page_height, margin)
+    centres = _square_centres(x0, y0, width, height, side)
+    turned = rng.integers(0, 2, len(centres)).astype(bool)
+    for k, corners in enumerate((((-h, -h, 0.0), (h, h, pi)), ((h, -h, pi / 2), (-h, h, 3 * pi / 2)))):
+        ops = [arc_ops(r, a, a + pi / 2, cx, cy) for cx, cy, a in corners for r in radii]
+        name = _stroke_tile(canvas, f"Truchet{k}_", side, ops, max(0.6, side / 24))
+        place_tiles(canvas, name, centres[turned == bool(k)])
+    _frame(canvas, x0, y0, width, height)
+
+
+def draw_star_tiling(canvas, page_width: float, page_height: float, margin: float):
+    """Islamic star-and-cross pattern: an eight-pointed star per square
+    tile whose points meet its neighbours', leaving crosses between them,
+    with an optional octagon inside and diamonds round the corners. One
+    tile form."""
+    side = random.choice(STAR_SIZES)
+    h = side / 2
+    inner = h * cos(pi / 4) / cos(pi / 8)
+    star = [[(h if k % 2 == 0 else inner) * cos(k * pi / 8), (h if k % 2 == 0 else inner) * sin(k * pi / 8)] for k in range(17)]
+    ops = [polyline_ops([star])]
+    if random.random() < 0.7:
+        octagon = [[0.45 * h * cos((k + 0.5) * pi / 4), 0.45 * h * sin((k + 0.5) * pi / 4)] for k in range(9)]
+        ops.append(polyline_ops([octagon]))
+    if random.random() < 0.5:
+        c = 0.22 * h
+        ops.append(polyline_ops([[[sx * (h - c), sy * h], [sx * h, sy * (h - c)]] for sx in (-1, 1) for sy in (-1, 1)]))
+    if random.random() < 0.5:
+        ops.append(circle_ops(0.0, 0.0, 0.2 * h))
+
+    x0, y0, width, height = _tiled_area(canvas, page_width, page_height, margin)
+    name = _stroke_tile(canvas, "Star", side, ops, max(0.8, side / 48))
+    place_tiles(canvas, name, _square_centres(x0, y0, width, height, side))
+    _frame(canvas, x0, y0, width, height)
+
+
+def draw_hex_tiling(canvas, page_width: float, page_height: float, margin: float):
+    """Flat-topped hexagons, each split into a tumbling block (three
+    rhombi, two orientations at random), filled with a hexagram, or ringed
+    round a circle. At most two tile forms."""
+    a = random.choice(HEX_SIDES)
+    style = random.choice(["blocks", "hexagram", "circle"])
+    rng = np.random.default_rng(random.getrandbits(32))
+    corner = [[a * cos(k * pi / 3), a * sin(k * pi / 3)] for k in range(7)]
+
+    variants = []
+    if style == "blocks":
+        for first in (0, 1):
+            variants.append([polyline_ops([corner]), polyline_ops([[[0.0, 0.0], corner[k]] for k in range(first, 6, 2)])])
+    elif style == "hexagram":
+        tri = [[[0.8 * a * cos((k + 0.5 + j) * pi / 3), 0.8 * a * sin((k + 0.5 + j) * pi / 3)] for k in (0, 2, 4, 0)] for j in (0, 1)]
+        variants.append([polyline_ops([corner]), polyline_ops(tri)])
+    else:
+        variants.append([polyline_ops([corner]), circle_ops(0.0, 0.0, 0.55 * a), circle_ops(0.0, 0.0, 0.25 * a)])
+
+    x0, y0, width, height = _tiled_area(canvas, page_width, page_height, margin)
+    cols = ceil(width / (1.5 * a)) + 1
+    rows = ceil(height / (sqrt(3) * a)) + 1
+    i, j = np.meshgrid(np.arange(cols), np.arange(rows))
+    xs = x0 + 1.5 * a * i
+    ys = y0 + sqrt(3) * a * (j + 0.5 * (i % 2))
+    centres = np.stack([xs.ravel(), ys.ravel()], axis=-1)
+    pick = rng.integers(0, len(variants), len(centres))
+    for k, ops in enumerate(variants):
+        name = _stroke_tile(canvas, f"Hex{k}_", a + 1, ops, max(0.5, a / 16))
+        place_tiles(canvas, name, centres[pick == k])
+    _frame(canvas, x0, y0, width, height)
@@ -0,0 +1,104 @@
+import random
+from typing import Dict, List, Sequence
+
+WILDCARDS = "?."
+
+
+def lowest_bit(mask: int) -> int:
+    return (mask & -mask).bit_length() - 1
+
+
+def bitset(ids: Sequence[int]) -> int:
+    """Int with the bits in `ids` set."""
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PatternIndex:
+    """Bitsets (Python ints) of word ids per (length, position, letter).
+    Ids count within one length group. The words fitting a slot pattern
+    such as "?A??E" are the AND of one bitset per fixed letter, so a lookup
+    costs a few big-int operations instead of a scan of the word list.
+
+    The bitsets of a (length, position) column are built the first time a
+    pattern needs them, so creating an index over a large compiled word
+    list costs nothing up front."""
+
+    def __init__(self, groups: Dict[int, Sequence[str]]):
+        self.groups = groups
+        self._columns: Dict[tuple, Dict[str, int]] = {}
+
+    @classmethod
+    def from_words(cls, words: Sequence[str]) -> "PatternIndex":
+        groups: Dict[int, List[str]] = {}
+        for word in words:
+            groups.setdefault(len(word), []).append(word)
+        return cls(groups)
+
+    @property
+    def lengths(self) -> List[int]:
+        return sorted(self.groups)
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self.groups.values())
+
+    def word(self, length: int, word_id: int) -> str:
+        return self.groups[length][word_id]
+
+    def _column(self, length: int, pos: int) -> Dict[str, int]:
+        masks = self._columns.get((length, pos))
+        if masks is None:
+            group = self.groups[length]
+            ids: Dict = {}
+            if hasattr(group, "column"):
+                # compiled groups hand out a whole column of letter codes
+                for i, code in enumerate(group.column(pos)):
+                    ids.setdefault(code, []).append(i)
+                masks = {group.letter(code): bitset(v) for code, v in ids.items()}
+            else:
+                for i, word in enumerate(group):
+                    ids.setdefault(word[pos], []).append(i)
+                masks = {ch: bitset(v) for ch, v in ids.items()}
+            self._columns[(length, pos)] = masks
+        return masks
+
+    def matches(self, pattern: str, available: int = -1) -> int:
+        """Bitset of the `available` words that fit `pattern`, where "?" or
+        "." stands for any letter. Both bitsets index the words of length
+        len(pattern)."""
+        n = len(pattern)
+        if n not in self.groups:
+            return 0
+        mask = ((1 << len(self.groups[n])) - 1) & available
+        for pos, ch in enumerate(pattern):
+            if not mask:
+                break
+            if ch not in WILDCARDS:
+                mask &= self._column(n, pos).get(ch, 0)
+        return mask
+
+    def letter_masks(self, length: int, pos: int) -> Dict[str, int]:
+        """Letter -> bitset of the words of `length` with that letter at `pos`."""
+        return self._column(length, pos)
+
+    def words_matching(self, pattern: str, available: int = -1) -> List[str]:
+        group = self.groups.get(len(pattern), [])
+        return [group[i] for i in iter_bits(self.matches(pattern, available))]
+
+    def pick(self, mask: int, length: int, rng=random) -> int:
+        """Id of a random word in `mask` (which must be non-empty): the first
+        set bit at or after a random start, wrapping around."""
+        start = rng.randrange(len(self.groups[length]))
+        high = mask >> start
+        return start + lowest_bit(high) if high else lowest_bit(mask)
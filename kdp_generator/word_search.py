@@ -0,0 +1,486 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from reportlab.lib.colors import Color
+
+from .pdf_utils import (
+    DEFAULT_MARGIN,
+    LINE_SPACING,
+    create_canvas,
+    draw_footer_page_number,
+    draw_grid_label,
+    draw_page_title,
+    draw_text_columns,
+    grid_slots,
+    register_body_font,
+    size_to_points,
+    text_width,
+)
+from .sudoku_batch import derive_seed
+from .word_search_scan import GridScanner
+from .wordlist import WORDLIST_DIR, get_wordlist, normalize_word, source_path
+
+Cell = Tuple[int, int]
+Direction = Tuple[int, int]
+
+MIN_SIZE = 5
+MAX_SIZE = 60
+MIN_WORD = 3
+# longest word sampled from a language list
+MAX_WORD = 12
+DIRECTIONS: Dict[str, Tuple[Direction, ...]] = {
+    "easy": ((0, 1), (1, 0)),
+    "medium": ((0, 1), (1, 0), (1, 1), (-1, 1)),
+    "hard": ((0, 1), (1, 0), (1, 1), (-1, 1), (0, -1), (-1, 0), (-1, -1), (1, -1)),
+}
+BLOCKLIST_SUFFIX = "_blocklist.txt"
+# grid scans (each followed by a refill of the offending free cells), then
+# whole placements, tried before giving up on a clean grid
+MAX_REFILLS = 20
+MAX_BUILDS = 20
+# one scattered seed word per this many rows of grid
+SEED_SPREAD = 5
+# word list sizes tried from the largest down until grid and list share a page
+WORD_FONT_SIZES = (12, 11, 10, 9, 8, 7)
+# answer key grids per page (columns, rows), most first; the first layout
+# whose cells are at least KEY_CELL points wide is used
+KEY_LAYOUTS = ((2, 3), (3, 2), (2, 2), (1, 2), (1, 1))
+KEY_CELL = 5
+KEY_HIGHLIGHT = Color(0.78, 0.78, 0.78)
+
+
+@dataclass
+class WordSearch:
+    grid: List[List[str]]
+    # placed words in placement order -> (start cell, direction)
+    placements: Dict[str, Tuple[Cell, Direction]] = field(default_factory=dict)
+
+    @property
+    def words(self) -> List[str]:
+        return list(self.placements)
+
+    def cells(self, word: str) -> List[Cell]:
+        (r, c), (dr, dc) = self.placements[word]
+        return [(r + dr * i, c + dc * i) for i in range(len(word))]
+
+
+@lru_cache(maxsize=None)
+def placements(size: int, length: int, direction: Direction) -> Dict[Cell, Tuple[int, ...]]:
+    """Start cell -> flat cell indices of every in-bounds placement of a
+    `length` letter word in `direction` on a `size` x `size` grid, computed
+    once per process for each grid size, length and direction."""
+    dr, dc = direction
+    span = length - 1
+    rows = range(max(0, -dr * span), size - max(0, dr * span))
+    cols = range(max(0, -dc * span), size - max(0, dc * span))
+    return {
+        (r, c): tuple((r + dr * i) * size + c + dc * i for i in range(length))
+        for r in rows
+        for c in cols
+    }
+
+
+@lru_cache(maxsize=None)
+def _placement_list(size: int, length: int, direction: Direction) -> Tuple[Tuple[Cell, Tuple[int, ...]], ...]:
+    return tuple(placements(size, length, direction).items())
+
+
+class WordSearchBuilder:
+    """Places words on a square grid, each where it shares the most letters
+    with the words already placed. Overlapping placements are found from
+    the cells holding each of the word's letters, so a word costs a few
+    lookups per matching cell instead of a scan of every start and
+    direction. The first size // SEED_SPREAD words, and any word that can
+    cross nothing, go to random free placements, so the crossing clusters
+    grow from several points instead of one."""
+
+    def __init__(self, size: int, directions: Sequence[Direction] = DIRECTIONS["hard"], rng=random):
+        self.size = size
+        self.directions = tuple(directions)
+        self.rng = rng
+        self.cells = ['.'] * (size * size)
+        self.by_letter: Dict[str, List[int]] = {}
+        self.placements: Dict[str, Tuple[Cell, Direction]] = {}
+
+    def _overlap(self, word: str, cells: Tuple[int, ...]) -> int:
+        """Letters `word` would share with the grid there, or -1 if it clashes."""
+        shared = 0
+        for ch, cell in zip(word, cells):
+            found = self.cells[cell]
+            if found == ch:
+                shared += 1
+            elif found != '.':
+                return -1
+        return shared
+
+    def _free_placement(self, word: str):
+        directions = list(self.directions)
+        self.rng.shuffle(directions)
+        for direction in directions:
+            options = _placement_list(self.size, len(word), direction)
+            if not options:
+                continue
+            offset = self.rng.randrange(len(options))
+            for k in range(len(options)):
+                start, cells = options[(offset + k) % len(options)]
+                if 0 <= self._overlap(word, cells) < len(word):
+                    return start, direction, cells
+        return None
+
+    def place(self, word: str) -> bool:
+        n = len(word)
+        if n > self.size or word in self.placements:
+            return False
+        best: Dict[Tuple[Cell, Direction], Tuple[int, ...]] = {}
+        best_shared = 1
+        seeding = len(self.placements) < max(1, self.size // SEED_SPREAD)
+        for i, ch in enumerate(word if not seeding else ()):
+            for cell in self.by_letter.get(ch, ()):
+                r, c = divmod(cell, self.size)
+                for direction in self.directions:
+                    start = (r - direction[0] * i, c - direction[1] * i)
+                    cells = placements(self.size, n, direction).get(start)
+                    if cells is None:
+                        continue
+                    shared = self._overlap(word, cells)
+                    # a word whose every letter is already there would be hidden twice
+                    if shared < best_shared or shared == n:
+                        continue
+                    if shared > best_shared:
+                        best.clear()
+                        best_shared = shared
+                    best[(start, direction)] = cells
+        if best:
+            (start, direction), cells = self.rng.choice(list(best.items()))
+        else:
+            found = self._free_placement(word)
+            if found is None:
+                return False
+            start, direction, cells = found
+        for ch, cell in zip(word, cells):
+            if self.cells[cell] == '.':
+                self.cells[cell] = ch
+                self.by_letter.setdefault(ch, []).append(cell)
+        self.placements[word] = (start, direction)
+        return True
+
+    def place_words(self, words: Sequence[str]) -> Dict[str, Tuple[Cell, Direction]]:
+        """Place `words` in the given order; returns word -> (start cell,
+        direction) of those that found room."""
+        return {w: self.placements[w] for w in words if self.place(w)}
+
+    def _refill(self, cells: List[str], pool: str, scanner: GridScanner) -> Optional[List[str]]:
+        """Re-draw the free cells of every unwanted occurrence (a placed word
+        read a second time, or a blocked word outside a placed word) until a
+        scan finds none. None when one lies on placed letters only, or after
+        MAX_REFILLS scans."""
+        size = self.size
+        spans: Dict[Tuple[int, int], str] = {}
+        owners: Dict[int, set] = {}
+        for k, (word, ((r, c), (dr, dc))) in enumerate(self.placements.items()):
+            first = r * size + c
+            last = first + (dr * size + dc) * (len(word) - 1)
+            spans[(min(first, last), max(first, last))] = word
+            for i in range(len(word)):
+                owners.setdefault(first + (dr * size + dc) * i, set()).add(k)
+        for _ in range(MAX_REFILLS):
+            redo = set()
+            for word, first, last in scanner.scan(cells, size):
+                # the placed word itself, read either way round
+                if spans.get((min(first, last), max(first, last))) == word:
+                    continue
+                # a blocked word inside a placed word (ASS in CLASS) is fine
+                if word not in self.placements and owners.get(first, set()) & owners.get(last, set()):
+                    continue
+                step = (last - first) // (len(word) - 1)
+                free = [first + step * i for i in range(len(word)) if self.cells[first + step * i] == '.']
+                if not free:
+                    return None
+                redo.update(free)
+            if not redo:
+                return cells
+            for cell in sorted(redo):
+                cells[cell] = self.rng.choice(pool)
+        return None
+
+    def puzzle(self, blocklist: Sequence[str] = ()) -> Optional[WordSearch]:
+        """The grid with its free cells filled from the letters of the placed
+        words, so decoys follow the language's letter mix (and its
+        diacritics) rather than plain A-Z. The filled grid is scanned so
+        that every placed word reads exactly once and no `blocklist` word
+        reads anywhere but inside a placed word; None when refilling free
+        cells cannot get there."""
+        pool = ''.join(self.placements) or 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+        cells = [ch if ch != '.' else self.rng.choice(pool) for ch in self.cells]
+        cells = self._refill(cells, pool, GridScanner(self.placements, blocklist))
+        if cells is None:
+            return None
+        grid = [cells[r * self.size:(r + 1) * self.size] for r in range(self.size)]
+        return WordSearch(grid, dict(self.placements))
+
+
+def build_word_search(
+    words: Sequence[str],
+    size: int = 15,
+    difficulty: str = "hard",
+    rng=random,
+    blocklist: Sequence[str] = (),
+) -> WordSearch:
+    """Word search of the `words` that fit, longest first. `difficulty`
+    picks the directions words may run in (see DIRECTIONS). Words inside
+    another word (either way round) and blocked words are left out, and
+    the placement is redone when the filled grid cannot be cleaned (see
+    WordSearchBuilder.puzzle); RuntimeError after MAX_BUILDS tries."""
+    if size < MIN_SIZE or size > MAX_SIZE:
+        raise ValueError(f"Parameter 'size' must be between {MIN_SIZE} and {MAX_SIZE}.")
+    blocked = {normalize_word(w) for w in blocklist} - {""}
+    chosen = {normalize_word(w) for w in words} - blocked
+    chosen = {w for w in chosen if MIN_WORD <= len(w) <= size}
+    chosen = {w for w in chosen if not any(w != other and (w in other or w[::-1] in other) for other in chosen)}
+    order = sorted(chosen, key=lambda w: (-len(w), w))
+    for _ in range(MAX_BUILDS):
+        builder = WordSearchBuilder(size, DIRECTIONS[difficulty], rng)
+        builder.place_words(order)
+        puzzle = builder.puzzle(tuple(blocked))
+        if puzzle is not None:
+            return puzzle
+    raise RuntimeError(
+        f"Could not build a {size}x{size} word search without repeated or blocked words in {MAX_BUILDS} tries;"
+        " try fewer words or a larger grid."
+    )
+
+
+def words_per_puzzle(size: int) -> int:
+    """Default word count: about one word per 20 cells."""
+    return max(10, size * size // 20)
+
+
+def load_theme(path: str) -> List[str]:
+    """Words of a themed list, one per line; blank lines and lines starting
+    with '#' are skipped."""
+    with open(path, encoding="utf-8") as f:
+        words = [normalize_word(line) for line in f if line.strip() and not line.lstrip().startswith("#")]
+    return list(dict.fromkeys(w for w in words if w))
+
+
+def blocklist_path(language: str) -> str:
+    """`<language>_blocklist.txt` beside the word lists, or the bundled one."""
+    name = os.path.splitext(os.path.basename(source_path(language)))[0] + BLOCKLIST_SUFFIX
+    path = os.path.join(WORDLIST_DIR, name)
+    return path if os.path.exists(path) else os.path.join(os.path.dirname(__file__), "wordlists", name)
+
+
+@lru_cache(maxsize=None)
+def get_blocklist(language: str) -> Tuple[str, ...]:
+    """Words that must never show up in a grid of `language` (same format
+    as a themed list); empty when there is no blocklist file."""
+    path = blocklist_path(language)
+    return tuple(load_theme(path)) if os.path.exists(path) else ()
+
+
+def choose_words(
+    size: int,
+    count: int,
+    language: str = "en",
+    theme: Optional[Sequence[str]] = None,
+    rng=random,
+) -> List[str]:
+    """`count` distinct words that fit a `size` grid, from `theme` when
+    given, otherwise from the language's word list."""
+    if theme:
+        pool = [w for w in theme if MIN_WORD <= len(w) <= size]
+        return rng.sample(pool, min(count, len(pool)))
+    return get_wordlist(language).sample(count, MIN_WORD, min(size, MAX_WORD), rng=rng)
+
+
+def make_word_search(
+    index: int,
+    base_seed: int,
+    size: int = 15,
+    language: str = "en",
+    theme: Optional[Sequence[str]] = None,
+    count: Optional[int] = None,
+    difficulty: str = "hard",
+    blocklist: Sequence[str] = (),
+) -> WordSearch:
+    """Puzzle `index` of a batch; runs in a worker process."""
+    rng = random.Random(derive_seed(base_seed, index))
+    words = choose_words(size, count or words_per_puzzle(size), language, theme, rng)
+    return build_word_search(words, size, difficulty, rng, blocklist)
+
+
+def generate_word_search_book(
+    count: int,
+    size: int = 15,
+    language: str = "en",
+    theme: Optional[Sequence[str]] = None,
+    words: Optional[int] = None,
+    difficulty: str = "hard",
+    jobs: int = 1,
+    base_seed: Optional[int] = None,
+    blocklist: Optional[Sequence[str]] = None,
+) -> List[WordSearch]:
+    """`count` puzzles over `jobs` processes. Each puzzle draws its own
+    words (`words` of them, default words_per_puzzle) from `theme` or the
+    language list and is kept clear of `blocklist` (default: the
+    language's, see get_blocklist); the book depends only on `base_seed`,
+    never on `jobs`, and puzzles whose worker fails are rebuilt in this
+    process."""
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 63)
+    if blocklist is None:
+        blocklist = get_blocklist(language)
+    args = (size, language, list(theme) if theme else None, words, difficulty, tuple(blocklist))
+    if jobs <= 1 or count <= 1:
+        return [make_word_search(i, base_seed, *args) for i in range(count)]
+
+    results: List[Optional[WordSearch]] = [None] * count
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(make_word_search, i, base_seed, *args) for i in range(count)]
+        for i, future in enumerate(futures):
+            try:
+                results[i] = future.result()
+            except Exception:
+                results[i] = None
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = make_word_search(i, base_seed, *args)
+    return results
+
+
+def _draw_letters(canvas, grid: List[List[str]], x0: float, y0: float, side: float, font: str):
+    """Letters of `grid` centred in the square of side `side` at (x0, y0),
+    inside a thin frame, as one text object."""
+    n = len(grid)
+    cell = side / n
+    canvas.setLineWidth(0.75)
+    canvas.rect(x0, y0, side, side, stroke=1, fill=0)
+    font_size = cell * 0.62
+    text = canvas.beginText()
+    text.setFont(font, font_size)
+    for r in range(n):
+        for c in range(n):
+            ch = grid[r][c]
+            w = text_width(ch, font, font_size)
+            text.setTextOrigin(x0 + c * cell + (cell - w) / 2, y0 + (n - 1 - r) * cell + cell / 2 - font_size * 0.35)
+            text.textOut(ch)
+    canvas.drawText(text)
+
+
+def _draw_highlights(canvas, puzzle: WordSearch, x0: float, y0: float, side: float):
+    """A round-capped band over every hidden word, all in one path, so a
+    key grid costs one path object however many words it has."""
+    n = len(puzzle.grid)
+    cell = side / n
+    path = canvas.beginPath()
+    for word, ((r, c), (dr, dc)) in puzzle.placements.items():
+        span = len(word) - 1
+        path.moveTo(x0 + (c + 0.5) * cell, y0 + (n - r - 0.5) * cell)
+        path.lineTo(x0 + (c + dc * span + 0.5) * cell, y0 + (n - r - dr * span - 0.5) * cell)
+    canvas.saveState()
+    canvas.setStrokeColor(KEY_HIGHLIGHT)
+    canvas.setLineWidth(cell * 0.8)
+    canvas.setLineCap(1)
+    canvas.drawPath(path, stroke=1, fill=0)
+    canvas.restoreState()
+
+
+def key_layout(page_width: float, page_height: float, margin: float, n: int):
+    """Answer key slots for `n` x `n` grids: the KEY_LAYOUTS entry with the
+    most grids whose cells stay KEY_CELL points wide (4-6 grids on a
+    letter page up to about 40x40), else the roomiest."""
+    for cols, rows in KEY_LAYOUTS:
+        slots, size = grid_slots(page_width, page_height, margin, cols, rows, 0.92)
+        if size / n >= KEY_CELL:
+            break
+    return slots, size
+
+
+def draw_word_search_keys(
+    canvas,
+    puzzles: Sequence[WordSearch],
+    page_width: float,
+    page_height: float,
+    margin: float,
+    page_num: int,
+    font: str = "Helvetica",
+    first_number: int = 1,
+) -> int:
+    """Solution pages: each grid with its hidden words highlighted,
+    labelled "#k" from `first_number`. Returns the next page number."""
+    n = max(len(p.grid) for p in puzzles)
+    slots, size = key_layout(page_width, page_height, margin, n)
+    title = "Solutions" if len(puzzles) > 1 else "Solution"
+    for start in range(0, len(puzzles), len(slots)):
+        draw_page_title(canvas, page_width, page_height, title)
+        for k, (x0, y0) in enumerate(slots[:len(puzzles) - start]):
+            puzzle = puzzles[start + k]
+            draw_grid_label(canvas, f"#{first_number + start + k}", x0, y0, size)
+            _draw_highlights(canvas, puzzle, x0, y0, size)
+            _draw_letters(canvas, puzzle.grid, x0, y0, size, font)
+        draw_footer_page_number(canvas, page_width, margin, page_num)
+        canvas.showPage()
+        page_num += 1
+    return page_num
+
+
+def draw_word_search_page(
+    canvas,
+    puzzle: WordSearch,
+    title: str,
+    page_width: float,
+    page_height: float,
+    margin: float,
+    page_num: int,
+    font: str = "Helvetica",
+):
+    """One titled puzzle page: the grid on top and its alphabetical word
+    list in columns below, at the largest of WORD_FONT_SIZES that leaves
+    the grid at least 60% of the page width."""
+    inner_w = page_width - 2 * margin
+    top = page_height - margin - 10
+    words = sorted(puzzle.words)
+    draw_page_title(canvas, page_width, page_height, title)
+    for size in WORD_FONT_SIZES:
+        col_w = max((text_width(w, font, size) for w in words), default=0) + 2 * size
+        cols = max(1, int(inner_w // col_w))
+        list_h = -(-len(words) // cols) * size * LINE_SPACING + 16 if words else 0
+        side = min(inner_w, top - margin - list_h)
+        if side >= inner_w * 0.6:
+            break
+    letter_font = "Helvetica-Bold" if font == "Helvetica" else font
+    _draw_letters(canvas, puzzle.grid, (page_width - side) / 2, top - side, side, letter_font)
+    lines = [(w, False, 0.0) for w in words]
+    draw_text_columns(canvas, lines, margin, top - side - 16, margin, cols, inner_w / cols, size, font)
+    draw_footer_page_number(canvas, page_width, margin, page_num)
+    canvas.showPage()
+
+
+def render_word_search_book_pdf(
+    puzzles: List[WordSearch],
+    filename: str,
+    trim_size: str = "8.5x11",
+    answer_key: bool = True,
+    body_font_path: Optional[str] = None,
+):
+    """One titled puzzle per page, each with its own word list, then an
+    answer key of small grids with the hidden words highlighted, 4-6 per
+    page (see key_layout). `body_font_path` (a TTF) sets letters and word
+    lists, e.g. for Polish letters."""
+    canvas = create_canvas(filename, trim_size)
+    page_width, page_height = size_to_points(trim_size)
+    margin = DEFAULT_MARGIN
+    font = register_body_font(body_font_path) or "Helvetica"
+
+    page_num = 1
+    for k, puzzle in enumerate(puzzles):
+        draw_word_search_page(canvas, puzzle, f"Word Search #{k + 1}", page_width, page_height, margin, page_num, font)
+        page_num += 1
+
+    if answer_key and puzzles:
+        draw_word_search_keys(canvas, puzzles, page_width, page_height, margin, page_num, font)
+    canvas.save()
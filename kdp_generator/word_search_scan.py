@@ -0,0 +1,91 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .wordlist import normalize_word
+
+Line = Tuple[int, ...]
+
+
+class AhoCorasick:
+    """Multi-word matcher: one left-to-right walk over a text reports every
+    occurrence of every pattern. The trie's failure links are folded into
+    a transition table (a DFA over the patterns' letters), so each text
+    character costs one dictionary lookup."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(dict.fromkeys(p for p in patterns if p))
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for k, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(k)
+
+        alphabet = {ch for pattern in self.patterns for ch in pattern}
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] = out[state] + out[fail[state]]
+            for ch in alphabet:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    target = delta[fail[state]].get(ch, 0)
+                    if target:
+                        delta[state][ch] = target
+                else:
+                    fail[nxt] = delta[fail[state]].get(ch, 0)
+                    delta[state][ch] = nxt
+                    queue.append(nxt)
+        self.delta = delta
+        self.out = out
+
+    def find(self, text: Sequence[str]) -> Iterator[Tuple[int, int]]:
+        """(end index, pattern id) of every occurrence in `text`."""
+        delta, out = self.delta, self.out
+        state = 0
+        for j, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                for k in out[state]:
+                    yield j, k
+
+
+@lru_cache(maxsize=None)
+def grid_lines(size: int) -> Tuple[Line, ...]:
+    """Flat cell indices of every row, column and diagonal of a `size` x
+    `size` grid, each in both reading directions, i.e. all 8 directions."""
+    lines: List[Line] = []
+    lines.extend(tuple(r * size + c for c in range(size)) for r in range(size))
+    lines.extend(tuple(r * size + c for r in range(size)) for c in range(size))
+    for d in range(-(size - 1), size):
+        lines.append(tuple(r * size + r - d for r in range(size) if 0 <= r - d < size))
+        lines.append(tuple(r * size + d + size - 1 - r for r in range(size) if 0 <= d + size - 1 - r < size))
+    return tuple(lines) + tuple(line[::-1] for line in lines)
+
+
+class GridScanner:
+    """Finds the target words and blocked words of a word search in every
+    direction with one automaton pass over the grid's lines."""
+
+    def __init__(self, targets: Iterable[str], blocked: Iterable[str] = ()):
+        targets = [normalize_word(w) for w in targets]
+        self.targets = set(w for w in targets if w)
+        self.automaton = AhoCorasick(list(self.targets) + [normalize_word(w) for w in blocked])
+
+    def scan(self, cells: Sequence[str], size: int) -> Iterator[Tuple[str, int, int]]:
+        """(word, first cell, last cell) of every occurrence in the flat
+        grid `cells`; a palindrome shows up once per reading direction."""
+        patterns = self.automaton.patterns
+        for line in grid_lines(size):
+            for j, k in self.automaton.find([cells[i] for i in line]):
+                word = patterns[k]
+                yield word, line[j - len(word) + 1], line[j]
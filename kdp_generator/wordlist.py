@@ -0,0 +1,201 @@
+import mmap
+import os
+import random
+import struct
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+WORDLIST_DIR = os.environ.get("KDP_WORDLIST_DIR", os.path.join(os.path.dirname(__file__), "wordlists"))
+LANGUAGES = {"en": "english", "pl": "polish"}
+COMPILED_SUFFIX = ".kwl"
+
+MAGIC = b"KWL1"
+# magic, alphabet byte length, group count
+HEADER = struct.Struct("<4sII")
+# word length, word count, offset of the letter codes, offset of the ranks
+GROUP = struct.Struct("<IIQQ")
+
+
+def normalize_word(word: str) -> str:
+    """Upper-case NFC form of `word`, or "" when it is not purely alphabetic."""
+    word = unicodedata.normalize("NFC", word.strip()).upper()
+    return word if word.isalpha() else ""
+
+
+def _read_source(path: str) -> List[str]:
+    """Normalized unique words of a source list, most frequent first. Lines
+    are `word` (file order is the frequency order) or `word<TAB>count`."""
+    entries: Dict[str, Tuple[float, int]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            parts = line.rstrip("\n").split("\t")
+            word = normalize_word(parts[0])
+            if not word:
+                continue
+            count = float(parts[1]) if len(parts) > 1 and parts[1].strip() else 0.0
+            best = entries.get(word)
+            if best is None or count > best[0]:
+                entries[word] = (count, best[1] if best else line_no)
+    return sorted(entries, key=lambda w: (-entries[w][0], entries[w][1]))
+
+
+def compile_words(words: Iterable[str]) -> bytes:
+    """Binary word list: words grouped by length as fixed-width rows of
+    one-byte letter codes, each group in frequency order with the global
+    frequency rank of every word alongside."""
+    groups: Dict[int, List[Tuple[int, str]]] = {}
+    for rank, word in enumerate(words):
+        groups.setdefault(len(word), []).append((rank, word))
+    alphabet = "".join(sorted({ch for members in groups.values() for _, w in members for ch in w}))
+    if len(alphabet) > 255:
+        raise ValueError(f"Word list uses {len(alphabet)} letters; at most 255 are supported")
+    codes = {ch: i + 1 for i, ch in enumerate(alphabet)}
+    alphabet_bytes = alphabet.encode("utf-8")
+
+    offset = HEADER.size + len(alphabet_bytes) + GROUP.size * len(groups)
+    table = []
+    blobs = []
+    for length in sorted(groups):
+        members = groups[length]
+        letters = bytes(codes[ch] for _, w in members for ch in w)
+        padding = -(offset + len(letters)) % 4
+        ranks = struct.pack(f"<{len(members)}I", *(rank for rank, _ in members))
+        table.append(GROUP.pack(length, len(members), offset, offset + len(letters) + padding))
+        blobs.extend([letters, b"\0" * padding, ranks])
+        offset += len(letters) + padding + len(ranks)
+    return b"".join([HEADER.pack(MAGIC, len(alphabet_bytes), len(groups)), alphabet_bytes, *table, *blobs])
+
+
+def compile_wordlist(source: str, target: str) -> int:
+    """Compile a text word list into `target`; returns the word count."""
+    words = _read_source(source)
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(compile_words(words))
+    return len(words)
+
+
+class WordGroup:
+    """Read-only sequence of the words of one length, in frequency order."""
+
+    def __init__(self, data, length: int, count: int, letters: int, ranks: int, alphabet: str):
+        self.length = length
+        self.count = count
+        self.letters = data[letters:letters + length * count]
+        self.ranks = data[ranks:ranks + 4 * count].cast("I")
+        self.alphabet = "\0" + alphabet
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        n = self.length
+        return "".join(self.alphabet[b] for b in self.letters[i * n:(i + 1) * n])
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def column(self, pos: int) -> bytes:
+        """Letter code at `pos` of every word, in word order."""
+        return bytes(self.letters[pos::self.length])
+
+    def letter(self, code: int) -> str:
+        return self.alphabet[code]
+
+    def top(self, max_rank: int) -> int:
+        """Number of leading words with a global rank below `max_rank`."""
+        return bisect_left(self.ranks, max_rank)
+
+
+class CompiledWordList:
+    """A compiled word list. Opening one maps the file and reads only the
+    header; words are decoded on access, so the cost of loading does not
+    depend on the dictionary size."""
+
+    def __init__(self, data, name: str = ""):
+        self.name = name
+        self._data = data
+        view = memoryview(data)
+        magic, alphabet_size, n_groups = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{name or 'data'} is not a compiled word list")
+        start = HEADER.size
+        self.alphabet = bytes(view[start:start + alphabet_size]).decode("utf-8")
+        start += alphabet_size
+        self.groups: Dict[int, WordGroup] = {}
+        for k in range(n_groups):
+            length, count, letters, ranks = GROUP.unpack_from(view, start + k * GROUP.size)
+            self.groups[length] = WordGroup(view, length, count, letters, ranks, self.alphabet)
+
+    @classmethod
+    def open(cls, path: str) -> "CompiledWordList":
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, path)
+
+    @property
+    def lengths(self) -> List[int]:
+        return sorted(self.groups)
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self.groups.values())
+
+    def words(self, min_len: int = 1, max_len: Optional[int] = None) -> List[str]:
+        """All words in the length range, most frequent first per length."""
+        return [w for n in self.lengths if n >= min_len and (max_len is None or n <= max_len) for w in self.groups[n]]
+
+    def sample(
+        self,
+        count: int,
+        min_len: int = 3,
+        max_len: int = 8,
+        max_rank: Optional[int] = None,
+        rng=random,
+    ) -> List[str]:
+        """Up to `count` distinct random words, drawn without touching the
+        rest of the list. `max_rank` keeps to the most frequent words."""
+        sizes = []
+        for n in self.lengths:
+            if min_len <= n <= max_len:
+                group = self.groups[n]
+                sizes.append((group, len(group) if max_rank is None else group.top(max_rank)))
+        total = sum(size for _, size in sizes)
+        picks = rng.sample(range(total), min(count, total))
+        out = []
+        for k in picks:
+            for group, size in sizes:
+                if k < size:
+                    out.append(group[k])
+                    break
+                k -= size
+        return out
+
+
+def source_path(language: str) -> str:
+    lang = language.lower()
+    name = next((full for code, full in LANGUAGES.items() if lang.startswith(code)), lang)
+    return os.path.join(WORDLIST_DIR, f"{name}.txt")
+
+
+def compiled_path(language: str) -> str:
+    return os.path.splitext(source_path(language))[0] + COMPILED_SUFFIX
+
+
+@lru_cache(maxsize=None)
+def get_wordlist(language: str) -> CompiledWordList:
+    """The word list of `language`, loaded once per process. A compiled file
+    (see `cli wordlist compile`) that is at least as new as its source is
+    memory-mapped; otherwise the source is compiled in memory."""
+    source = source_path(language)
+    compiled = compiled_path(language)
+    if os.path.exists(compiled) and (
+        not os.path.exists(source) or os.path.getmtime(compiled) >= os.path.getmtime(source)
+    ):
+        return CompiledWordList.open(compiled)
+    return CompiledWordList(compile_words(_read_source(source)), source)
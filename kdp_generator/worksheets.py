@@ -1,34 +1,12 @@
 import random
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 from reportlab.lib.colors import black
-from .pdf_utils import create_canvas, size_to_points, draw_footer_page_number, DEFAULT_MARGIN, draw_page_title
+from .pdf_utils import create_canvas, size_to_points, draw_footer_page_number, DEFAULT_MARGIN, draw_page_title, register_body_font
+from .maze import draw_maze_page, generate_maze
+from .word_search import MAX_SIZE, MIN_SIZE, build_word_search, draw_word_search_keys, draw_word_search_page
+
+MAX_MAZE_SIZE = 400
 
-def _place_word_search(grid: List[List[str]], word: str) -> bool:
-    n = len(grid)
-    dirs = [(1,0), (0,1), (1,1), (1,-1), (-1,0), (0,-1), (-1,-1), (-1,1)]
-    random.shuffle(dirs)
-    positions = [(r, c) for r in range(n) for c in range(n)]
-    random.shuffle(positions)
-    for r, c in positions:
-        for dr, dc in dirs:
-            r2 = r + dr * (len(word) - 1)
-            c2 = c + dc * (len(word) - 1)
-            if not (0 <= r2 < n and 0 <= c2 < n):
-                continue
-            ok = True
-            for i, ch in enumerate(word):
-                rr = r + dr * i
-                cc = c + dc * i
-                if grid[rr][cc] not in ('.', ch):
-                    ok = False
-                    break
-            if ok:
-                for i, ch in enumerate(word):
-                    rr = r + dr * i
-                    cc = c + dc * i
-                    grid[rr][cc] = ch
-                return True
-    return False
 
 def render_multiplication_table_pdf(filename: str, upto: int = 10, trim_size: str = "8.5x11"):
     if upto < 1 or upto > 20:
@@ -141,123 +119,43 @@ def render_simple_arithmetic_pdf(filename: str, problems: int = 50, max_num: int
     canvas.showPage()
     canvas.save()
 
-def render_word_search_pdf(filename: str, words: List[str], size: int = 12, trim_size: str = "8.5x11"):
-    if size < 5 or size > 20:
-        raise ValueError("Parameter 'size' must be between 5 and 20.")
+def render_word_search_pdf(
+    filename: str,
+    words: List[str],
+    size: int = 12,
+    trim_size: str = "8.5x11",
+    body_font_path: Optional[str] = None,
+    answer_key: bool = False,
+    blocklist: Sequence[str] = (),
+):
+    if size < MIN_SIZE or size > MAX_SIZE:
+        raise ValueError(f"Parameter 'size' must be between {MIN_SIZE} and {MAX_SIZE}.")
     if not words:
         raise ValueError("List of words cannot be empty.")
 
     canvas = create_canvas(filename, trim_size)
     page_width, page_height = size_to_points(trim_size)
-    margin = DEFAULT_MARGIN
-
-    draw_page_title(canvas, page_width, page_height, "Word Search")
-    content_top_y = page_height - margin - 40
-
-    grid = [['.' for _ in range(size)] for _ in range(size)]
-    placed = []
-    for w in sorted(words, key=len, reverse=True):
-        w = w.upper().strip()
-        if 3 <= len(w) <= size and _place_word_search(grid, w):
-            placed.append(w)
-
-    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    for r in range(size):
-        for c in range(size):
-            if grid[r][c] == '.':
-                grid[r][c] = random.choice(alphabet)
-
-    grid_area_h = content_top_y - margin - 2 * 72
-    grid_w = page_width - 2 * margin
-    cell = min(grid_w / size, grid_area_h / size)
-    total_grid_size = cell * size
-
-    x0 = (page_width - total_grid_size) / 2
-    y0 = content_top_y - total_grid_size
-
-    font_size = min(14, cell * 0.7)
-    canvas.setFont("Helvetica-Bold", font_size)
-    for r in range(size):
-        for c in range(size):
-            x = x0 + c * cell
-            y = y0 + (size - 1 - r) * cell
-            canvas.drawCentredString(x + cell / 2, y + cell * 0.25, grid[r][c])
-
-    if placed:
-        canvas.setFont("Helvetica", 12)
-        word_cols = 4
-        col_w = (page_width - 2 * margin) / word_cols
-        x_start = margin
-        y_start = y0 - 50
-
-        words_per_col = (len(placed) + word_cols - 1) // word_cols
-        for i, word in enumerate(sorted(placed)):
-            col_idx = i // words_per_col
-            row_idx = i % words_per_col
-            x = x_start + col_idx * col_w
-            y = y_start - row_idx * 16
-            canvas.drawString(x, y, word)
-
-    draw_footer_page_number(canvas, page_width, margin, 1)
-    canvas.showPage()
+    puzzle = build_word_search(words, size, blocklist=blocklist)
+    font = register_body_font(body_font_path) or "Helvetica"
+    draw_word_search_page(canvas, puzzle, "Word Search", page_width, page_height, DEFAULT_MARGIN, 1, font)
+    if answer_key:
+        draw_word_search_keys(canvas, [puzzle], page_width, page_height, DEFAULT_MARGIN, 2, font)
     canvas.save()
 
-def render_maze_pdf(filename: str, size: int = 15, trim_size: str = "8.5x11"):
-    if size < 5 or size > 30:
-        raise ValueError("Parameter 'size' must be between 5 and 30.")
+def render_maze_pdf(
+    filename: str,
+    size: int = 15,
+    trim_size: str = "8.5x11",
+    algorithm: str = "backtracker",
+    seed: Optional[int] = None,
+):
+    """A `size` x `size` cell maze carved by one of maze.ALGORITHMS, entered
+    top left and exited bottom right."""
+    if size < 5 or size > MAX_MAZE_SIZE:
+        raise ValueError(f"Parameter 'size' must be between 5 and {MAX_MAZE_SIZE}.")
 
     canvas = create_canvas(filename, trim_size)
     page_width, page_height = size_to_points(trim_size)
-    margin = DEFAULT_MARGIN
-
-    n = size if size % 2 != 0 else size + 1
-    grid = [[False] * n for _ in range(n)]
-
-    def carve(r: int, c: int):
-        grid[r][c] = True
-        dirs = [(0, 2), (2, 0), (0, -2), (-2, 0)]
-        random.shuffle(dirs)
-        for dr, dc in dirs:
-            r2, c2 = r + dr, c + dc
-            if 0 <= r2 < n and 0 <= c2 < n and not grid[r2][c2]:
-                grid[r + dr // 2][c + dc // 2] = True
-                carve(r2, c2)
-
-    carve(0, 0)
-
-    draw_page_title(canvas, page_width, page_height, "Maze")
-    content_top_y = page_height - margin - 40
-
-    grid_draw_area = min(page_width - 2 * margin, content_top_y - margin)
-    cell = grid_draw_area / n
-    total_maze_size = cell * n
-
-    x0 = (page_width - total_maze_size) / 2
-    y0 = margin + (content_top_y - margin - total_maze_size) / 2
-
-    canvas.setLineWidth(max(2, cell / 10))
-    canvas.setLineCap(1)
-    canvas.rect(x0, y0, total_maze_size, total_maze_size)
-
-    for r in range(n):
-        for c in range(n):
-            x = x0 + c * cell
-            y = y0 + (n - 1 - r) * cell
-            if r < n - 1 and not (grid[r][c] and grid[r + 1][c]):
-                canvas.line(x, y, x + cell, y)
-            if c < n - 1 and not (grid[r][c] and grid[r][c + 1]):
-                canvas.line(x + cell, y, x + cell, y + cell)
-
-    canvas.setStrokeColorRGB(1, 1, 1)
-    canvas.setLineWidth(max(3, cell / 10 + 1))
-    canvas.line(x0, y0 + (n - 1) * cell, x0, y0 + n * cell)
-    canvas.line(x0 + n * cell, y0, x0 + n * cell, y0 + cell)
-
-    canvas.setStrokeColorRGB(0, 0, 0)
-    canvas.setFont("Helvetica-Bold", 12)
-    canvas.drawCentredString(x0 - 30, y0 + (n - 0.5) * cell, "Start")
-    canvas.drawCentredString(x0 + total_maze_size + 35, y0 + 0.5 * cell, "Koniec")
-
-    draw_footer_page_number(canvas, page_width, margin, 1)
-    canvas.showPage()
+    maze = generate_maze(size, algorithm=algorithm, rng=random.Random(seed))
+    draw_maze_page(canvas, maze, "Maze", page_width, page_height, DEFAULT_MARGIN, 1)
     canvas.save()
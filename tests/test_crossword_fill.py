@@ -0,0 +1,20 @@
+import pytest
+
+from kdp_generator.crossword import crossword_index
+from kdp_generator.crossword_fill import BLOCK_PATTERNS, fill_pattern, word_shortage
+from kdp_generator.word_index import PatternIndex
+
+
+def test_small_list_runs_out_of_time_with_runtime_error():
+    # the bundled list is far too small for 15x15: every restart fails fast
+    # and the node limit keeps growing until the budget is spent
+    index = crossword_index("en", 15)
+    with pytest.raises(RuntimeError, match="could not be filled"):
+        fill_pattern(BLOCK_PATTERNS[15][0], index, seed=1, time_budget=2.0, restart_nodes=1)
+
+
+def test_word_shortage_counts_missing_words_per_slot_length():
+    pattern = ("...", "...", "...")
+    assert word_shortage(pattern, PatternIndex.from_words(["CAT", "ARE", "TEN", "CAT"])) == {3: 2}
+    assert word_shortage(pattern, crossword_index("en", 3)) == {}
+    assert word_shortage(BLOCK_PATTERNS[15][0], crossword_index("en", 15))
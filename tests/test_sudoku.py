@@ -0,0 +1,27 @@
+import pytest
+
+from kdp_generator.sudoku import SYMMETRIC_MINIMAL_NODES, UNGRADED_NODE_BUDGET, make_puzzle, make_puzzle_with_stats
+
+
+def test_minimal_easy_is_rejected():
+    with pytest.raises(ValueError, match="easy"):
+        make_puzzle(difficulty="easy", minimal=True, seed=1)
+
+
+def test_minimal_rot90_is_rejected():
+    with pytest.raises(ValueError, match="rot90"):
+        make_puzzle(difficulty="hard", minimal=True, symmetry="rot90", seed=1)
+
+
+def test_symmetric_minimal_stops_at_default_node_budget():
+    _, stats = make_puzzle_with_stats(difficulty="medium", minimal=True, symmetry="diagonal", seed=1)
+    assert stats.attempts < 500
+    assert stats.budget_exhausted or stats.minimal
+    assert stats.nodes < 2 * SYMMETRIC_MINIMAL_NODES
+
+
+def test_expert_16x16_stays_within_default_node_budget():
+    puzzle, stats = make_puzzle_with_stats(difficulty="expert", size=16, seed=0)
+    assert stats.nodes < 2 * UNGRADED_NODE_BUDGET
+    assert stats.clues < 0.44 * 16 * 16
+    assert sum(v != 0 for row in puzzle for v in row) == stats.clues
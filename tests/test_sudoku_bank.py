@@ -0,0 +1,21 @@
+import random
+
+from kdp_generator.sudoku_bank import PuzzleBank, draw_or_generate
+from kdp_generator.sudoku_transform import apply_transform, random_transform
+
+
+def test_rerunning_a_book_returns_its_recorded_puzzles(tmp_path):
+    with PuzzleBank(str(tmp_path / "bank.sqlite")) as bank:
+        first = draw_or_generate(bank, "book", 3, "medium", seed=1)
+        again = draw_or_generate(bank, "book", 3, "medium", seed=2)
+        assert again == first
+        assert bank.stats() == {"medium": (3, 0)}
+
+
+def test_equivalent_generated_puzzle_is_not_stored_twice(tmp_path):
+    with PuzzleBank(str(tmp_path / "bank.sqlite")) as bank:
+        (puzzle,) = draw_or_generate(bank, "book", 1, "easy", seed=1)
+        variant = apply_transform(puzzle, random_transform(random.Random(1)))
+        assert variant != puzzle
+        assert not bank.add(variant, "easy")
+        assert bank.expand(1, "easy") == 1